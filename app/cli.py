@@ -0,0 +1,180 @@
+# app/cli.py
+"""
+Operational commands.
+
+    python -m app.cli score --source db --out db --checkpoint score.ckpt
+    python -m app.cli score --source pairs.jsonl --out scores.parquet --workers 4
+    python -m app.cli migrate
+    python -m app.cli compress-storage --batch-size 500 --vacuum
+    python -m app.cli build-skills
+    python -m app.cli worker --threads 2
+    python -m app.cli backfill-jobs --batch-size 100
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def _cmd_score(args) -> int:
+    from app.db.session import SessionLocal
+    from app.services.bulk_score_service import run_bulk_score
+
+    needs_db = args.source == "db" or args.out == "db"
+    db = SessionLocal() if needs_db else None
+    try:
+        run_bulk_score(
+            args.source,
+            args.out,
+            db=db,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            checkpoint=Path(args.checkpoint) if args.checkpoint else None,
+            limit=args.limit,
+        )
+    finally:
+        if db is not None:
+            db.close()
+    return 0
+
+
+def _cmd_migrate(args) -> int:
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.migrate import convert_storage_columns, sync_schema
+    from app.db.session import SessionLocal, engine
+    from app.services.report_service import backfill_report_summary
+
+    for change in sync_schema(engine) + convert_storage_columns(engine):
+        print(f"[migrate] applied {change}")
+    with SessionLocal() as db:
+        n = backfill_report_summary(db, batch_size=args.batch_size)
+    print(f"[migrate] done ({n} reports backfilled)")
+    return 0
+
+
+def _cmd_compress_storage(args) -> int:
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.migrate import compress_storage, database_size, sync_schema
+    from app.db.session import engine
+
+    sync_schema(engine)
+    before = database_size(engine)
+    stats = compress_storage(engine, batch_size=args.batch_size)
+    if args.vacuum:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM" if engine.dialect.name == "sqlite" else "VACUUM FULL resumes, jobs, reports")
+    after = database_size(engine)
+
+    for name, s in stats.items():
+        ratio = (s["bytes_after"] / s["bytes_before"]) if s["bytes_before"] else 1.0
+        print(
+            f"[compress] {name:<20} rows={s['rows']:<8} "
+            f"{s['bytes_before'] / 1e6:8.2f} MB -> {s['bytes_after'] / 1e6:8.2f} MB ({ratio:.0%})"
+        )
+    if before is not None and after is not None:
+        rewritten = any(s["rows"] for s in stats.values())
+        note = "" if args.vacuum or not rewritten else "  (space is reclaimed by VACUUM; pass --vacuum)"
+        print(f"[compress] on disk: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB{note}")
+    return 0
+
+
+def _cmd_build_skills(args) -> int:
+    from app.nlp.skills_snapshot import build_snapshot, resolve_path
+
+    out, data = build_snapshot(
+        resolve_path(args.csv) if args.csv else None,
+        resolve_path(args.out) if args.out else None,
+    )
+    aliases = sum(len(a) for a in data.canonical.values())
+    print(f"[skills] {len(data.canonical)} skills, {aliases} aliases -> {out} (version {data.version})")
+    return 0
+
+
+def _cmd_worker(args) -> int:
+    import signal
+
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.migrate import sync_schema
+    from app.db.session import engine
+    from app.services.analysis_jobs import WorkerPool, stats, work_once
+
+    sync_schema(engine)
+    if args.once:
+        n = 0
+        while work_once():
+            n += 1
+        print(f"[worker] processed {n} jobs")
+        return 0
+
+    pool = WorkerPool(args.threads).start()
+    print(f"[worker] {pool.threads} threads polling analysis_jobs (queued: {stats()['depth']})")
+    # SIGTERM/SIGINT: stop claiming, let running jobs finish
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: pool.stop())
+    pool.wait()
+    print("[worker] stopped")
+    return 0
+
+
+def _cmd_backfill_jobs(args) -> int:
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.migrate import sync_schema
+    from app.db.session import SessionLocal, engine
+    from app.services.job_ingest import backfill
+
+    sync_schema(engine)
+    with SessionLocal() as db:
+        n = backfill(db, batch_size=args.batch_size, force=args.force)
+    print(f"[backfill-jobs] done ({n} jobs updated)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("score", help="bulk re-score (resume, job) pairs")
+    s.add_argument("--source", default="db", help="'db' (all stored reports) or a .jsonl/.csv file of pairs")
+    s.add_argument("--out", default="db", help="'db' (update report payloads), a .jsonl file or a .parquet directory")
+    s.add_argument("--chunk-size", type=int, default=256)
+    s.add_argument("--workers", type=int, default=0, help="skill-extraction processes (0 = in-process)")
+    s.add_argument("--checkpoint", default=None, help="progress file; rerun with the same file to resume")
+    s.add_argument("--limit", type=int, default=None, help="stop after roughly this many rows")
+    s.set_defaults(func=_cmd_score)
+
+    m = sub.add_parser("migrate", help="add new columns/indexes and backfill denormalized report fields")
+    m.add_argument("--batch-size", type=int, default=1000)
+    m.set_defaults(func=_cmd_migrate)
+
+    c = sub.add_parser("compress-storage", help="rewrite existing resume/job text and report payloads compressed")
+    c.add_argument("--batch-size", type=int, default=500)
+    c.add_argument("--vacuum", action="store_true", help="reclaim freed space afterwards (locks the tables)")
+    c.set_defaults(func=_cmd_compress_storage)
+
+    k = sub.add_parser("build-skills", help="compile the skills CSV into the snapshot workers load (and hot-reload)")
+    k.add_argument("--csv", default=None, help="source CSV (default: SKILLS_CSV)")
+    k.add_argument("--out", default=None, help="snapshot path (default: SKILLS_SNAPSHOT)")
+    k.set_defaults(func=_cmd_build_skills)
+
+    w = sub.add_parser("worker", help="process queued analyses (POST /ui-match/jobs)")
+    w.add_argument("--threads", type=int, default=2, help="concurrent jobs in this process")
+    w.add_argument("--once", action="store_true", help="drain the queue and exit instead of polling")
+    w.set_defaults(func=_cmd_worker)
+
+    b = sub.add_parser("backfill-jobs", help="precompute skills + embedding for stored jobs that lack current ones")
+    b.add_argument("--batch-size", type=int, default=100, help="jobs per model call")
+    b.add_argument("--force", action="store_true", help="recompute every job, current or not")
+    b.set_defaults(func=_cmd_backfill_jobs)
+
+    return p
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
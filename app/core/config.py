@@ -1,20 +1,47 @@
 # app/core/config.py
 from __future__ import annotations
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     # API
-    api_key: str = "dev-secret-key"
+    api_key: str = ""                         # env: API_KEY (the JSON API and /metricsz answer 503 until it is set)
     api_title: str = "Resume Match API"
     api_version: str = "0.1.0"
 
     # DB
     database_url: str = "sqlite:////app/dev.db"
+    db_pool_size: int = 5                     # env: DB_POOL_SIZE (Postgres only)
+    db_max_overflow: int = 10                 # env: DB_MAX_OVERFLOW
+    db_pool_recycle: int = 1800               # env: DB_POOL_RECYCLE (seconds)
+    db_pool_timeout: int = 30                 # env: DB_POOL_TIMEOUT (seconds)
+    # deferred writes answer sooner, but until one lands its share URL 404s and the daily
+    # quota (counted from stored reports) can be overrun by requests on other workers
+    defer_report_write: bool = False          # env: DEFER_REPORT_WRITE (persist analyses after the response; opt-in)
 
     # NLP
     # IMPORTANT: maps to env var SENTENCE_MODEL
     sentence_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    skills_csv: str = "data/skills.csv"       # env: SKILLS_CSV (relative paths are from the repo root)
+    skills_snapshot: str = "data/skills.snapshot"  # env: SKILLS_SNAPSHOT (built by `python -m app.cli build-skills`)
+    skills_reload_interval: float = 5.0       # env: SKILLS_RELOAD_INTERVAL (seconds between change checks; 0 = never)
+    skills_semantic: bool = False             # env: SKILLS_SEMANTIC (embedding match instead of the fuzzy fallback)
+    skills_semantic_threshold: float = 0.8    # env: SKILLS_SEMANTIC_THRESHOLD (cosine, phrase vs. alias)
+    skills_semantic_max_ngram: int = 3        # env: SKILLS_SEMANTIC_MAX_NGRAM (longest candidate phrase, in words)
+    skills_semantic_max_candidates: int = 2000  # env: SKILLS_SEMANTIC_MAX_CANDIDATES (phrases embedded per document)
+
+    # Near-duplicate JDs reuse each other's skills/embedding (app/services/job_features.py)
+    jd_dedup: bool = True                     # env: JD_DEDUP (off = exact-text reuse only)
+    jd_dedup_threshold: float = 0.85          # env: JD_DEDUP_THRESHOLD (estimated Jaccard over word shingles)
+    jd_dedup_bands: int = 20                  # env: JD_DEDUP_BANDS (LSH bands; more = fewer missed duplicates)
+    jd_dedup_rows: int = 5                    # env: JD_DEDUP_ROWS (rows per band; more = fewer false candidates)
+    jd_dedup_shingle: int = 3                 # env: JD_DEDUP_SHINGLE (words per shingle)
+    jd_features_cache_size: int = 10000       # env: JD_FEATURES_CACHE_SIZE (JDs remembered per worker; 0 = off)
+
+    # Match result memo (app/services/match_memo.py)
+    match_memo_size: int = 4096               # env: MATCH_MEMO_SIZE (results per worker; 0 = off)
+    match_memo_ttl: int = 86400               # env: MATCH_MEMO_TTL (seconds)
+    match_memo_redis: bool = False            # env: MATCH_MEMO_REDIS (share results via REDIS_URL)
 
     # Auth / Sessions
     oauth_secret: str = "change-me"           # env: OAUTH_SECRET
@@ -22,16 +49,76 @@ class Settings(BaseSettings):
     github_client_secret: Optional[str] = None# env: GITHUB_CLIENT_SECRET
     enable_email_signup: bool = False         # env: ENABLE_EMAIL_SIGNUP
 
+    # Password hashing (Argon2id; changing these rehashes users on their next login)
+    password_time_cost: int = 3               # env: PASSWORD_TIME_COST
+    password_memory_cost: int = 65536         # env: PASSWORD_MEMORY_COST (KiB)
+    password_parallelism: int = 4             # env: PASSWORD_PARALLELISM
+    password_workers: int = 2                 # env: PASSWORD_WORKERS (concurrent hashes per process)
+    password_queue_timeout: float = 3.0       # env: PASSWORD_QUEUE_TIMEOUT (seconds to wait for a slot, then 503)
+
     # Rate limits
     anon_daily_limit: int = 3                 # env: ANON_DAILY_LIMIT
     free_daily_limit: int = 15                # env: FREE_DAILY_LIMIT
     premium_unlimited: bool = False           # env: PREMIUM_UNLIMITED
+    ip_daily_limit: int = 20                  # env: IP_DAILY_LIMIT (abuse gate in RateLimitMiddleware)
+    max_upload_bytes: int = 10 * 1024 * 1024  # env: MAX_UPLOAD_BYTES (analysis uploads; 0 = no cap)
     redis_url: Optional[str] = None           # env: REDIS_URL
 
+    # Public report cache
+    report_cache_size: int = 2048             # env: REPORT_CACHE_SIZE (payloads per worker)
+    report_html_cache_size: int = 512         # env: REPORT_HTML_CACHE_SIZE (rendered pages per worker)
+    report_cache_ttl: int = 3600              # env: REPORT_CACHE_TTL (seconds)
+    report_cache_redis: bool = False          # env: REPORT_CACHE_REDIS (share payloads via REDIS_URL)
+
+    # Storage (resume/job text and report payloads)
+    storage_codec: str = "zlib"               # env: STORAGE_CODEC (zlib | zstd | none; zstd needs `zstandard`)
+    storage_compress_threshold: int = 512     # env: STORAGE_COMPRESS_THRESHOLD (bytes; smaller values stored raw)
+    storage_level: int = 6                    # env: STORAGE_LEVEL (compression level)
+
+    # Analysis job queue (POST /ui-match/jobs; workers: `python -m app.cli worker`)
+    job_workers: int = 0                      # env: JOB_WORKERS (worker threads inside each web process; 0 = separate workers only)
+    job_max_attempts: int = 3                 # env: JOB_MAX_ATTEMPTS
+    job_visibility_timeout: float = 300.0     # env: JOB_VISIBILITY_TIMEOUT (seconds a claimed job is hidden from other workers)
+    job_retry_backoff: float = 5.0            # env: JOB_RETRY_BACKOFF (seconds before the first retry, doubled per attempt)
+    job_poll_interval: float = 1.0            # env: JOB_POLL_INTERVAL (seconds an idle worker waits between claims)
+    job_queue_max: int = 1000                 # env: JOB_QUEUE_MAX (queued jobs before submissions get 503)
+
+    # In-request analysis scheduler (app/services/scheduler.py; limits per web process)
+    analysis_concurrency: int = 4             # env: ANALYSIS_CONCURRENCY (analyses running at once)
+    analysis_per_anon: int = 1                # env: ANALYSIS_PER_ANON (in flight per anonymous IP)
+    analysis_per_free: int = 2                # env: ANALYSIS_PER_FREE (in flight per signed-in user)
+    analysis_per_premium: int = 4             # env: ANALYSIS_PER_PREMIUM (in flight per user with PREMIUM_UNLIMITED)
+    analysis_queue_max: int = 64              # env: ANALYSIS_QUEUE_MAX (waiting analyses before 503)
+    analysis_queue_per_subject: int = 3       # env: ANALYSIS_QUEUE_PER_SUBJECT (waiting per user/IP before 429)
+    analysis_queue_timeout: float = 30.0      # env: ANALYSIS_QUEUE_TIMEOUT (seconds waiting before 503; 0 = no limit)
+
+    # Degraded analyses under load (app/services/degrade.py); thresholds for levels 1, 2, 3 as JSON lists
+    degrade: bool = True                      # env: DEGRADE (off = always the full analysis)
+    degrade_queue: List[int] = [8, 24, 48]    # env: DEGRADE_QUEUE (analyses waiting for a slot)
+    degrade_latency_ms: List[int] = [4000, 8000, 15000]  # env: DEGRADE_LATENCY_MS (p95 of recent match pipelines)
+    degrade_window: int = 50                  # env: DEGRADE_WINDOW (recent pipelines the latency p95 is taken over)
+    degrade_cooldown: float = 30.0            # env: DEGRADE_COOLDOWN (seconds under a level's thresholds before stepping down)
+    degrade_model: Optional[str] = None       # env: DEGRADE_MODEL (smaller sentence model for level 3; unset = no level 3)
+
+    # Bulk ingestion (POST /resumes/bulk, /jobs/bulk)
+    bulk_batch_size: int = 500                # env: BULK_BATCH_SIZE (rows per insert transaction)
+    bulk_max_items: int = 50000               # env: BULK_MAX_ITEMS (items per request; the rest are refused)
+    bulk_max_line_bytes: int = 1024 * 1024    # env: BULK_MAX_LINE_BYTES (longest NDJSON line)
+
+    # Response compression and static caching (app/middleware/compression.py, app/utils/static.py)
+    compress_min_bytes: int = 1024            # env: COMPRESS_MIN_BYTES (smaller responses are sent as is; 0 = no compression)
+    compress_level: int = 6                   # env: COMPRESS_LEVEL (gzip level)
+    compress_brotli_quality: int = 5          # env: COMPRESS_BROTLI_QUALITY (with the `brotli` package installed)
+    static_max_age: int = 31536000            # env: STATIC_MAX_AGE (seconds, fingerprinted /images URLs)
+
     # Observability
     sentry_dsn: Optional[str] = None          # env: SENTRY_DSN
     posthog_key: Optional[str] = None         # env: POSTHOG_KEY
     posthog_host: str = "https://app.posthog.com"  # env: POSTHOG_HOST
+    analytics_file: Optional[str] = None      # env: ANALYTICS_FILE (write events as JSONL instead of PostHog)
+    analytics_queue_size: int = 10000         # env: ANALYTICS_QUEUE_SIZE (events beyond this are dropped)
+    analytics_batch_size: int = 100           # env: ANALYTICS_BATCH_SIZE
+    analytics_flush_interval: float = 2.0     # env: ANALYTICS_FLUSH_INTERVAL (seconds)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,21 +1,15 @@
+import secrets
+
 from fastapi import Header, HTTPException, status
 from app.core.config import settings
-from passlib.context import CryptContext
 
+# keys that must never open the API: unset, or the old sample value
+PLACEHOLDER_KEYS = ("", "dev-secret-key")
 
 
 async def verify_api_key(x_api_key: str | None = Header(default=None)):
-	if not x_api_key or x_api_key != settings.api_key:
+	# fail closed: without a real API_KEY no header is accepted
+	if settings.api_key in PLACEHOLDER_KEYS:
+		raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="API key not configured")
+	if not x_api_key or not secrets.compare_digest(x_api_key.encode(), settings.api_key.encode()):
 		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API key")
-
-
-_pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def hash_password(pw: str) -> str:
-    return _pwd.hash(pw)
-
-def verify_password(pw: str, h: str) -> bool:
-    if not pw or not h:
-        return False
-    return _pwd.verify(pw, h)
-
@@ -0,0 +1,153 @@
+# app/db/migrate.py
+"""
+Lightweight schema sync for a project that relies on `create_all`.
+
+`create_all` creates missing tables but never touches existing ones, so
+columns and indexes added to models later are applied here: nullable
+columns via ALTER TABLE ... ADD COLUMN, indexes via CREATE INDEX.
+`compress_storage` is the one-off rewrite of existing rows into the
+compressed column format (see app/db/types.py).
+"""
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Optional
+
+from sqlalchemy import LargeBinary, bindparam, inspect, select, text, update
+from sqlalchemy import column as sa_column, table as table_clause
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+
+from app.db.session import Base
+
+
+def sync_schema(engine: Engine) -> List[str]:
+    """
+    Create missing tables, columns and indexes. Returns a description of what was applied.
+
+    Existing columns are never altered here (this runs at every app start).
+    The switch of the compressed storage columns to BYTEA on Postgres
+    (`convert_storage_columns`) runs only from `python -m app.cli migrate`
+    and `compress-storage`, which must be run before deploying on Postgres.
+    """
+    Base.metadata.create_all(bind=engine)
+    insp = inspect(engine)
+    applied: List[str] = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in existing:
+                    continue
+                if not col.nullable and col.server_default is None:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{col.name} without a server default")
+                coldef = CreateColumn(col).compile(dialect=engine.dialect)
+                tname = engine.dialect.identifier_preparer.format_table(table)
+                conn.execute(text(f"ALTER TABLE {tname} ADD COLUMN {coldef}"))
+                applied.append(f"column {table.name}.{col.name}")
+
+            have = {i["name"] for i in insp.get_indexes(table.name)}
+            for idx in table.indexes:
+                if idx.name not in have:
+                    idx.create(conn, checkfirst=True)
+                    applied.append(f"index {idx.name}")
+    return applied
+
+
+# -------------------- compressed storage --------------------
+# (table, column, is_json) pairs stored through app.db.types
+STORAGE_COLUMNS = (
+    ("resumes", "text", False),
+    ("jobs", "description", False),
+    ("reports", "payload", True),
+)
+
+
+def convert_storage_columns(engine: Engine) -> List[str]:
+    """
+    On Postgres, switch the compressed columns to BYTEA, converting existing
+    values in place (they stay readable as legacy, uncompressed rows).
+    SQLite stores blobs in any column, so nothing to do there.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    insp = inspect(engine)
+    applied: List[str] = []
+    with engine.begin() as conn:
+        for table, column, is_json in STORAGE_COLUMNS:
+            types = {c["name"]: str(c["type"]).upper() for c in insp.get_columns(table)}
+            if types.get(column) == "BYTEA":
+                continue
+            src = f"{column}::text" if is_json else column
+            conn.execute(text(
+                f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE BYTEA '
+                f"USING convert_to({src}, 'UTF8')"
+            ))
+            applied.append(f"column {table}.{column} -> bytea")
+    return applied
+
+
+def database_size(engine: Engine) -> Optional[int]:
+    """Bytes on disk for the app's tables (SQLite: whole file), or None if unknown."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            pages = conn.execute(text("PRAGMA page_count")).scalar()
+            size = conn.execute(text("PRAGMA page_size")).scalar()
+            return int(pages) * int(size)
+        if engine.dialect.name == "postgresql":
+            return int(sum(
+                conn.execute(text("SELECT pg_total_relation_size(:t)"), {"t": t}).scalar() or 0
+                for t, _, _ in STORAGE_COLUMNS
+            ))
+    return None
+
+
+def compress_storage(engine: Engine, batch_size: int = 500, log=print) -> Dict[str, Dict[str, int]]:
+    """
+    Rewrite legacy rows of STORAGE_COLUMNS in the compressed format, one
+    batch per transaction. Rows already in the new format are skipped, so the
+    command can be interrupted and re-run. Returns per-column row/byte counts.
+    """
+    from app.db.types import CompressedText, ReportPayload, decode_bytes, is_encoded
+
+    for change in convert_storage_columns(engine):
+        log(f"[compress] {change}")
+
+    stats: Dict[str, Dict[str, int]] = {}
+    for table, column, is_json in STORAGE_COLUMNS:
+        codec = ReportPayload() if is_json else CompressedText()
+        t = table_clause(table, sa_column("id"), sa_column(column))
+        stmt = (
+            update(t)
+            .where(t.c.id == bindparam("_id"))
+            .values({column: bindparam("_v", type_=LargeBinary)})
+        )
+        s = stats[f"{table}.{column}"] = {"rows": 0, "skipped": 0, "bytes_before": 0, "bytes_after": 0}
+        last = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(
+                    select(t.c.id, t.c[column]).where(t.c.id > last).order_by(t.c.id).limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                last = rows[-1][0]
+                params = []
+                for rid, raw in rows:
+                    if raw is None:
+                        continue
+                    old = raw.encode("utf-8") if isinstance(raw, str) else bytes(raw)
+                    s["bytes_before"] += len(old)
+                    if is_encoded(old):
+                        s["skipped"] += 1
+                        s["bytes_after"] += len(old)
+                        continue
+                    value = decode_bytes(old)
+                    new = codec.process_bind_param(json.loads(value) if is_json else value, engine.dialect)
+                    s["bytes_after"] += len(new)
+                    params.append({"_id": rid, "_v": new})
+                if params:
+                    conn.execute(stmt, params)
+                s["rows"] += len(params)
+            log(f"[compress] {table}.{column}: {s['rows']} rewritten, {s['skipped']} already compact")
+    return stats
@@ -4,10 +4,11 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, func, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func, Boolean, Text, Float, Index, JSON, LargeBinary
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.session import Base
+from app.db.types import CompressedText, ReportPayload
 
 
 class User(Base):
@@ -29,7 +30,7 @@ class Resume(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     filename: Mapped[str] = mapped_column(String)
-    text: Mapped[str] = mapped_column(String)
+    text: Mapped[str] = mapped_column(CompressedText)
 
 
 class Job(Base):
@@ -37,15 +38,27 @@ class Job(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
-    description: Mapped[str] = mapped_column(String)
+    description: Mapped[str] = mapped_column(CompressedText)
+
+    # JD features precomputed after creation (app/services/job_ingest.py); NULL until then, and only
+    # used while text_hash, skills_version and embedding_model still match the description and the app
+    text_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    skills: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    skills_version: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    embedding: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)  # float32
+    embedding_model: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
 
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # dashboard: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_reports_user_created", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     slug: Mapped[str] = mapped_column(String, unique=True, index=True)
-    payload: Mapped[dict] = mapped_column(JSON)
+    payload: Mapped[dict] = mapped_column(ReportPayload)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -54,7 +67,43 @@ class Report(Base):
     job_id: Mapped[int] = mapped_column(Integer, ForeignKey("jobs.id"))
     user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # Denormalized from payload at write time so list views never load the JSON blob
+    match_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    client_ip: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
     resume = relationship("Resume")
     job = relationship("Job")
     user = relationship("User", back_populates="reports")
 
+
+class AnalysisJob(Base):
+    """An upload queued for a worker (POST /ui-match/jobs); see app/services/analysis_jobs.py."""
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        # claim: WHERE status = 'queued' AND run_after <= now ORDER BY id
+        Index("ix_analysis_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    public_id: Mapped[str] = mapped_column(String, unique=True, index=True)
+    status: Mapped[str] = mapped_column(String, default="queued")     # queued | running | done | failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # epoch seconds: portable comparisons on SQLite and Postgres alike
+    enqueued_at: Mapped[float] = mapped_column(Float)
+    run_after: Mapped[float] = mapped_column(Float)                    # not claimable before (retry backoff)
+    locked_until: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # visibility timeout of a claim
+    lease: Mapped[Optional[str]] = mapped_column(String, nullable=True)          # token of the current claim
+
+    # input (the PDF is dropped once the job finishes)
+    filename: Mapped[str] = mapped_column(String)
+    pdf: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    job_description: Mapped[str] = mapped_column(CompressedText)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    client_ip: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    extras: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+    # output: the report is written under this slug, chosen at submit time
+    slug: Mapped[str] = mapped_column(String)
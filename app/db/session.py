@@ -1,6 +1,9 @@
 # app/db/session.py
 from __future__ import annotations
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings as cfg
 
@@ -10,15 +13,47 @@ def _normalize_url(url: str | None) -> str:
         return "sqlite:////app/dev.db"
     return url.strip()
 
+def _async_url(url: str) -> str:
+    """Same database, async driver: aiosqlite for SQLite, asyncpg for Postgres."""
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    base = scheme.split("+", 1)[0]
+    if base == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if base in ("postgresql", "postgres"):
+        # asyncpg spells libpq's sslmode as ssl
+        return f"postgresql+asyncpg://{rest.replace('sslmode=', 'ssl=')}"
+    return url
+
+def _engine_kwargs(url: str) -> dict:
+    # SQLite needs special connect args and has nothing worth pooling; Postgres gets a tuned pool
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": cfg.db_pool_size,
+        "max_overflow": cfg.db_max_overflow,
+        "pool_recycle": cfg.db_pool_recycle,
+        "pool_timeout": cfg.db_pool_timeout,
+        "pool_pre_ping": True,
+    }
+
 DATABASE_URL = _normalize_url(getattr(cfg, "database_url", None))
+ASYNC_DATABASE_URL = _async_url(DATABASE_URL)
 
-# SQLite needs special connect args; Postgres does not
 connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
 
-engine = create_engine(DATABASE_URL, echo=False, future=True, connect_args=connect_args)
+# Sync engine: schema creation, CLI commands and other scripts
+engine = create_engine(DATABASE_URL, echo=False, future=True, connect_args=connect_args, **_engine_kwargs(DATABASE_URL))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
-Base = declarative_base()
 
-# Optional: small startup log to help debugging
-print(f"[DB] Using {DATABASE_URL}")
+# Async engine: the request path, so DB round-trips never block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, **_engine_kwargs(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
 
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one AsyncSession per request."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,144 @@
+# app/db/types.py
+"""
+Column types that store large text and report payloads compactly.
+
+Encoded values are bytes with a two-byte header: NUL followed by a codec tag
+(r = raw UTF-8, z = zlib, s = zstd). Valid text never starts with NUL, so any
+value without that header is a legacy row written before compression
+(plain TEXT/JSON, or bytes converted in place by the migration) and is read
+as-is. Values shorter than STORAGE_COMPRESS_THRESHOLD are stored raw.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings as cfg
+
+try:
+    import zstandard as _zstd
+    _HAS_ZSTD = True
+except Exception:
+    _HAS_ZSTD = False
+
+_MAGIC = b"\x00"
+_RAW, _ZLIB, _ZSTD = b"r", b"z", b"s"
+
+
+def _codec() -> bytes:
+    if cfg.storage_codec == "zstd" and _HAS_ZSTD:
+        return _ZSTD
+    return _ZLIB if cfg.storage_codec in ("zlib", "zstd") else _RAW
+
+
+def encode_bytes(raw: bytes) -> bytes:
+    if len(raw) < cfg.storage_compress_threshold:
+        return _MAGIC + _RAW + raw
+    codec = _codec()
+    if codec == _ZSTD:
+        return _MAGIC + _ZSTD + _zstd.ZstdCompressor(level=cfg.storage_level).compress(raw)
+    if codec == _ZLIB:
+        return _MAGIC + _ZLIB + zlib.compress(raw, cfg.storage_level)
+    return _MAGIC + _RAW + raw
+
+
+def is_encoded(value: bytes) -> bool:
+    """True for values written by encode_bytes (as opposed to legacy rows)."""
+    return value[:1] == _MAGIC
+
+
+def decode_bytes(value: Any) -> str:
+    """Inverse of encode_bytes; legacy str/bytes values pass through."""
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not is_encoded(value):
+        return value.decode("utf-8")
+    tag, body = value[1:2], value[2:]
+    if tag == _ZLIB:
+        return zlib.decompress(body).decode("utf-8")
+    if tag == _ZSTD:
+        if not _HAS_ZSTD:
+            raise RuntimeError("Value is zstd-compressed but the zstandard package is not installed")
+        return _zstd.ZstdDecompressor().decompress(body).decode("utf-8")
+    return body.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as (optionally compressed) bytes; Python side stays str."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode_bytes(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decode_bytes(value)
+
+
+# -------------------- report payloads --------------------
+# Packed payloads drop fields that are exact duplicates of others and restore
+# them on read. "_pk" marks the packing version; from version 2 on, "_pd"
+# lists the fields that were dropped, so a payload that never had them reads
+# back unchanged. Version 1 rows restore both fields unconditionally.
+_PACK_VERSION = 2
+_PACKED_FIELDS = ("skills", "overlap_skills")
+
+
+def _overlap(payload: dict) -> list:
+    return sorted(set(payload.get("resume_skills") or []) & set(payload.get("jd_skills") or []))
+
+
+def pack_payload(payload: dict) -> dict:
+    p = dict(payload or {})
+    dropped = []
+    if "resume_skills" in p and "skills" in p and p["skills"] == p["resume_skills"]:
+        dropped.append("skills")
+    if "overlap_skills" in p and p["overlap_skills"] == _overlap(p):
+        dropped.append("overlap_skills")
+    for key in dropped:
+        del p[key]
+    p["_pk"] = _PACK_VERSION
+    if dropped:
+        p["_pd"] = dropped
+    return p
+
+
+def unpack_payload(p: dict) -> dict:
+    if not isinstance(p, dict) or "_pk" not in p:
+        return p
+    p = dict(p)
+    dropped = p.pop("_pd", []) if p.pop("_pk") != 1 else _PACKED_FIELDS
+    if "skills" in dropped and "skills" not in p and "resume_skills" in p:
+        p["skills"] = p["resume_skills"]
+    if "overlap_skills" in dropped and "overlap_skills" not in p:
+        p["overlap_skills"] = _overlap(p)
+    return p
+
+
+class ReportPayload(TypeDecorator):
+    """Report JSON payload: deduplicated, compact JSON, compressed above the threshold."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[dict], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        raw = json.dumps(pack_payload(value), separators=(",", ":"), ensure_ascii=False, default=str)
+        return encode_bytes(raw.encode("utf-8"))
+
+    def process_result_value(self, value, dialect) -> Optional[dict]:
+        if value is None:
+            return None
+        if isinstance(value, dict):  # legacy native JSON column not migrated yet
+            return value
+        return unpack_payload(json.loads(decode_bytes(value)))
@@ -1,41 +1,84 @@
 # app/main.py
 from __future__ import annotations
-import sentry_sdk
 from fastapi import FastAPI, Depends
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.core.config import settings
-from app.db.session import Base, engine
-from app.routes import ui, auth
-
-from fastapi.staticfiles import StaticFiles
-import os
+from contextlib import asynccontextmanager
 
+from app.core.config import settings
+from app.core.security import verify_api_key
+from app.db.session import engine
+from app.db.migrate import sync_schema
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.routes import analyze, auth, health, jobs, match, resumes, ui
+from app.services import analysis_jobs, degrade, job_features, match_memo, scheduler
+from app.services.report_service import html_cache, payload_cache
+from app.utils import analytics, passwords, static, telemetry
 
-# init DB
-Base.metadata.create_all(bind=engine)
 
-# observability
+# observability (must be initialised before the app is built to instrument it)
 if settings.sentry_dsn:
+    import sentry_sdk
     sentry_sdk.init(dsn=settings.sentry_dsn, traces_sample_rate=0.1)
 
-app = FastAPI(title=settings.api_title, version=settings.api_version)
+telemetry.register("analytics", analytics.stats)
+telemetry.register("report_payload_cache", payload_cache.stats)
+telemetry.register("report_html_cache", html_cache.stats)
+telemetry.register("passwords", passwords.stats)
+telemetry.register("analysis_jobs", analysis_jobs.stats)
+telemetry.register("match_memo", match_memo.stats)
+telemetry.register("jd_features", job_features.stats)
+telemetry.register("scheduler", scheduler.stats)
+telemetry.register("degrade", degrade.stats)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # init DB (tables plus any columns/indexes added since they were created)
+    print(f"[DB] Using {engine.url!r}")
+    sync_schema(engine)
+    if settings.skills_semantic:
+        # embed the skill dictionary (and load the model) before the first request needs it
+        from app.nlp import semantic_skills
+        semantic_skills.skill_matrix()
+    workers = analysis_jobs.WorkerPool(settings.job_workers).start() if settings.job_workers > 0 else None
+    yield
+    if workers is not None:
+        workers.stop()
+    # deliver analytics events still queued at shutdown
+    analytics.shutdown()
+    passwords.shutdown()
+
+
+app = FastAPI(title=settings.api_title, version=settings.api_version, lifespan=lifespan)
 
 # sessions (for OAuth + rate limits)
 app.add_middleware(SessionMiddleware, secret_key=settings.oauth_secret, https_only=False)
+# quota / abuse / upload-size checks before the body is read (reads the same signed session cookie)
+app.add_middleware(RateLimitMiddleware)
+# gzip/brotli for HTML and JSON bodies (outermost, so it sees every response; streams pass through)
+app.add_middleware(CompressionMiddleware)
 
-app.mount(
-    "/images",
-    StaticFiles(directory=os.path.join(os.path.dirname(__file__), "images")),
-    name="images",
-)
+# fingerprinted URLs from asset_url() are cached for good (app/utils/static.py)
+app.mount("/images", static.images, name="images")
 
 
 # routers
 app.include_router(ui.router, tags=["ui"])
 app.include_router(auth.router, tags=["auth"])
+app.include_router(health.router, tags=["health"])
+# JSON API (X-API-Key; closed until API_KEY is set, see app/core/security.py)
+api_key = [Depends(verify_api_key)]
+app.include_router(resumes.router, prefix="/resumes", tags=["resumes"], dependencies=api_key)
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"], dependencies=api_key)
+app.include_router(analyze.router, prefix="/analyze", tags=["analyze"], dependencies=api_key)
+app.include_router(match.router, prefix="/match", tags=["match"], dependencies=api_key)
 
 @app.get("/healthz")
-def health():
+def healthz():
     return {"ok": True, "model": settings.sentence_model}
 
+@app.get("/metricsz", dependencies=[Depends(verify_api_key)])
+def metrics():
+    return telemetry.snapshot()
@@ -0,0 +1,148 @@
+# app/middleware/compression.py
+"""
+gzip / brotli for HTML and JSON responses.
+
+A response is compressed when all of these hold:
+  - it is sent as a single body (HTMLResponse, JSONResponse, ...): streamed
+    responses (SSE, the NDJSON bulk results, PDFs) pass through untouched so
+    every chunk still reaches the client as soon as it is produced
+  - its type is text/html, application/json or another text type listed in
+    COMPRESSIBLE, and it has no Content-Encoding yet
+  - it is at least COMPRESS_MIN_BYTES long and the client accepts the coding
+
+brotli is preferred when the `brotli` package is installed and the client
+sends `br`; otherwise gzip. A compressed response's ETag is made weak (the
+bytes differ from the identity encoding's) and Vary gains Accept-Encoding.
+
+A 304 has no body to judge, so its ETag is made weak only when it describes
+a 200 that would have been compressed: a compressible Content-Type and a
+Content-Length of at least COMPRESS_MIN_BYTES. Routes answering 304 send
+both headers for the representation the client holds.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli as _brotli
+except ImportError:  # optional: gzip only
+    _brotli = None
+
+CODINGS = ("br", "gzip") if _brotli is not None else ("gzip",)  # in order of preference
+
+COMPRESSIBLE = (
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript",
+    "application/json", "application/javascript", "application/xml", "image/svg+xml",
+)
+# streamed as they are produced; never buffered for compression
+STREAMING = ("text/event-stream", "application/x-ndjson")
+
+
+def accepted(accept_encoding: str) -> Optional[str]:
+    """The coding to use for an Accept-Encoding header: "br", "gzip" or None."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    if _brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return _brotli.compress(body, quality=settings.compress_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compress_level, mtime=0)
+
+
+def compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type in COMPRESSIBLE and content_type not in STREAMING
+
+
+def _would_compress(headers: Headers) -> bool:
+    """For a 304: whether the 200 it stands for (described by its headers) is sent compressed."""
+    if "content-encoding" in headers or not compressible(headers.get("content-type", "")):
+        return False
+    try:
+        return int(headers.get("content-length", "")) >= settings.compress_min_bytes
+    except ValueError:
+        return False
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.compress_min_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+        coding = accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] == 304:
+                    # answers a revalidation: keep the validator the matching 200 was sent with
+                    if _would_compress(headers):
+                        _weaken_etag(MutableHeaders(raw=message["headers"]))
+                    passthrough = True
+                    await send(message)
+                elif "content-encoding" in headers or not compressible(headers.get("content-type", "")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # held until the body shows whether it is worth compressing
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            passthrough = True  # whatever happens below, later messages go straight out
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < settings.compress_min_bytes:
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            body = compress(body, coding)
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(body))
+            _weaken_etag(headers)
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,58 +1,203 @@
-import time, ipaddress
-import redis
-from starlette.types import ASGIApp, Receive, Scope, Send
-from starlette.responses import PlainTextResponse
+# app/middleware/rate_limit.py
+"""
+Cheap rejections for the analysis endpoints, decided before the request body
+is read:
+
+  413  Content-Length above MAX_UPLOAD_BYTES (or, without a Content-Length,
+       as soon as the streamed body passes it)
+  429  IP abuse gate (IP_DAILY_LIMIT requests/day), or today's analysis quota
+       of the session's user (FREE_DAILY_LIMIT) / anonymous IP
+       (ANON_DAILY_LIMIT) already used up
+
+The user is read from the signed session cookie with the same secret and
+format as Starlette's SessionMiddleware. Quota usage lives in Redis as a
+mirror of the database count: the routes remain the authority (they count
+stored reports and queued jobs) and write what they count back through the
+DailyQuota this middleware leaves on `request.state.quota`, so an exhausted
+user is turned away here from their next request on. Without Redis only the
+size cap applies.
+"""
+from __future__ import annotations
+
+import ipaddress
+import json
+import time
+from base64 import b64decode
+from typing import Optional
+
+import itsdangerous
+from starlette.exceptions import HTTPException
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.core.config import settings
 
+# analyses that count against the daily quota (POST only)
+QUOTA_PATHS = ("/ui-match", "/ui-match/stream", "/ui-match/jobs")
+# IP abuse gate
+GUARDED_PATHS = QUOTA_PATHS + ("/demo",)
+# clients of these read {"error": ...} from JSON
+JSON_PATHS = ("/ui-match/stream", "/ui-match/jobs")
+
+SESSION_COOKIE = "session"
+SESSION_MAX_AGE = 14 * 24 * 60 * 60  # SessionMiddleware's default
+
+
+class _BodyTooLarge(HTTPException):
+    # an HTTPException so FastAPI's body parsing re-raises it as a 413 instead of a generic 400
+    def __init__(self, cap: int):
+        super().__init__(status_code=413, detail=_too_large(cap))
+
+
+def _too_large(cap: int) -> str:
+    return f"Upload too large (max {cap / (1024 * 1024):g} MB)."
+
+
+class DailyQuota:
+    """Today's analysis count for one subject (user id or anonymous IP), mirrored in Redis."""
+
+    def __init__(self, client, subject: str, limit: Optional[int]):
+        self.r = client
+        self.key = f"rl:used:{subject}:{time.strftime('%Y%m%d', time.gmtime())}"  # UTC day, like the routes
+        self.limit = limit  # None = unlimited
+
+    def exhausted(self) -> bool:
+        if self.limit is None:
+            return False
+        try:
+            return int(self.r.get(self.key) or 0) >= self.limit
+        except Exception:
+            return False  # the route still checks the database
+
+    def sync(self, used: int) -> None:
+        """Record the authoritative count the route just computed."""
+        try:
+            self.r.set(self.key, used, ex=86400)
+        except Exception:
+            pass
+
+    def add(self, n: int = 1) -> None:
+        """One more analysis stored or queued."""
+        try:
+            if self.r.incr(self.key, n) == n:
+                self.r.expire(self.key, 86400)
+        except Exception:
+            pass
+
+
+def quota_for(request: Request) -> Optional[DailyQuota]:
+    """The DailyQuota the middleware attached to this request, if any."""
+    return getattr(request.state, "quota", None)
+
+
+def session_user_id(scope: Scope, secret: Optional[str] = None) -> Optional[int]:
+    """user_id from the signed session cookie, or None if absent, expired or tampered with."""
+    raw = HTTPConnection(scope).cookies.get(SESSION_COOKIE)
+    if not raw:
+        return None
+    signer = itsdangerous.TimestampSigner(str(secret or settings.oauth_secret))
+    try:
+        data = json.loads(b64decode(signer.unsign(raw.encode("utf-8"), max_age=SESSION_MAX_AGE)))
+    except (itsdangerous.BadSignature, ValueError):
+        return None
+    uid = data.get("user_id") if isinstance(data, dict) else None
+    return uid if isinstance(uid, int) else None
+
+
 class RateLimitMiddleware:
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, client=None):
         self.app = app
-        self.r = redis.from_url(settings.redis_url, decode_responses=True)
+        # `client` lets callers inject any Redis-compatible store (e.g. the in-memory one in benchmarks/)
+        if client is None and settings.redis_url:
+            import redis
+            client = redis.from_url(settings.redis_url, decode_responses=True)
+        self.r = client
         self.window = 86400  # 1 day
 
+    def _reject(self, scope: Scope, status: int, message: str):
+        if scope.get("path") in JSON_PATHS:
+            return JSONResponse({"error": message}, status_code=status, headers={"Connection": "close"})
+        return PlainTextResponse(message, status_code=status, headers={"Connection": "close"})
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
         path = scope.get("path", "")
-        # guard analyze endpoints only
-        if path not in ("/ui-match", "/demo"):
+        if path not in GUARDED_PATHS:
             return await self.app(scope, receive, send)
+        upload = path in QUOTA_PATHS and scope.get("method") == "POST"
 
-        # read session (Starlette stores in scope["session"] only after middleware resolves;
-        # so we look at headers/cookies is tricky here. Best approach:
-        # defer to ASGI downstream, but we want to block before. Simple compromise:
-        # use query of cookies; but safe path: read session later -> we’ll accept minor duplication:
-        # We'll use IP for anon + user_id cookie presence signal from header if any.
-        # Simpler solution: let UI route call a helper check. But we keep middleware:
+        # ---- size cap, from the declared length ----
+        cap = settings.max_upload_bytes if upload else 0
+        if cap:
+            for k, v in scope.get("headers") or []:
+                if k == b"content-length":
+                    try:
+                        too_big = int(v) > cap
+                    except ValueError:
+                        too_big = False
+                    if too_big:
+                        return await self._reject(scope, 413, _too_large(cap))(scope, receive, send)
+                    break
+
+        if self.r is not None:
+            client = scope.get("client")
+            ip = (client[0] if client else "0.0.0.0")
+            try:
+                ipaddress.ip_address(ip)
+            except Exception:
+                ip = "0.0.0.0"
+
+            # Basic IP gate: if they blow past IP_DAILY_LIMIT reqs by IP, just block aggressively (abuse)
+            day = time.strftime("%Y%m%d")
+            key_ip = f"rl:ip:{ip}:{day}"
+            cnt = self.r.incr(key_ip)
+            if cnt == 1:
+                self.r.expire(key_ip, self.window)
+            if cnt > settings.ip_daily_limit:
+                return await self._reject(scope, 429, "Slow down. Try again tomorrow.")(scope, receive, send)
+
+            # Per-tier daily quota (anon by IP, signed-in users by id; premium is unlimited)
+            if upload:
+                user_id = session_user_id(scope)
+                if user_id is not None:
+                    limit = None if settings.premium_unlimited else settings.free_daily_limit
+                    quota = DailyQuota(self.r, f"u:{user_id}", limit)
+                    message = f"Daily limit reached ({settings.free_daily_limit} per day)."
+                else:
+                    quota = DailyQuota(self.r, f"ip:{ip}", settings.anon_daily_limit)
+                    message = f"Daily limit reached ({settings.anon_daily_limit} per day). Sign up to get more!"
+                if quota.exhausted():
+                    return await self._reject(scope, 429, message)(scope, receive, send)
+                scope.setdefault("state", {})["quota"] = quota
+
+        if not cap:
+            return await self.app(scope, receive, send)
+
+        # ---- size cap, for bodies without a (truthful) Content-Length ----
+        seen = 0
+        started = False
+
+        async def capped_receive() -> Message:
+            nonlocal seen
+            message = await receive()
+            if message["type"] == "http.request":
+                seen += len(message.get("body", b""))
+                if seen > cap:
+                    raise _BodyTooLarge(cap)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
 
-        # pull client IP
-        client = scope.get("client")
-        ip = (client[0] if client else "0.0.0.0")
         try:
-            ipaddress.ip_address(ip)
-        except Exception:
-            ip = "0.0.0.0"
-
-        # detect user id from cookie (session) if present (best-effort)
-        # Starlette session cookie name: "session"
-        user_id = None
-        for k, v in (scope.get("headers") or []):
-            if k == b"cookie" and b"session=" in v:
-                # we can't decode session here; so do a conservative approach:
-                # allow per-IP anon once; additional checks happen inside the route.
-                break
-
-        # Basic IP gate for anonymous (1/day)
-        day = time.strftime("%Y%m%d")
-        key_ip = f"rl:ip:{ip}:{day}"
-        cnt = self.r.incr(key_ip)
-        if cnt == 1:
-            self.r.expire(key_ip, self.window)
-
-        # If they blow past 20 reqs by IP, just block aggressively (abuse)
-        if cnt > 20:
-            return await PlainTextResponse("Slow down. Try again tomorrow.", status_code=429)(scope, receive, send)
-
-        # Let the route enforce precise user-tier limits (anon=1, free=15, premium=∞)
-        return await self.app(scope, receive, send)
+            await self.app(scope, capped_receive, tracked_send)
+        except _BodyTooLarge:
+            if started:
+                raise
+            await self._reject(scope, 413, _too_large(cap))(scope, receive, send)
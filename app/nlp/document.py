@@ -0,0 +1,126 @@
+# app/nlp/document.py
+"""
+One parsed input (a resume or a job description), shared by every stage.
+
+Services used to re-derive the same views from the raw string: clean it,
+normalize it for skill matching (once in analyze, again in match), split it
+into tokens, embed it. A Document computes each view on first access and
+keeps it, so one request does each pass once and the views share a single
+cleaned copy of the text.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings as cfg
+from app.nlp import embeddings
+from app.nlp.sections import HEADER, Segment, segment
+from app.nlp.skills_extractor import extract_skill_set_normalized
+from app.nlp.skillset import SkillSet
+
+class Document:
+    # set per request by app/services/degrade.py under load: what was skipped,
+    # whether skill matching may use its fuzzy/semantic pass, which model embeds
+    degraded: Tuple[str, ...] = ()
+    fuzzy: bool = True
+    model: Optional[str] = None
+    # hash of the near-identical text whose skills/embedding were seeded (app/services/job_features.py)
+    borrowed_from: Optional[str] = None
+
+    def __init__(self, text: str):
+        self.raw = text or ""
+
+    @cached_property
+    def cleaned(self) -> str:
+        # drop undecodable bytes / lone surrogates and CRs
+        return self.raw.encode("utf-8", "ignore").decode("utf-8", "ignore").replace("\r", "")
+
+    @cached_property
+    def _segmented(self) -> Tuple[str, List[Segment]]:
+        # one pass over the lines yields both the normalized text and the section offsets
+        return segment(self.cleaned)
+
+    @cached_property
+    def normalized(self) -> str:
+        """Lower-cased word-ish tokens joined by single spaces (what skill matching runs on)."""
+        return self._segmented[0]
+
+    @cached_property
+    def segments(self) -> List[Segment]:
+        """Sections in document order, with offsets into `cleaned` and `normalized`."""
+        return self._segmented[1]
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return self.cleaned.split()
+
+    @cached_property
+    def hash(self) -> str:
+        return hashlib.sha256(self.cleaned.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def sections(self) -> Dict[str, str]:
+        """Text under each recognised heading (Experience, Skills, ...), keyed by canonical name."""
+        out: Dict[str, str] = {}
+        for seg in self.segments:
+            if seg.name == HEADER:
+                continue
+            body = self.cleaned[seg.start:seg.end].strip()
+            out[seg.name] = f"{out[seg.name]}\n{body}" if seg.name in out else body
+        return out
+
+    def section_text(self, *names: str, normalized: bool = False) -> str:
+        """The bodies of the named sections joined (cleaned, or normalized for skill matching)."""
+        text = self.normalized if normalized else self.cleaned
+        sep = " " if normalized else "\n"
+        return sep.join(
+            text[s.norm_start:s.norm_end] if normalized else text[s.start:s.end]
+            for s in self.segments if s.name in names
+        )
+
+    @cached_property
+    def section_skills(self) -> Dict[str, SkillSet]:
+        """Skills found in each section; only the section slices of the normalized text are scanned."""
+        out: Dict[str, SkillSet] = {}
+        for seg in self.segments:
+            found = extract_skill_set_normalized(self.normalized[seg.norm_start:seg.norm_end], fuzzy=self.fuzzy)
+            out[seg.name] = out[seg.name] | found if seg.name in out else found
+        return out
+
+    @cached_property
+    def skill_set(self) -> SkillSet:
+        if not self.fuzzy:
+            return extract_skill_set_normalized(self.normalized, fuzzy=False)
+        if cfg.skills_semantic:
+            # exact alias hits plus embedding matches (app/nlp/semantic_skills.py) instead of fuzzy ones
+            from app.nlp import semantic_skills
+
+            strict = extract_skill_set_normalized(self.normalized, fuzzy=False)
+            return strict | semantic_skills.match(self.cleaned, strict.vocab)
+        return extract_skill_set_normalized(self.normalized)
+
+    @cached_property
+    def skills(self) -> List[str]:
+        return self.skill_set.names()
+
+    @cached_property
+    def embedding(self) -> np.ndarray:
+        return embeddings.embed(self.cleaned, self.model)
+
+    def seed(self, **views) -> None:
+        """Use views computed elsewhere (e.g. for a near-identical text) instead of computing them."""
+        self.__dict__.update(views)
+
+
+def embed_documents(*docs: Document) -> None:
+    """Fill in `embedding` for every document that lacks one with a single model call (per model)."""
+    todo = [d for d in docs if "embedding" not in d.__dict__]
+    for model in dict.fromkeys(d.model for d in todo):
+        group = [d for d in todo if d.model == model]
+        vecs = embeddings.embed_many([d.cleaned for d in group], model)
+        for d, v in zip(group, vecs):
+            d.__dict__["embedding"] = v
@@ -1,22 +1,27 @@
 # app/nlp/embeddings.py
 from __future__ import annotations
 from functools import lru_cache
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from app.core.config import settings
 
-@lru_cache(maxsize=1)
-def get_model() -> SentenceTransformer:
-    # Reads SENTENCE_MODEL via Settings.sentence_model
-    return SentenceTransformer(settings.sentence_model)
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
-def embed(text: str) -> np.ndarray:
-    model = get_model()
-    v = model.encode([text], normalize_embeddings=True)
+@lru_cache(maxsize=2)
+def get_model(name: Optional[str] = None) -> "SentenceTransformer":
+    # Reads SENTENCE_MODEL via Settings.sentence_model; `name` is the smaller DEGRADE_MODEL under load.
+    # Imported here: sentence_transformers pulls in torch (seconds of import time).
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name or settings.sentence_model)
+
+def _model(name: Optional[str]) -> "SentenceTransformer":
+    return get_model(name) if name else get_model()
+
+def embed(text: str, model: Optional[str] = None) -> np.ndarray:
+    v = _model(model).encode([text], normalize_embeddings=True)
     return v[0]
 
-def embed_many(texts: List[str]) -> np.ndarray:
-    model = get_model()
-    return model.encode(texts, normalize_embeddings=True)
+def embed_many(texts: List[str], model: Optional[str] = None) -> np.ndarray:
+    return _model(model).encode(texts, normalize_embeddings=True)
 
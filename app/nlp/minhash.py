@@ -0,0 +1,120 @@
+# app/nlp/minhash.py
+"""
+MinHash signatures and an LSH index for near-duplicate text.
+
+A text becomes the set of its k-word shingles; its signature keeps, for each
+of `bands * rows` random hash permutations, the smallest shingle hash. The
+share of equal positions in two signatures estimates the Jaccard similarity
+of the shingle sets. The LSH index buckets every signature once per band
+(`rows` consecutive values), so texts that agree on a whole band become
+candidates; candidates are then checked against the threshold on the full
+signature. A pair with Jaccard J shares at least one band with probability
+1 - (1 - J**rows) ** bands: more rows per band means fewer false
+candidates, more bands means fewer misses.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_MASK32 = (1 << 32) - 1
+_URL_TAIL = re.compile(r"(https?://[^\s?#]+)[?#]\S*")  # tracking parameters, fragments
+_WORD = re.compile(r"[a-z0-9\+#]+")
+
+
+def shingles(text: str, k: int = 3) -> List[str]:
+    """Distinct k-word shingles of lower-cased text (URL query strings dropped; punctuation and spacing ignored)."""
+    words = _WORD.findall(_URL_TAIL.sub(r"\1", text or "").lower())
+    if len(words) <= k:
+        return [" ".join(words)] if words else []
+    return list(dict.fromkeys(" ".join(words[i:i + k]) for i in range(len(words) - k + 1)))
+
+
+class MinHasher:
+    def __init__(self, bands: int = 20, rows: int = 5, shingle: int = 3, seed: int = 1):
+        self.bands, self.rows, self.shingle = bands, rows, shingle
+        rng = np.random.default_rng(seed)
+        n = bands * rows
+        # multiply-shift hashing: h(x) = ((a*x + b) mod 2**64) >> 32 with odd a; uint64 arithmetic wraps
+        self._a = rng.integers(0, 1 << 63, size=(n, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=(n, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """(bands*rows,) signature (32-bit values in uint64), or None for text without words."""
+        sh = shingles(text, self.shingle)
+        if not sh:
+            return None
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) & _MASK32 for s in sh), dtype=np.uint64, count=len(sh))
+        return ((self._a * x[None, :] + self._b) >> np.uint64(32)).min(axis=1)
+
+    def band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+
+def estimate(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """
+    Bounded, thread-safe LSH index: key -> signature, bucketed per band.
+    The oldest entries are dropped past `capacity`.
+    """
+
+    def __init__(self, hasher: MinHasher, capacity: int = 10000):
+        self.hasher = hasher
+        self.capacity = max(1, capacity)
+        self._sigs: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._buckets: List[dict] = [{} for _ in range(hasher.bands)]
+        self._lock = threading.Lock()
+
+    def _unlink(self, key: Hashable, sig: np.ndarray) -> None:
+        for table, band in zip(self._buckets, self.hasher.band_keys(sig)):
+            keys = table.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del table[band]
+
+    def add(self, key: Hashable, sig: np.ndarray) -> None:
+        with self._lock:
+            old = self._sigs.pop(key, None)
+            if old is not None:
+                self._unlink(key, old)
+            self._sigs[key] = sig
+            for table, band in zip(self._buckets, self.hasher.band_keys(sig)):
+                table.setdefault(band, set()).add(key)
+            while len(self._sigs) > self.capacity:
+                k, s = self._sigs.popitem(last=False)
+                self._unlink(k, s)
+
+    def query(self, sig: np.ndarray, threshold: float) -> List[Tuple[float, Hashable]]:
+        """Indexed keys whose estimated similarity to `sig` is >= threshold, best first."""
+        with self._lock:
+            candidates = set()
+            for table, band in zip(self._buckets, self.hasher.band_keys(sig)):
+                keys = table.get(band)
+                if keys:
+                    candidates |= keys
+            scored = [(estimate(sig, self._sigs[k]), k) for k in candidates]
+        return sorted((s for s in scored if s[0] >= threshold), key=lambda s: -s[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sigs.clear()
+            for table in self._buckets:
+                table.clear()
+
+    def __len__(self) -> int:
+        return len(self._sigs)
+
+
+def brute_force(sig: np.ndarray, sigs: Sequence[np.ndarray], threshold: float) -> List[int]:
+    """Indexes of `sigs` at or above `threshold` (the scan the index avoids; for benchmarks and tests)."""
+    return [i for i, s in enumerate(sigs) if estimate(sig, s) >= threshold]
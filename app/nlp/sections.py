@@ -0,0 +1,82 @@
+# app/nlp/sections.py
+"""
+Single-pass resume segmentation.
+
+One walk over the lines of the cleaned text does two jobs: it builds the
+normalized text skill matching runs on (exactly `normalize(cleaned)`:
+word-ish tokens never span a line break, so per-line tokens joined by
+spaces give the same string) and it records where each section (Experience,
+Skills, Education, ...) starts and ends, both in the cleaned text and in the
+normalized text. Later stages slice those offsets to restrict or weight
+skill and metric extraction by section instead of scanning the document
+again.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from app.nlp.skills_extractor import _WORDISH
+
+# A heading is a short line that is exactly one of these words/phrases (optionally with a colon)
+HEADINGS = {
+    "summary": "summary", "profile": "summary", "about": "summary", "objective": "summary",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment": "experience", "employment history": "experience",
+    "education": "education",
+    "skills": "skills", "technical skills": "skills", "core skills": "skills", "technologies": "skills",
+    "projects": "projects", "personal projects": "projects",
+    "certifications": "certifications", "certificates": "certifications",
+}
+_MAX_HEADING = max(len(h) for h in HEADINGS)
+
+# text before the first recognised heading (name, contact line, ...)
+HEADER = "header"
+
+
+@dataclass(frozen=True)
+class Segment:
+    name: str        # canonical section name, or HEADER
+    start: int       # [start, end) of the body in the cleaned text (heading line excluded)
+    end: int
+    norm_start: int  # [norm_start, norm_end) of the body in the normalized text
+    norm_end: int
+
+
+def heading(line: str) -> str:
+    """Canonical section name if `line` is a heading, else ''."""
+    s = line.strip(" \t")
+    if s.endswith(":"):
+        s = s[:-1].rstrip(" \t")
+    if len(s) > _MAX_HEADING:
+        return ""
+    return HEADINGS.get(s.lower(), "")
+
+def segment(cleaned: str) -> Tuple[str, List[Segment]]:
+    """(normalized text, segments in document order); the HEADER segment is only present if non-empty."""
+    parts: List[str] = []
+    segments: List[Segment] = []
+    name, start, norm_start = HEADER, 0, 0
+    pos = norm = 0
+
+    def close() -> None:
+        if name != HEADER or cleaned[start:pos].strip():
+            segments.append(Segment(name, start, pos, min(norm_start, norm), norm))
+
+    lines = cleaned.split("\n")
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        title = heading(line) if len(line) <= _MAX_HEADING + 8 else ""
+        if title:
+            close()
+        toks = _WORDISH.findall(line.lower())
+        if toks:
+            joined = " ".join(toks)
+            norm += len(joined) + (1 if parts else 0)
+            parts.append(joined)
+        pos += len(line) + (i < last)
+        if title:
+            # the body's first token follows a separator, unless nothing came before it
+            name, start, norm_start = title, pos, norm + (1 if parts else 0)
+    close()
+    return " ".join(parts), segments
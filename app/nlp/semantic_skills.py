@@ -0,0 +1,122 @@
+# app/nlp/semantic_skills.py
+"""
+Embedding-based skill matching (SKILLS_SEMANTIC=true).
+
+Every alias in the skills dictionary is embedded once into a matrix (one
+L2-normalised row per alias, tagged with its skill id), using the model
+`get_model()` already loaded for match scoring. For a document, candidate
+phrases (1..SKILLS_SEMANTIC_MAX_NGRAM word windows inside each clause) are
+embedded with one `embed_many` call; phrase x alias similarity is then a
+single matrix multiply, and a skill matches when any of its aliases is
+within SKILLS_SEMANTIC_THRESHOLD of any phrase.
+
+Exact alias hits still come from the strict matcher; this replaces the
+rapidfuzz fallback and also catches paraphrases ("container orchestration"
+for kubernetes) that string similarity cannot. The matrix is rebuilt when
+the dictionary is reloaded or the model changes.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings as cfg
+from app.nlp import embeddings
+from app.nlp.skills_extractor import GENERIC_SINGLE_TOKENS, NO_FUZZ, loaded_dictionary
+from app.nlp.skillset import SkillSet
+
+# Aliases this short ("c", "go", "ts") carry no meaning for an embedding; the strict matcher owns them
+MIN_ALIAS_LEN = 3
+
+_CLAUSE = re.compile(r"[;:!?()\[\]\n•|,]+|\.(?:\s|$)")
+_WORD = re.compile(r"[a-z0-9\-\+\/\._#%]+")
+_STOP = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "of", "on", "or", "over",
+    "the", "to", "with", "within", "using", "via", "per", "our", "we", "i", "my", "is", "are",
+    "was", "were", "be", "been", "this", "that", "it", "its", "than", "then", "all", "across",
+}
+
+
+@dataclass
+class SkillMatrix:
+    version: str
+    model: str
+    vocab: Tuple[str, ...]
+    matrix: np.ndarray       # (aliases, dim) float32, rows L2-normalised
+    owner: np.ndarray        # (aliases,) skill id of each row
+
+
+_MATRIX: Optional[SkillMatrix] = None
+_LOCK = threading.Lock()
+
+
+def _alias_rows(vocab: Tuple[str, ...], canonical: dict) -> Tuple[List[str], List[int]]:
+    texts, owner = [], []
+    for i, name in enumerate(vocab):
+        for alias in dict.fromkeys((name,) + tuple(canonical.get(name, ()))):
+            if len(alias) < MIN_ALIAS_LEN or alias in NO_FUZZ or alias in GENERIC_SINGLE_TOKENS:
+                continue
+            texts.append(alias)
+            owner.append(i)
+    return texts, owner
+
+def skill_matrix() -> SkillMatrix:
+    """The alias embedding matrix for the loaded dictionary, built on first use (call at startup to warm it)."""
+    global _MATRIX
+    version, vocab, canonical = loaded_dictionary()
+    m = _MATRIX
+    if m is not None and m.version == version and m.model == cfg.sentence_model:
+        return m
+    with _LOCK:
+        m = _MATRIX
+        if m is not None and m.version == version and m.model == cfg.sentence_model:
+            return m
+        texts, owner = _alias_rows(vocab, canonical)
+        matrix = np.asarray(embeddings.embed_many(texts), dtype=np.float32) if texts else np.zeros((0, 1), np.float32)
+        _MATRIX = m = SkillMatrix(version, cfg.sentence_model, vocab, matrix, np.asarray(owner, dtype=np.int64))
+        return m
+
+def candidates(text: str, max_ngram: Optional[int] = None, limit: Optional[int] = None) -> List[str]:
+    """Distinct 1..max_ngram word windows within clauses, not starting or ending on a stopword or a number."""
+    max_ngram = max_ngram or cfg.skills_semantic_max_ngram
+    limit = limit or cfg.skills_semantic_max_candidates
+    seen: dict = {}
+    for clause in _CLAUSE.split((text or "").lower()):
+        words = _WORD.findall(clause)
+        for i, first in enumerate(words):
+            if first in _STOP or first.isdigit():
+                continue
+            for n in range(1, max_ngram + 1):
+                if i + n > len(words):
+                    break
+                last = words[i + n - 1]
+                if last in _STOP or last.isdigit():
+                    continue
+                seen.setdefault(" ".join(words[i:i + n]), None)
+                if len(seen) >= limit:
+                    return list(seen)
+    return list(seen)
+
+def match(text: str, vocab: Optional[Tuple[str, ...]] = None) -> SkillSet:
+    """
+    Skills whose aliases are semantically close to a phrase of `text`.
+    With `vocab`, the result is over that vocabulary (empty if the loaded
+    dictionary has moved on since it was taken).
+    """
+    m = skill_matrix()
+    vocab = m.vocab if vocab is None else vocab
+    if vocab is not m.vocab and vocab != m.vocab:
+        return SkillSet(0, vocab)
+    phrases = candidates(text)
+    if not phrases or not len(m.matrix):
+        return SkillSet(0, vocab)
+    vecs = np.asarray(embeddings.embed_many(phrases), dtype=np.float32)
+    best = (vecs @ m.matrix.T).max(axis=0)             # best phrase per alias
+    mask = 0
+    for i in np.unique(m.owner[best >= cfg.skills_semantic_threshold]):
+        mask |= 1 << int(i)
+    return SkillSet(mask, vocab)
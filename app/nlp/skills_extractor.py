@@ -1,10 +1,11 @@
 # app/nlp/skills_extractor.py
 from __future__ import annotations
 
-import csv
+import logging
 import re
-from pathlib import Path
-from typing import Dict, Iterable, List, Set, Tuple
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     from rapidfuzz import fuzz
@@ -12,6 +13,12 @@ try:
 except Exception:
     _HAS_FUZZ = False
 
+from app.core.config import settings as cfg
+from app.nlp import skills_snapshot
+from app.nlp.skillset import SkillSet
+
+log = logging.getLogger(__name__)
+
 # -----------------------
 # Tunables (be stricter)
 # -----------------------
@@ -28,80 +35,114 @@ REQUIRE_ALL_WORDS_BOUNDARY_FIRST = True
 # Words that are too generic to be standalone signals (blocked unless part of a longer alias)
 GENERIC_SINGLE_TOKENS = {"systems", "development", "software", "programming", "server", "client", "cloud"}
 
-# Canonical -> set(aliases)
-_CANONICAL: Dict[str, Set[str]] = {}
+# The loaded dictionary, swapped as a whole on (re)load: version, vocabulary
+# (id -> canonical name, sorted) and (bit, canonical, aliases) per skill
+_CANONICAL: Dict[str, Tuple[str, ...]] = {}
+_VERSION = ""
+_VOCAB: Tuple[str, ...] = ()
+_ENTRIES: Tuple[Tuple[int, str, Tuple[str, ...]], ...] = ()
+_FINGERPRINT: Optional[Tuple] = None
+_CHECKED_AT = 0.0
+_LOAD_LOCK = threading.Lock()
 
 # Keep alphanumerics and a few symbols; collapse whitespace.
 _WORDISH = re.compile(r"[a-z0-9\-\+\/\._%]+")
-def _normalize(text: str) -> str:
+def normalize(text: str) -> str:
     t = text or ""
     t = t.lower()
     toks = _WORDISH.findall(t)
     return " ".join(toks)
 
-def _load_skills_csv(path: Path) -> Dict[str, Set[str]]:
-    mapping: Dict[str, Set[str]] = {}
-    with path.open(encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            cname = (row.get("skill") or row.get("name") or "").strip().lower()
-            if not cname:
-                continue
-            aliases = {cname}
-            raw_aliases = row.get("aliases") or ""
-            for a in raw_aliases.split(","):
-                a = a.strip().lower()
-                if a:
-                    aliases.add(a)
-            mapping[cname] = aliases
-    return mapping
+# Minimal fallback. Extend via data/skills.csv in production.
+_FALLBACK: Dict[str, Set[str]] = {
+    "docker": {"docker", "docker compose", "compose"},
+    "linux": {"linux", "gnu/linux"},
+    "bash": {"bash", "shell", "sh"},
+    "redis": {"redis"},
+    "postgresql": {"postgresql", "postgres", "psql"},
+    "mysql": {"mysql"},
+    "sql": {"sql"},
+    "rest api": {"rest api", "restful api", "http api", "rest"},
+    "nginx": {"nginx"},
+    "git": {"git"},
+    "github actions": {"github actions", "actions"},
+    "jenkins": {"jenkins", "cicd", "ci/cd"},
+    "pytest": {"pytest"},
+    "junit": {"junit"},
+    "c++": {"c++", "cpp"},
+    "c": {"c"},
+    "python": {"python", "py"},
+    "java": {"java"},
+    "socket programming": {"socket programming", "sockets", "tcp", "udp", "network sockets"},
+    "communication protocols": {"protocols", "tcp/ip", "grpc", "rpc", "http"},
+}
 
 def _ensure_loaded():
-    global _CANONICAL
-    if _CANONICAL:
+    """
+    Load the dictionary (snapshot if current, else CSV, else the fallback) and,
+    every SKILLS_RELOAD_INTERVAL seconds, reload it if the CSV or snapshot changed.
+    """
+    global _CANONICAL, _VERSION, _VOCAB, _ENTRIES, _FINGERPRINT, _CHECKED_AT
+    interval = cfg.skills_reload_interval
+    if _CANONICAL and (interval <= 0 or time.monotonic() - _CHECKED_AT < interval):
         return
-    path = Path("data/skills.csv")
-    if path.exists():
-        _CANONICAL = _load_skills_csv(path)
-    else:
-        # Minimal fallback. Extend via data/skills.csv in production.
-        _CANONICAL = {
-            "docker": {"docker", "docker compose", "compose"},
-            "linux": {"linux", "gnu/linux"},
-            "bash": {"bash", "shell", "sh"},
-            "redis": {"redis"},
-            "postgresql": {"postgresql", "postgres", "psql"},
-            "mysql": {"mysql"},
-            "sql": {"sql"},
-            "rest api": {"rest api", "restful api", "http api", "rest"},
-            "nginx": {"nginx"},
-            "git": {"git"},
-            "github actions": {"github actions", "actions"},
-            "jenkins": {"jenkins", "cicd", "ci/cd"},
-            "pytest": {"pytest"},
-            "junit": {"junit"},
-            "c++": {"c++", "cpp"},
-            "c": {"c"},
-            "python": {"python", "py"},
-            "java": {"java"},
-            "socket programming": {"socket programming", "sockets", "tcp", "udp", "network sockets"},
-            "communication protocols": {"protocols", "tcp/ip", "grpc", "rpc", "http"},
-        }
+    with _LOAD_LOCK:
+        if _CANONICAL and (interval <= 0 or time.monotonic() - _CHECKED_AT < interval):
+            return
+        _CHECKED_AT = time.monotonic()
+        fp = skills_snapshot.fingerprint()
+        if _CANONICAL and fp == _FINGERPRINT:
+            return
+        try:
+            data = skills_snapshot.load()
+        except Exception:
+            if not _CANONICAL:
+                raise
+            log.warning("Skills reload failed; keeping version %s", _VERSION, exc_info=True)
+            return
+        if data is None:
+            data = skills_snapshot.compile_data(_FALLBACK, version="builtin")
+        vocab = tuple(sorted(data.canonical))
+        _ENTRIES = tuple((1 << i, c, data.canonical[c]) for i, c in enumerate(vocab))
+        _VOCAB = vocab
+        _VERSION = data.version
+        _CANONICAL = data.canonical
+        _FINGERPRINT = fp
+
+def skills_version() -> str:
+    """Identifies the loaded dictionary (short CSV hash); changes whenever skills are reloaded."""
+    _ensure_loaded()
+    return _VERSION
 
-# ---------- Strict matching helpers ----------
+def loaded_dictionary() -> Tuple[str, Tuple[str, ...], Dict[str, Tuple[str, ...]]]:
+    """(version, vocabulary, canonical -> aliases) of the loaded dictionary."""
+    _ensure_loaded()
+    return _VERSION, _VOCAB, _CANONICAL
 
-_BOUNDARY_CACHE: Dict[str, re.Pattern] = {}
+def skills_vocab() -> Tuple[str, ...]:
+    """Canonical names by integer id (sorted); the vocabulary SkillSet masks index into."""
+    _ensure_loaded()
+    return _VOCAB
 
-def _word_boundary_rx(alias: str) -> re.Pattern:
-    """Word-boundary regex for alias (multi-word → allow single whitespace)."""
-    rx = _BOUNDARY_CACHE.get(alias)
-    if rx:
-        return rx
-    escaped = re.escape(alias).replace(r"\ ", r"\s+")
-    pattern = rf"(?<![A-Za-z0-9_]){escaped}(?![A-Za-z0-9_])"
-    rx = re.compile(pattern, re.IGNORECASE)
-    _BOUNDARY_CACHE[alias] = rx
-    return rx
+# ---------- Strict matching helpers ----------
+# Same rule as the regex (?<![A-Za-z0-9_])alias(?![A-Za-z0-9_]) on the normalized
+# text, but with str.find: nothing to compile per alias, so a large dictionary
+# costs nothing until it is used.
+
+def _is_word_char(c: str) -> bool:
+    return c.isascii() and (c.isalnum() or c == "_")
+
+def _bounded_in(needle: str, text: str) -> bool:
+    """True if `needle` occurs in `text` without a word character directly before or after it."""
+    n, start = len(needle), 0
+    while True:
+        i = text.find(needle, start)
+        if i < 0:
+            return False
+        j = i + n
+        if (i == 0 or not _is_word_char(text[i - 1])) and (j == len(text) or not _is_word_char(text[j])):
+            return True
+        start = i + 1
 
 def _all_words_present(alias: str, text: str) -> bool:
     """Require each token of a multi-word alias to appear as a word (strict)."""
@@ -109,7 +150,7 @@ def _all_words_present(alias: str, text: str) -> bool:
     if not words:
         return False
     for w in words:
-        if not _word_boundary_rx(w).search(text):
+        if not _bounded_in(w, text):
             return False
     return True
 
@@ -126,7 +167,7 @@ def _strict_alias_hit(alias: str, text: str) -> bool:
     if len(tokens) == 1:
         if alias in GENERIC_SINGLE_TOKENS:
             return False
-        return bool(_word_boundary_rx(alias).search(text))
+        return _bounded_in(alias, text)
     # multi-word
     if REQUIRE_ALL_WORDS_BOUNDARY_FIRST and not _all_words_present(alias, text):
         return False
@@ -148,19 +189,37 @@ def extract_skills(text: str) -> List[str]:
       - Only then fuzzy for long-enough aliases not in NO_FUZZ.
       - Returns canonical skill names.
     """
+    return extract_skills_normalized(normalize(text))
+
+def extract_skills_normalized(body: str) -> List[str]:
+    """`extract_skills` for text already passed through `normalize` (see app/nlp/document.py)."""
+    return extract_skill_set_normalized(body).names()
+
+def extract_skill_set_normalized(body: str, fuzzy: bool = True) -> SkillSet:
+    """
+    Skills in normalized text as a bitset over the loaded dictionary's ids.
+    fuzzy=False keeps only strict alias hits (semantic mode brings its own recall).
+    """
     _ensure_loaded()
-    body = _normalize(text)
-    found: Set[str] = set()
-    for canonical, aliases in _CANONICAL.items():
+    entries, vocab = _ENTRIES, _VOCAB  # one consistent dictionary even if a reload swaps it meanwhile
+    mask = 0
+    for bit, canonical, aliases in entries:
         # If any alias passes strict boundary rules, accept.
         if any(_strict_alias_hit(a, body) for a in aliases):
-            found.add(canonical)
+            mask |= bit
             continue
         # Otherwise try fuzzy for long aliases.
-        if any(_fuzzy_fallback(a, body) for a in aliases):
-            found.add(canonical)
-    return sorted(found)
+        if fuzzy and any(_fuzzy_fallback(a, body) for a in aliases):
+            mask |= bit
+    return SkillSet(mask, vocab)
+
+def extract_skill_set(text: str) -> SkillSet:
+    return extract_skill_set_normalized(normalize(text))
+
+def extract_skill_mask(text: str) -> Tuple[str, int]:
+    """(dictionary version, mask): a compact result for process pools; see bulk_score_service."""
+    s = extract_skill_set(text)
+    return _VERSION if s.vocab is _VOCAB else "", s.mask
 
 def extract_skills_set(text: str) -> Set[str]:
     return set(extract_skills(text))
-
@@ -0,0 +1,150 @@
+# app/nlp/skills_snapshot.py
+"""
+Binary snapshot of the skills dictionary.
+
+`python -m app.cli build-skills` parses data/skills.csv once and writes a
+pickle holding what the extractor derives from it: canonical names with
+integer ids and their normalized, deduplicated aliases. Workers load it
+with one mmap + unpickle instead of re-parsing the CSV.
+
+A snapshot records the mtime, size and SHA-256 of the CSV it was built
+from and is only used while the CSV still matches, so editing the CSV
+without rebuilding falls back to parsing it rather than serving stale
+skills. Loading compares mtime and size only; the CSV is hashed just when
+those differ (e.g. a checkout touched the file without changing it).
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings as cfg
+
+SNAPSHOT_FORMAT = 2
+_MAGIC = "devmatch-skills"
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+def resolve_path(p: str) -> Path:
+    """Relative paths are relative to the repository, not the working directory."""
+    path = Path(p)
+    return path if path.is_absolute() else _ROOT / path
+
+
+def csv_path() -> Path:
+    return resolve_path(cfg.skills_csv)
+
+
+def snapshot_path() -> Path:
+    return resolve_path(cfg.skills_snapshot)
+
+
+@dataclass
+class SkillsData:
+    version: str                                  # short hash of the source CSV ("builtin" for the fallback)
+    canonical: Dict[str, Tuple[str, ...]]         # canonical -> normalized aliases
+
+
+def parse_csv(path: Path) -> Dict[str, Set[str]]:
+    mapping: Dict[str, Set[str]] = {}
+    with path.open(encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            cname = (row.get("skill") or row.get("name") or "").strip().lower()
+            if not cname:
+                continue
+            aliases = {cname}
+            raw_aliases = row.get("aliases") or ""
+            for a in raw_aliases.split(","):
+                a = a.strip().lower()
+                if a:
+                    aliases.add(a)
+            mapping[cname] = aliases
+    return mapping
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compile_data(mapping: Dict[str, Set[str]], version: str) -> SkillsData:
+    canonical = {
+        c: tuple(sorted({a.strip().lower() for a in aliases if a.strip()}))
+        for c, aliases in mapping.items()
+    }
+    return SkillsData(version=version, canonical=canonical)
+
+
+def file_stat(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def build_snapshot(csv_file: Optional[Path] = None, out: Optional[Path] = None) -> Tuple[Path, SkillsData]:
+    csv_file = csv_file or csv_path()
+    out = out or snapshot_path()
+    stat, digest = file_stat(csv_file), file_hash(csv_file)
+    data = compile_data(parse_csv(csv_file), version=digest[:12])
+    blob = {"magic": _MAGIC, "format": SNAPSHOT_FORMAT, "source_stat": stat, "source_sha256": digest, "data": data}
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=out.name, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, out)  # atomic: workers never see a half-written file
+    return out, data
+
+
+def load_snapshot(path: Path, source: Optional[Path] = None) -> Optional[SkillsData]:
+    """
+    The snapshot's data, or None if it is missing, from another format or not
+    built from `source` as it is now (same mtime and size, else same SHA-256).
+    """
+    try:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            blob = pickle.loads(m)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(blob, dict) or blob.get("magic") != _MAGIC or blob.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if source is not None and tuple(blob.get("source_stat") or ()) != file_stat(source):
+        if blob.get("source_sha256") != file_hash(source):
+            return None
+    return blob["data"]
+
+
+def load() -> Optional[SkillsData]:
+    """Snapshot if it matches the CSV, else the parsed CSV, else None (caller uses its fallback)."""
+    src, snap = csv_path(), snapshot_path()
+    if src.exists():
+        if snap.exists():
+            data = load_snapshot(snap, source=src)
+            if data is not None:
+                return data
+        return compile_data(parse_csv(src), version=file_hash(src)[:12])
+    if snap.exists():
+        return load_snapshot(snap)
+    return None
+
+
+def fingerprint() -> Tuple:
+    """Cheap change detector for hot reload: (mtime_ns, size) of the CSV and the snapshot."""
+    out = []
+    for p in (csv_path(), snapshot_path()):
+        try:
+            st = p.stat()
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
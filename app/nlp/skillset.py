@@ -0,0 +1,113 @@
+# app/nlp/skillset.py
+"""
+Skill sets as bitsets over the dictionary's integer ids.
+
+The skills dictionary numbers its canonical names 0..n-1 in sorted order
+(see skills_snapshot.compile_data), so a set of skills is one Python int
+with bit i set for skill i: overlap is `a & b`, missing is `b & ~a`, size is
+a popcount, and decoding a mask yields names already sorted. Names are only
+materialized at the edges (API payloads, reports).
+
+For many pairs at once, `pack` turns masks into a uint64 matrix and
+`overlap_counts` / `coverage` work on whole rows with NumPy.
+"""
+from __future__ import annotations
+
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+
+class SkillSet:
+    """An immutable set of skills: a bitmask plus the vocabulary (id -> name) it indexes."""
+
+    __slots__ = ("mask", "vocab")
+
+    def __init__(self, mask: int, vocab: Tuple[str, ...]):
+        self.mask = mask
+        self.vocab = vocab
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], vocab: Tuple[str, ...]) -> "SkillSet":
+        """Names missing from `vocab` are dropped."""
+        index = {n: i for i, n in enumerate(vocab)}
+        mask = 0
+        for n in names:
+            i = index.get(n)
+            if i is not None:
+                mask |= 1 << i
+        return cls(mask, vocab)
+
+    @classmethod
+    def pair(cls, a: Iterable[str], b: Iterable[str]) -> Tuple["SkillSet", "SkillSet"]:
+        """Two name collections encoded over a vocabulary made of their union (nothing is dropped)."""
+        a, b = list(a), list(b)
+        vocab = tuple(sorted(set(a) | set(b)))
+        return cls.from_names(a, vocab), cls.from_names(b, vocab)
+
+    def _coerce(self, other: "SkillSet") -> "SkillSet":
+        if other.vocab is self.vocab or other.vocab == self.vocab:
+            return other
+        raise ValueError("SkillSets from different skill dictionaries cannot be combined")
+
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & self._coerce(other).mask, self.vocab)
+
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask | self._coerce(other).mask, self.vocab)
+
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & ~self._coerce(other).mask, self.vocab)
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SkillSet) and self.mask == other.mask and self.vocab == other.vocab
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        return f"SkillSet({self.names()!r})"
+
+    def ids(self) -> List[int]:
+        out, m = [], self.mask
+        while m:  # highest bit first: clearing it never touches the lower words
+            top = m.bit_length() - 1
+            out.append(top)
+            m ^= 1 << top
+        out.reverse()
+        return out
+
+    def names(self) -> List[str]:
+        """Sorted skill names (ids follow the sorted vocabulary)."""
+        return [self.vocab[i] for i in self.ids()]
+
+
+# -------------------- many pairs at once --------------------
+def pack(masks: Sequence[int], nbits: int) -> np.ndarray:
+    """(len(masks), ceil(nbits/64)) uint64 matrix, one bitset per row."""
+    words = max(1, (nbits + 63) // 64)
+    nbytes = words * 8
+    buf = b"".join(m.to_bytes(nbytes, "little") for m in masks)
+    return np.frombuffer(buf, dtype="<u8").reshape(len(masks), words)
+
+def popcount(rows: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed matrix."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(rows).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(rows.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+def overlap_counts(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """|a_i & b_i| for each row pair (a and b packed to the same shape, or b broadcast from one row)."""
+    return popcount(a & b)
+
+def coverage(resume: np.ndarray, jd: np.ndarray) -> np.ndarray:
+    """Share of each JD's skills present in the paired resume (0 where a JD has no skills)."""
+    have = overlap_counts(resume, jd)
+    want = popcount(jd)
+    return np.divide(have, want, out=np.zeros(len(want), dtype=np.float64), where=want > 0)
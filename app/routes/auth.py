@@ -4,29 +4,23 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Request, Form
 from fastapi.responses import RedirectResponse, HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from authlib.integrations.starlette_client import OAuth
-
-from app.db.session import SessionLocal
+from app.db.session import get_db
 from app.db.models import User
 from app.core.config import settings as cfg
 
-from app.utils.passwords import hash_password, verify_password
+from app.utils.passwords import PasswordServiceBusy, hash_password_async, verify_and_update_async
+from app.utils.static import asset_url
 from starlette.templating import Jinja2Templates
 
 
 router = APIRouter(prefix="", tags=["auth"])
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
 
-
-# DB dep
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+_BUSY = "We're handling a lot of sign-ins right now. Please try again in a moment."
 
 
 # ---------- Email + Password ----------
@@ -42,7 +36,7 @@ async def signup_submit(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     email = (email or "").strip().lower()
     pwd = (password or "").strip()
@@ -52,7 +46,7 @@ async def signup_submit(
         err = "Please enter a valid email."
     elif len(pwd) < 8:
         err = "Password must be at least 8 characters."
-    elif db.query(User).filter(User.email == email).first():
+    elif await db.scalar(select(User).where(User.email == email)):
         err = "An account with this email already exists."
 
     if err:
@@ -65,15 +59,22 @@ async def signup_submit(
         u = User(
             email=email,
             name=email.split("@")[0],
-            password_hash=hash_password(pwd),
+            password_hash=await hash_password_async(pwd),
         )
-        db.add(u); db.commit(); db.refresh(u)
+        db.add(u); await db.commit(); await db.refresh(u)
     except ValueError as ve:
         # Catch errors from hash_password (e.g., too short/too long)
         return templates.TemplateResponse(
             "signup.html",
             {"request": request, "error": str(ve), "email": email}
         )
+    except PasswordServiceBusy:
+        return templates.TemplateResponse(
+            "signup.html",
+            {"request": request, "error": _BUSY, "email": email},
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
 
     if hasattr(request, "session"):
         request.session["user_id"] = u.id
@@ -92,13 +93,28 @@ async def login_password_submit(
     request: Request,
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     email = (email or "").strip().lower()
     pwd = (password or "").strip()
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not user.password_hash or not verify_password(pwd, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == email))
+    ok = False
+    if user and user.password_hash:
+        try:
+            ok, new_hash = await verify_and_update_async(pwd, user.password_hash)
+        except PasswordServiceBusy:
+            return templates.TemplateResponse(
+                "login_password.html",
+                {"request": request, "error": _BUSY, "email": email},
+                status_code=503,
+                headers={"Retry-After": "5"},
+            )
+        if ok and new_hash:
+            # stored hash used an older scheme or cost parameters
+            user.password_hash = new_hash
+            await db.commit()
+    if not ok:
         return templates.TemplateResponse(
             "login_password.html",
             {"request": request, "error": "Invalid email or password.", "email": email},
@@ -117,40 +133,50 @@ async def logout(request: Request):
 
 
 # ----- OAuth (GitHub = OAuth2, NOT OIDC) -----
-oauth = OAuth()
-if cfg.github_client_id and cfg.github_client_secret:
-    oauth.register(
-        name="github",
-        client_id=cfg.github_client_id,
-        client_secret=cfg.github_client_secret,
-        access_token_url="https://github.com/login/oauth/access_token",
-        authorize_url="https://github.com/login/oauth/authorize",
-        api_base_url="https://api.github.com/",
-        client_kwargs={"scope": "user:email"},
-    )
+_github = None
+
+def _github_client():
+    """The GitHub OAuth client, or None when not configured. authlib is imported on first use."""
+    global _github
+    if _github is None and cfg.github_client_id and cfg.github_client_secret:
+        from authlib.integrations.starlette_client import OAuth
+
+        oauth = OAuth()
+        _github = oauth.register(
+            name="github",
+            client_id=cfg.github_client_id,
+            client_secret=cfg.github_client_secret,
+            access_token_url="https://github.com/login/oauth/access_token",
+            authorize_url="https://github.com/login/oauth/authorize",
+            api_base_url="https://api.github.com/",
+            client_kwargs={"scope": "user:email"},
+        )
+    return _github
 
 def _abs(request: Request, path: str) -> str:
     return f"{request.url.scheme}://{request.url.netloc}{path}"
 
 @router.get("/login/github")
 async def login_github(request: Request):
-    if "github" not in oauth._clients:
+    github = _github_client()
+    if github is None:
         return RedirectResponse("/")
     redirect_uri = _abs(request, "/auth/github/callback")
-    return await oauth.github.authorize_redirect(request, redirect_uri)
+    return await github.authorize_redirect(request, redirect_uri)
 
 @router.get("/auth/github/callback")
-async def auth_github_callback(request: Request, db: Session = Depends(get_db)):
-    if "github" not in oauth._clients:
+async def auth_github_callback(request: Request, db: AsyncSession = Depends(get_db)):
+    github = _github_client()
+    if github is None:
         return RedirectResponse("/?error=github_not_configured")
 
-    token = await oauth.github.authorize_access_token(request)
-    me = await oauth.github.get("user", token=token)
+    token = await github.authorize_access_token(request)
+    me = await github.get("user", token=token)
     data = me.json() if me else {}
     email = data.get("email")
 
     if not email:
-        emails = await oauth.github.get("user/emails", token=token)
+        emails = await github.get("user/emails", token=token)
         if emails and emails.json():
             prim = next((e for e in emails.json() if e.get("primary")), None)
             email = (prim or emails.json()[0]).get("email")
@@ -158,10 +184,10 @@ async def auth_github_callback(request: Request, db: Session = Depends(get_db)):
     if not email:
         return RedirectResponse("/?error=no_email_from_github")
 
-    user: Optional[User] = db.query(User).filter(User.email == email).first()
+    user: Optional[User] = await db.scalar(select(User).where(User.email == email))
     if not user:
         user = User(email=email, name=data.get("name") or data.get("login"))
-        db.add(user); db.commit(); db.refresh(user)
+        db.add(user); await db.commit(); await db.refresh(user)
 
     if hasattr(request, "session"):
         request.session["user_id"] = user.id
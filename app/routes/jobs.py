@@ -1,25 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+from app.db.session import AsyncSessionLocal, get_db
 from app.db.models import Job
 from app.schemas.base import JobCreate
+from app.services.bulk_ingest import NDJSON, BatchTasks, IngestResponse, insert_stream, ndjson_items
+from app.services.job_ingest import precompute
 
 
 router = APIRouter()
 
 
-def get_db():
-	db = SessionLocal()
-	try:
-		yield db
-	finally:
-		db.close()
-
-
 @router.post("", summary="Create job posting")
-async def create_job(payload: JobCreate, db: Session = Depends(get_db)):
+async def create_job(payload: JobCreate, background: BackgroundTasks, db: AsyncSession = Depends(get_db)):
 	if len(payload.description) < 20:
 		raise HTTPException(status_code=400, detail="Job description too short")
 	j = Job(title=payload.title, description=payload.description)
-	db.add(j); db.commit(); db.refresh(j)
+	db.add(j); await db.commit(); await db.refresh(j)
+	# skills + embedding are computed after the response is sent
+	background.add_task(precompute, j.id)
 	return {"job_id": j.id}
+
+
+def _job_row(item: dict) -> Job:
+	payload = JobCreate(**item)
+	if len(payload.description) < 20:
+		raise ValueError("description too short")
+	return Job(title=payload.title, description=payload.description)
+
+
+@router.post("/bulk", summary="Create many job postings from NDJSON lines of {title, description}")
+async def bulk_jobs(request: Request):
+	if not request.headers.get("content-type", "").startswith((NDJSON, "application/jsonl", "application/json")):
+		raise HTTPException(status_code=415, detail=f"Send {NDJSON}")
+	# features for each batch are computed as soon as it is committed, one model call per batch
+	precompute_batch = BatchTasks(precompute)
+
+	async def results():
+		async with AsyncSessionLocal() as db:
+			rows = insert_stream(
+				db, ndjson_items(request.stream()), _job_row, "job_id",
+				after_commit=precompute_batch,
+			)
+			async for line in rows:
+				yield line
+
+	# the response ends once the last batch's features are in
+	return IngestResponse(results(), background=BackgroundTask(precompute_batch.wait))
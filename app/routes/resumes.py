@@ -1,38 +1,65 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_db
 from app.db.models import Resume
 from app.schemas.base import ResumeCreate
+from app.services.bulk_ingest import NDJSON, IngestResponse, insert_stream, ndjson_items, pdf_items
 from app.utils.pdf import extract_pdf_text
 
 
 router = APIRouter()
 
 
-def get_db():
-	db = SessionLocal()
-	try:
-		yield db
-	finally:
-		db.close()
-
-
 @router.post("", summary="Create resume from raw text")
-async def create_resume(payload: ResumeCreate, db: Session = Depends(get_db)):
+async def create_resume(payload: ResumeCreate, db: AsyncSession = Depends(get_db)):
 	if not payload.text or len(payload.text) < 20:
 		raise HTTPException(status_code=400, detail="Resume text too short")
 	r = Resume(filename=payload.filename, text=payload.text)
-	db.add(r); db.commit(); db.refresh(r)
+	db.add(r); await db.commit(); await db.refresh(r)
 	return {"resume_id": r.id}
 
 
 @router.post("/upload", summary="Upload PDF resume")
-async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_resume(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
 	if file.content_type not in {"application/pdf"}:
 		raise HTTPException(status_code=415, detail="Only PDF supported")
 	text, pages, chars = extract_pdf_text(file.file)
 	if len(text) < 20:
 		raise HTTPException(status_code=400, detail="Could not extract sufficient text from PDF")
 	r = Resume(filename=file.filename, text=text)
-	db.add(r); db.commit(); db.refresh(r)
+	db.add(r); await db.commit(); await db.refresh(r)
 	return {"resume_id": r.id, "pages": pages, "extracted_chars": chars}
+
+
+def _resume_row(item: dict) -> Resume:
+	payload = ResumeCreate(**item)
+	if len(payload.text) < 20:
+		raise ValueError("text too short")
+	return Resume(filename=payload.filename or "resume.txt", text=payload.text)
+
+
+@router.post("/bulk", summary="Create many resumes: NDJSON lines of {text, filename} or a multipart form of PDFs")
+async def bulk_resumes(request: Request):
+	content_type = request.headers.get("content-type", "")
+	form = None
+	if content_type.startswith("multipart/form-data"):
+		# parts are spooled to temporary files, not held in memory
+		form = await request.form(max_files=settings.bulk_max_items)
+		items = pdf_items(form)
+	elif content_type.startswith((NDJSON, "application/jsonl", "application/json")):
+		items = ndjson_items(request.stream())
+	else:
+		raise HTTPException(status_code=415, detail=f"Send {NDJSON} or multipart/form-data")
+
+	async def results():
+		try:
+			async with AsyncSessionLocal() as db:
+				# no after_commit: a resume row stores only its text, skills and embeddings are computed per match
+				async for line in insert_stream(db, items, _resume_row, "resume_id"):
+					yield line
+		finally:
+			if form is not None:
+				await form.close()
+
+	return IngestResponse(results())
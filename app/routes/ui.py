@@ -1,222 +1,234 @@
 # app/routes/ui.py
 from __future__ import annotations
+import json
+import logging
 from io import BytesIO
 from typing import Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Request, UploadFile, File, Form, Depends, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, get_db
 from app.db.models import Resume, Job, Report, User
+from app.middleware.rate_limit import quota_for
+from app.nlp.document import Document
 from app.utils.pdf import extract_pdf_text
-from app.utils.pdf_report import generate_report_pdf
+from app.services import analysis_jobs, degrade
+from app.services.scheduler import Shed, Ticket, scheduler
 from app.services.analyze_service import analyze_resume
-from app.services.match_service import match_resume_job
-from app.services.report_service import create_report, get_report
+from app.services.match_service import match_resume_job, match_stages, bucket as _bucket
+from app.services.report_service import (
+    PASTED_JD_TITLE, build_result_payload, get_report_payload, html_cache, list_user_reports, new_slug, save_analysis,
+    save_analysis_detached,
+)
 
-import posthog
 from app.core.config import settings as cfg
-
-# PostHog (optional)
-if cfg.posthog_key:
-    posthog.project_api_key = cfg.posthog_key
-    posthog.host = cfg.posthog_host
+from app.utils import analytics
+from app.utils.static import asset_url
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
+log = logging.getLogger(__name__)
 
 
 # -------------------- DB & helpers --------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def _current_user(request: Request, db: Session) -> Optional[User]:
+async def _current_user(request: Request, db: AsyncSession) -> Optional[User]:
     uid = request.session.get("user_id") if hasattr(request, "session") else None
-    return db.get(User, uid) if uid else None
-
-def _clean_text(s: str) -> str:
-    return (s or "").encode("utf-8", "ignore").decode("utf-8", "ignore").replace("\r", "")
-
-def _bucket(score: float):
-    score = 0.0 if score is None else float(score)
-    pct = int(round(max(0.0, min(1.0, score)) * 100))
-    if score < 0.4: return ("Weak", pct)
-    if score < 0.6: return ("Medium", pct)
-    return ("Strong", pct)
-
-def _build_result_payload(analysis: dict, matched: dict, pages: int, chars: int) -> dict:
-    jd_sk = matched.get("jd_skills") or []
-    rs_sk = analysis.get("skills") or matched.get("resume_skills") or []
-    overlap = sorted([s for s in rs_sk if s in set(jd_sk)])
-
-    ms_label, ms_pct = _bucket(matched.get("match_score", 0.0))
-    ss_label, ss_pct = _bucket(matched.get("semantic_similarity", 0.0))
-    so_label, so_pct = _bucket(matched.get("skill_overlap", 0.0))
-
-    return {
-        "resume_id": analysis.get("resume_id"),
-        "tokens": analysis.get("tokens", 0),
-        "skills": rs_sk,
-        "match_score": float(matched.get("match_score", 0.0)),
-        "semantic_similarity": float(matched.get("semantic_similarity", 0.0)),
-        "skill_overlap": float(matched.get("skill_overlap", 0.0)),
-        "ms": {"label": ms_label, "pct": ms_pct},
-        "ss": {"label": ss_label, "pct": ss_pct},
-        "so": {"label": so_label, "pct": so_pct},
-        "jd_skills": jd_sk,
-        "resume_skills": rs_sk,
-        "overlap_skills": overlap,
-        "missing_skills": matched.get("missing_skills", []),
-        "recommendations": matched.get("recommendations", []),
-        "parsed_metrics": matched.get("parsed_metrics", []),
-        "improvements": matched.get("improvements", []),
-        "pages": pages,
-        "chars": chars,
-        "runtime_ms": matched.get("runtime_ms", 0),
-    }
+    return await db.get(User, uid) if uid else None
+
+async def _save_or_defer(db: AsyncSession, **persist) -> Optional[BackgroundTask]:
+    """Persist resume+job+report in one transaction, after the response when DEFER_REPORT_WRITE is on."""
+    if cfg.defer_report_write:
+        return BackgroundTask(save_analysis_detached, **persist)
+    await save_analysis(db, **persist)
+    return None
+
+async def _daily_limit_error(request: Request, db: AsyncSession, user: Optional[User], pending: int = 0) -> Optional[str]:
+    """
+    The message to show if this user (or anonymous IP) has used up today's
+    analyses, else None. `pending` counts analyses queued but not yet saved.
+    """
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if user:
+        # Logged-in users: limit by user_id
+        if cfg.premium_unlimited:
+            return None
+        count_today = (
+            await db.scalar(
+                select(func.count(Report.id))
+                .where(Report.user_id == user.id, Report.created_at >= today_start)
+            )
+        ) or 0
+        _sync_quota(request, count_today + pending)
+        if count_today + pending >= cfg.free_daily_limit:
+            return f"Daily limit reached ({cfg.free_daily_limit} per day)."
+        return None
+
+    # Anonymous users: limit by IP (client_ip is denormalized from the payload)
+    ip = request.client.host if request.client else "0.0.0.0"
+    count_today = (
+        await db.scalar(
+            select(func.count(Report.id))
+            .where(
+                Report.user_id == None,  # noqa: E711
+                Report.created_at >= today_start,
+                Report.client_ip == ip,
+            )
+        )
+    ) or 0
+    _sync_quota(request, count_today + pending)
+    if count_today + pending >= cfg.anon_daily_limit:
+        return f"Daily limit reached ({cfg.anon_daily_limit} per day). Sign up to get more!"
+    return None
+
+def _sync_quota(request: Request, used: int) -> None:
+    # let RateLimitMiddleware turn the next over-quota upload away before reading its body
+    if (quota := quota_for(request)) is not None:
+        quota.sync(used)
+
+def _quota_used(request: Request) -> None:
+    if (quota := quota_for(request)) is not None:
+        quota.add()
+
+def _request_extras(request: Request, user: Optional[User]) -> dict:
+    """Payload fields taken from the request rather than the analysis (UTM, client_ip for anon)."""
+    extras = {}
+    if hasattr(request, "session") and (utm := request.session.get("utm")):
+        extras["utm"] = utm
+    if not user and request.client:
+        extras["client_ip"] = request.client.host
+    return extras
+
+def _admit(request: Request, user: Optional[User]) -> Ticket:
+    """A scheduler ticket for one in-request analysis (raises Shed with 429/503 when queues are full)."""
+    if user:
+        return scheduler.admit(f"u:{user.id}", "premium" if cfg.premium_unlimited else "free")
+    return scheduler.admit(f"ip:{request.client.host if request.client else '0.0.0.0'}", "anon")
 
 def _abs_url(request: Request, path: str) -> str:
     return f"{request.url.scheme}://{request.url.netloc}{path}"
 
-def _url_with_query(base_path: str, page: int, page_size: int) -> str:
-    return f"{base_path}?page={page}&page_size={page_size}"
+def _url_with_cursor(base_path: str, direction: str, report_id: int, page_size: int) -> str:
+    return f"{base_path}?{direction}={report_id}&page_size={page_size}"
 
 def track(request: Request, event: str, props: Optional[dict] = None) -> None:
+    """Queue an analytics event; never blocks or fails the request (see app/utils/analytics.py)."""
     try:
-        if not cfg.posthog_key:
-            return
         uid = request.session.get("user_id") if hasattr(request, "session") else None
         ident = str(uid) if uid else (request.client.host if request.client else "0.0.0.0")
-        posthog.capture(ident, event, properties=props or {})
+        analytics.capture(ident, event, props)
     except Exception:
         pass
 
 
 # -------------------- Routes --------------------
 @router.get("/", response_class=HTMLResponse)
-async def landing(request: Request, db: Session = Depends(get_db)):
+async def landing(request: Request, db: AsyncSession = Depends(get_db)):
     # capture utm
     utm = {k: v for k in ("utm", "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content")
            if (v := request.query_params.get(k))}
     if utm and hasattr(request, "session"):
         request.session["utm"] = utm
     track(request, "pageview", {"path": "/"})
-    user = _current_user(request, db)
+    user = await _current_user(request, db)
     return templates.TemplateResponse("landing.html", {"request": request, "user": user})
 
 @router.get("/analyze", response_class=HTMLResponse)
-async def analyze_page(request: Request, db: Session = Depends(get_db)):
+async def analyze_page(request: Request, db: AsyncSession = Depends(get_db)):
     track(request, "pageview", {"path": "/analyze"})
-    user = _current_user(request, db)
+    user = await _current_user(request, db)
     return templates.TemplateResponse(
         "index.html",
         {"request": request, "user": user, "result": None, "error": None, "read_only": False, "share_url": None},
     )
 
-@router.get("/demo", response_class=HTMLResponse)
-async def demo(request: Request, db: Session = Depends(get_db)):
-    track(request, "analyze_clicked", {"demo": True})
-    demo_resume = """
+DEMO_RESUME = """
 Built a FastAPI backend with PostgreSQL and Docker; added Redis cache and GitHub Actions CI.
 Implemented REST APIs (auth, pagination). Deployed to AWS via Terraform. Wrote tests with pytest."""
-    demo_jd = "Backend engineer with Python/FastAPI, PostgreSQL, Redis, Docker, CI/CD and AWS/Terraform."
-
-    resume = Resume(filename="demo.txt", text=_clean_text(demo_resume)); db.add(resume); db.commit(); db.refresh(resume)
-    job = Job(title="Demo JD", description=_clean_text(demo_jd)); db.add(job); db.commit(); db.refresh(job)
+DEMO_JD = "Backend engineer with Python/FastAPI, PostgreSQL, Redis, Docker, CI/CD and AWS/Terraform."
+
+def _run_demo():
+    """The /demo pipeline on the sample texts (sync, blocking): (resume, job, payload)."""
+    resume_doc, job_doc = Document(DEMO_RESUME), Document(DEMO_JD)
+    degrade.apply(resume_doc, job_doc)  # one level for both texts
+    resume = Resume(filename="demo.txt", text=resume_doc.cleaned)
+    job = Job(title="Demo JD", description=job_doc.cleaned)
+    analysis = analyze_resume(None, resume, resume_doc)
+    matched = match_resume_job(None, resume, job, resume_doc, job_doc)
+    return resume, job, build_result_payload(analysis, matched, pages=1, chars=len(DEMO_RESUME))
 
-    analysis = analyze_resume(db, resume)
-    matched = match_resume_job(db, resume, job)
-    result = _build_result_payload(analysis, matched, pages=1, chars=len(demo_resume))
+@router.get("/demo", response_class=HTMLResponse)
+async def demo(request: Request, db: AsyncSession = Depends(get_db)):
+    track(request, "analyze_clicked", {"demo": True})
+    user = await _current_user(request, db)
+    # same admission and threadpool as /ui-match: the demo is an analysis like any other
+    try:
+        async with _admit(request, user):
+            resume, job, result = await run_in_threadpool(_run_demo)
+    except Shed as e:
+        track(request, "analyze_fail", {"demo": True, "reason": f"shed_{e.status}"})
+        return templates.TemplateResponse(
+            "index.html",
+            {"request": request, "user": user, "result": None, "error": e.message, "read_only": False, "share_url": None},
+            status_code=e.status,
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
     if hasattr(request, "session") and (utm := request.session.get("utm")):
         result["utm"] = utm
-    user_id = request.session.get("user_id") if hasattr(request, "session") else None
-    rpt = create_report(db, payload=result, resume_id=resume.id, job_id=job.id, match_id=None, user_id=user_id)
+    user_id = user.id if user else None
+    slug = new_slug()
+    background = await _save_or_defer(db, resume=resume, job=job, payload=result, user_id=user_id, slug=slug)
 
-    share_url = _abs_url(request, f"/r/{rpt.slug}")
+    share_url = _abs_url(request, f"/r/{slug}")
     track(request, "analyze_success", {"demo": True, "match_score": result.get("match_score")})
-    user = _current_user(request, db)
     return templates.TemplateResponse(
         "index.html",
         {"request": request, "user": user, "result": result, "error": None, "read_only": False, "share_url": share_url},
+        background=background,
     )
 
+def _run_analysis(fileobj, filename: str, job_description: str):
+    """
+    The /ui-match pipeline (sync, blocking): (resume, job, payload, pages, chars),
+    or None if the PDF or the JD is too short to analyse.
+    """
+    text, pages, chars = extract_pdf_text(fileobj)
+    # one Document per input; every stage below reuses its views
+    resume_doc, job_doc = Document(text), Document(job_description)
+    if len(resume_doc.cleaned) < 40 or len(job_doc.cleaned) < 40:
+        return None
+    degrade.apply(resume_doc, job_doc)  # one level for both texts
+    resume = Resume(filename=filename, text=resume_doc.cleaned)
+    job = Job(title=PASTED_JD_TITLE, description=job_doc.cleaned)
+    analysis = analyze_resume(None, resume, resume_doc)
+    matched = match_resume_job(None, resume, job, resume_doc, job_doc)
+    return resume, job, build_result_payload(analysis, matched, pages=pages, chars=chars), pages, chars
+
 @router.post("/ui-match", response_class=HTMLResponse)
 async def ui_match(
     request: Request,
     file: UploadFile = File(...),
     job_description: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     track(request, "analyze_clicked", {"demo": False})
-    user = _current_user(request, db)
+    user = await _current_user(request, db)
 
-    # --- Daily limit check ---
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    if user:
-        # Logged-in users: limit by user_id
-        if not cfg.premium_unlimited:
-            count_today = (
-                db.query(func.count(Report.id))
-                .filter(Report.user_id == user.id, Report.created_at >= today_start)
-                .scalar()
-            ) or 0
-            if count_today >= cfg.free_daily_limit:
-                return templates.TemplateResponse(
-                    "index.html",
-                    {
-                        "request": request,
-                        "user": user,
-                        "result": None,
-                        "error": f"Daily limit reached ({cfg.free_daily_limit} per day).",
-                        "read_only": False,
-                        "share_url": None,
-                    },
-                )
-    else:
-        # Anonymous users: limit by IP via payload->client_ip in JSON
-        ip = request.client.host if request.client else "0.0.0.0"
-        count_today = 0
-        try:
-            # Works on Postgres (JSONB)
-            count_today = (
-                db.query(func.count(Report.id))
-                .filter(
-                    Report.user_id == None,  # noqa: E711
-                    Report.created_at >= today_start,
-                    Report.payload["client_ip"].astext == ip,
-                )
-                .scalar()
-            ) or 0
-        except Exception:
-            # Fallback (e.g., SQLite): approximate by all anon today
-            count_today = (
-                db.query(func.count(Report.id))
-                .filter(Report.user_id == None, Report.created_at >= today_start)  # noqa: E711
-                .scalar()
-            ) or 0
-
-        if count_today >= cfg.anon_daily_limit:
-            return templates.TemplateResponse(
-                "index.html",
-                {
-                    "request": request,
-                    "user": None,
-                    "result": None,
-                    "error": f"Daily limit reached ({cfg.anon_daily_limit} per day). Sign up to get more!",
-                    "read_only": False,
-                    "share_url": None,
-                },
-            )
+    limit_error = await _daily_limit_error(request, db, user)
+    if limit_error:
+        return templates.TemplateResponse(
+            "index.html",
+            {"request": request, "user": user, "result": None, "error": limit_error, "read_only": False, "share_url": None},
+        )
 
     # ---- Normal validation & processing ----
     if file.content_type != "application/pdf":
@@ -226,10 +238,19 @@ async def ui_match(
             {"request": request, "user": user, "result": None, "error": "Please upload a PDF file.", "read_only": False, "share_url": None},
         )
 
-    text, pages, chars = extract_pdf_text(file.file)
-    text = _clean_text(text)
-    jd_text = _clean_text(job_description)
-    if len(text) < 40 or len(jd_text) < 40:
+    # wait for a fair share of the analysis slots (app/services/scheduler.py), then run off the event loop
+    try:
+        async with _admit(request, user):
+            done = await run_in_threadpool(_run_analysis, file.file, file.filename, job_description)
+    except Shed as e:
+        track(request, "analyze_fail", {"reason": f"shed_{e.status}"})
+        return templates.TemplateResponse(
+            "index.html",
+            {"request": request, "user": user, "result": None, "error": e.message, "read_only": False, "share_url": None},
+            status_code=e.status,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    if done is None:
         track(request, "analyze_fail", {"reason": "short_input"})
         return templates.TemplateResponse(
             "index.html",
@@ -242,24 +263,17 @@ async def ui_match(
                 "share_url": None,
             },
         )
-
-    resume = Resume(filename=file.filename, text=text); db.add(resume); db.commit(); db.refresh(resume)
-    job = Job(title="Job Description", description=jd_text); db.add(job); db.commit(); db.refresh(job)
-
-    analysis = analyze_resume(db, resume)
-    matched = match_resume_job(db, resume, job)
-    result = _build_result_payload(analysis, matched, pages=pages, chars=chars)
+    resume, job, result, pages, chars = done
 
     # Add UTM / client_ip for anon
-    if hasattr(request, "session") and (utm := request.session.get("utm")):
-        result["utm"] = utm
-    if not user and request.client:
-        result["client_ip"] = request.client.host
+    result.update(_request_extras(request, user))
 
     user_id = user.id if user else None
-    rpt = create_report(db, payload=result, resume_id=resume.id, job_id=job.id, match_id=None, user_id=user_id)
+    slug = new_slug()
+    background = await _save_or_defer(db, resume=resume, job=job, payload=result, user_id=user_id, slug=slug)
+    _quota_used(request)
 
-    share_url = _abs_url(request, f"/r/{rpt.slug}")
+    share_url = _abs_url(request, f"/r/{slug}")
     track(
         request,
         "analyze_success",
@@ -268,84 +282,291 @@ async def ui_match(
     return templates.TemplateResponse(
         "index.html",
         {"request": request, "user": user, "result": result, "error": None, "read_only": False, "share_url": share_url},
+        background=background,
+    )
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n".encode("utf-8")
+
+@router.post("/ui-match/stream")
+async def ui_match_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    /ui-match as Server-Sent Events, so the page can fill in results as each
+    stage finishes instead of waiting for all of them:
+      stage     {"stage": "parsing"}                      right away
+      skills    resume/JD skills, overlap and gaps         after extraction
+      semantic  semantic similarity (+ bucket)             after embedding
+      result    the full result payload                    after blending
+      share     {"share_url", "pdf_url"}                   once the report is persisted
+      error     {"error": message}                         instead of whatever is left
+    Quota and content-type problems are answered before streaming starts (429 / 415, JSON).
+    """
+    track(request, "analyze_clicked", {"demo": False, "stream": True})
+    user = await _current_user(request, db)
+    limit_error = await _daily_limit_error(request, db, user)
+    if limit_error:
+        return JSONResponse({"error": limit_error}, status_code=429)
+    if file.content_type != "application/pdf":
+        track(request, "analyze_fail", {"reason": "not_pdf"})
+        return JSONResponse({"error": "Please upload a PDF file."}, status_code=415)
+
+    try:
+        ticket = _admit(request, user)
+    except Shed as e:
+        track(request, "analyze_fail", {"reason": f"shed_{e.status}", "stream": True})
+        return JSONResponse({"error": e.message}, status_code=e.status, headers={"Retry-After": str(e.retry_after)})
+
+    # the upload and the request's DB session are closed once this handler returns,
+    # so read the file now and persist on a session of our own
+    data = await file.read()
+    filename = file.filename
+    extras = _request_extras(request, user)
+    user_id = user.id if user else None
+
+    async def events():
+        try:
+            if ticket.state == Ticket.QUEUED:
+                yield _sse("stage", {"stage": "queued"})
+            await ticket.wait()
+            async for event in analysis_events():
+                yield event
+        except Shed as e:
+            yield _sse("error", {"error": e.message})
+        finally:
+            ticket.release()
+
+    async def analysis_events():
+        yield _sse("stage", {"stage": "parsing"})
+        text, pages, chars = await run_in_threadpool(extract_pdf_text, BytesIO(data))
+        resume_doc, job_doc = Document(text), Document(job_description)
+        if len(resume_doc.cleaned) < 40 or len(job_doc.cleaned) < 40:
+            track(request, "analyze_fail", {"reason": "short_input"})
+            yield _sse("error", {"error": "Please provide a valid PDF and a sufficiently detailed JD."})
+            return
+
+        degrade.apply(resume_doc, job_doc)  # one level for both texts
+        resume = Resume(filename=filename, text=resume_doc.cleaned)
+        job = Job(title=PASTED_JD_TITLE, description=job_doc.cleaned)
+        analysis = await run_in_threadpool(analyze_resume, None, resume, resume_doc)
+
+        stages = match_stages(resume_doc, job_doc)
+        matched: dict = {}
+        while True:
+            step = await run_in_threadpool(next, stages, None)
+            if step is None:
+                break
+            stage, matched = step
+            if stage == "skills":
+                yield _sse("skills", {
+                    "tokens": analysis.get("tokens", 0),
+                    "pages": pages,
+                    "resume_skills": matched["resume_skills"],
+                    "jd_skills": matched["jd_skills"],
+                    "overlap_skills": matched["overlap_skills"],
+                    "missing_skills": matched["missing_skills"],
+                })
+            elif stage == "semantic":
+                label, pct = _bucket(matched["semantic_similarity"])
+                yield _sse("semantic", {**matched, "ss": {"label": label, "pct": pct}})
+
+        result = build_result_payload(analysis, matched, pages=pages, chars=chars)
+        result.update(extras)
+        yield _sse("result", result)
+
+        slug = new_slug()
+        try:
+            async with AsyncSessionLocal() as session:
+                await save_analysis(session, resume=resume, job=job, payload=result, user_id=user_id, slug=slug)
+        except Exception:
+            log.exception("Streamed report write failed (slug=%s)", slug)
+            yield _sse("error", {"error": "The analysis finished but could not be saved."})
+            return
+        _quota_used(request)
+        share_url = _abs_url(request, f"/r/{slug}")
+        yield _sse("share", {"share_url": share_url, "pdf_url": f"{share_url}.pdf"})
+        track(
+            request,
+            "analyze_success",
+            {"demo": False, "stream": True, "pages": pages, "chars": chars, "match_score": result.get("match_score")},
+        )
+
+    # no-transform / X-Accel-Buffering keep proxies from holding events back
+    # the background release covers a client that disconnects before the stream starts
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(ticket.release),
+    )
+
+@router.post("/ui-match/jobs")
+async def ui_match_submit(
+    request: Request,
+    file: UploadFile = File(...),
+    job_description: str = Form(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue an upload for a worker instead of analysing it in the request.
+    202 with the job id and its status URL; poll that until it redirects to the report.
+    """
+    track(request, "analyze_clicked", {"demo": False, "queued": True})
+    user = await _current_user(request, db)
+    client_ip = request.client.host if request.client else "0.0.0.0"
+    pending = await analysis_jobs.pending_for(db, user.id if user else None, client_ip)
+    limit_error = await _daily_limit_error(request, db, user, pending=pending)
+    if limit_error:
+        return JSONResponse({"error": limit_error}, status_code=429)
+    if file.content_type != "application/pdf":
+        track(request, "analyze_fail", {"reason": "not_pdf"})
+        return JSONResponse({"error": "Please upload a PDF file."}, status_code=415)
+    if await analysis_jobs.queue_depth(db) >= cfg.job_queue_max:
+        return JSONResponse(
+            {"error": "Too many analyses queued; try again shortly."}, status_code=503, headers={"Retry-After": "30"}
+        )
+
+    job = await analysis_jobs.submit(
+        db,
+        pdf=await file.read(),
+        filename=file.filename,
+        job_description=job_description,
+        user_id=user.id if user else None,
+        client_ip=None if user else client_ip,
+        extras=_request_extras(request, user),
+    )
+    _quota_used(request)
+    status_url = f"/ui-match/jobs/{job.public_id}"
+    return JSONResponse(
+        {"job_id": job.public_id, "status": job.status, "status_url": status_url},
+        status_code=202,
+        headers={"Location": status_url},
     )
 
+@router.get("/ui-match/jobs/{job_id}")
+async def ui_match_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Poll a queued analysis: 202 while it waits or runs, 303 to /r/{slug} when done, the error if it failed."""
+    job = await analysis_jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == analysis_jobs.DONE:
+        return RedirectResponse(f"/r/{job.slug}", status_code=303)
+    body = {"job_id": job.public_id, "status": job.status, "attempts": job.attempts}
+    if job.status == analysis_jobs.FAILED:
+        return JSONResponse({**body, "error": job.error})
+    return JSONResponse(body, status_code=202, headers={"Retry-After": str(max(1, int(cfg.job_poll_interval)))})
+
 @router.get("/r/{slug}.pdf")
-async def public_report_pdf(slug: str, request: Request, db: Session = Depends(get_db)):
-    rpt = get_report(db, slug)
-    if not rpt:
+async def public_report_pdf(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    entry = await get_report_payload(db, slug)
+    if not entry:
         raise HTTPException(status_code=404, detail="Report not found")
+    payload, etag = entry
+    # the PDF is rendered from the payload alone: same validator for every viewer
+    headers = {"ETag": f'{etag[:-1]}-pdf"', "Cache-Control": "public, no-cache"}
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers={**headers, "Content-Type": "application/pdf"})
+    from app.utils.pdf_report import generate_report_pdf  # reportlab is only needed here
+
     buf = BytesIO()
-    generate_report_pdf(buf, rpt.payload)
-    headers = {"Content-Disposition": f'inline; filename="devmatch-{slug}.pdf"'}
+    generate_report_pdf(buf, payload)
+    headers["Content-Disposition"] = f'inline; filename="devmatch-{slug}.pdf"'
     track(request, "download_pdf", {"slug": slug})
     return StreamingResponse(buf, headers=headers, media_type="application/pdf")
 
-@router.get("/r/{slug}", response_class=HTMLResponse)
-async def public_report(slug: str, request: Request, db: Session = Depends(get_db)):
-    rpt = get_report(db, slug)
-    if not rpt:
-        raise HTTPException(status_code=404, detail="Report not found")
+def _etag_matches(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+    return "*" in tags or etag in tags
+
+def _render_public_report(request: Request, slug: str, payload: dict, user: Optional[User]):
     share_url = _abs_url(request, f"/r/{slug}")
     og = {
-        "title": f"DevMatch report • Match {rpt.payload.get('match_score', 0):.2f}",
+        "title": f"DevMatch report • Match {payload.get('match_score', 0):.2f}",
         "description": "Resume ↔ JD alignment with skills, coverage, and suggestions.",
         "url": share_url,
     }
-    track(request, "share_view", {"slug": slug})
-    user = _current_user(request, db)
     return templates.TemplateResponse(
         "index.html",
-        {"request": request, "user": user, "result": rpt.payload, "error": None, "read_only": True, "share_url": share_url, "og": og},
+        {"request": request, "user": user, "result": payload, "error": None, "read_only": True, "share_url": share_url, "og": og},
     )
 
+@router.get("/r/{slug}", response_class=HTMLResponse)
+async def public_report(slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    entry = await get_report_payload(db, slug)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Report not found")
+    payload, etag = entry
+    track(request, "share_view", {"slug": slug})
+    user = await _current_user(request, db)
+
+    # The page header differs per viewer, so logged-in views get their own validator
+    if user:
+        etag = f'{etag[:-1]}-u{user.id}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache" if user else "public, no-cache", "Vary": "Cookie"}
+
+    if user:
+        body = _render_public_report(request, slug, payload, user).body
+    else:
+        # Anonymous viewers all see the same bytes (per host, since share_url is absolute);
+        # keyed on the ETag too, so a changed payload never meets a page rendered from the old one
+        key = (slug, etag, request.url.scheme, request.url.netloc)
+        body = html_cache.get(key)
+        if body is None:
+            body = _render_public_report(request, slug, payload, None).body
+            html_cache.set(key, body)
+    if _etag_matches(request, etag):
+        # the 304 describes the page the client holds, so the compression middleware
+        # keeps the ETag in the form that page was sent with
+        return Response(status_code=304, headers={
+            **headers, "Content-Type": "text/html; charset=utf-8", "Content-Length": str(len(body)),
+        })
+    return HTMLResponse(body, headers=headers)
+
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db), page: int = 1, page_size: int = 20):
+async def dashboard(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    page_size: int = 20,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+):
     uid = request.session.get("user_id") if hasattr(request, "session") else None
     if not uid:
         return RedirectResponse(url="/?error=login_required")
-    user: Optional[User] = db.get(User, uid)
+    user: Optional[User] = await db.get(User, uid)
     if not user:
         request.session.clear()
         return RedirectResponse(url="/?error=login_required")
 
-    page = max(1, int(page or 1))
     page_size = max(5, min(100, int(page_size or 20)))
-    offset = (page - 1) * page_size
-    total = db.query(func.count(Report.id)).filter(Report.user_id == uid).scalar() or 0
-    pages = max(1, (total + page_size - 1) // page_size)
-    reports = (
-        db.query(Report)
-        .filter(Report.user_id == uid)
-        .order_by(Report.created_at.desc().nullslast())
-        .offset(offset)
-        .limit(page_size)
-        .all()
-    )
+    rows, has_prev, has_next = await list_user_reports(db, uid, page_size, after=after, before=before)
 
     cards = [
         {
             "slug": r.slug,
-            "created_at": getattr(r, "created_at", None),
-            "score": (r.payload or {}).get("match_score", 0.0),
-            "title": (r.payload or {}).get("job_title") or "Job Match",
+            "created_at": r.created_at,
+            "score": r.match_score or 0.0,
+            "title": r.title or "Job Match",
             "share_url": _abs_url(request, f"/r/{r.slug}"),
         }
-        for r in reports
+        for r in rows
     ]
 
     pagination = {
-        "page": page,
         "page_size": page_size,
-        "total": total,
-        "pages": pages,
-        "has_prev": page > 1,
-        "has_next": page < pages,
-        "prev_url": _url_with_query("/dashboard", page - 1, page_size) if page > 1 else None,
-        "next_url": _url_with_query("/dashboard", page + 1, page_size) if page < pages else None,
+        "has_prev": has_prev and bool(rows),
+        "has_next": has_next and bool(rows),
+        "prev_url": _url_with_cursor("/dashboard", "before", rows[0].id, page_size) if has_prev and rows else None,
+        "next_url": _url_with_cursor("/dashboard", "after", rows[-1].id, page_size) if has_next and rows else None,
     }
 
     return templates.TemplateResponse(
         "dashboard.html", {"request": request, "user": user, "cards": cards, "pagination": pagination}
     )
-
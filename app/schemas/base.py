@@ -16,6 +16,9 @@ class AnalyzeResponse(BaseModel):
 	resume_id: int
 	skills: list[str]
 	sections: dict[str, str]
+	skills_by_section: dict[str, list[str]] = Field(default_factory=dict)
+	metrics: list[Dict[str, Any]] = Field(default_factory=list)  # quantified results in experience/projects
+	degraded: list[str] = Field(default_factory=list)  # stages skipped under load (app/services/degrade.py)
 	tokens: int
 	runtime_ms: int
 
@@ -34,3 +37,4 @@ class MatchResponse(BaseModel):
 	missing_skills: list[str]
 	recommendations: list[str]
 	runtime_ms: int
+	degraded: list[str] = Field(default_factory=list)
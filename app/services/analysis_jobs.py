@@ -0,0 +1,268 @@
+# app/services/analysis_jobs.py
+"""
+Database-backed queue for uploads analysed outside the request.
+
+POST /ui-match/jobs stores the PDF and JD as an `analysis_jobs` row and
+returns at once; workers (`python -m app.cli worker`, or JOB_WORKERS threads
+inside the web process) claim rows, run the same pipeline as /ui-match and
+write the report under the slug chosen at submit time, so polling clients
+can be redirected to /r/{slug}.
+
+Claiming is one conditional UPDATE per job. On Postgres the candidate row is
+selected FOR UPDATE SKIP LOCKED, so concurrent workers never wait on each
+other; on SQLite writers are serialized anyway and a lost race just moves on
+to the next row. A claim makes the job invisible for JOB_VISIBILITY_TIMEOUT;
+if the worker dies it becomes claimable again and counts as another attempt.
+Failures are retried with exponential backoff up to JOB_MAX_ATTEMPTS.
+"""
+from __future__ import annotations
+
+import logging
+import secrets
+import threading
+import time
+from io import BytesIO
+from typing import List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings as cfg
+from app.db.models import AnalysisJob, Job, Resume
+from app.db.session import SessionLocal
+from app.nlp.document import Document
+from app.services import degrade
+from app.services.analyze_service import analyze_resume
+from app.services.match_service import match_resume_job
+from app.services.report_service import PASTED_JD_TITLE, add_analysis, build_result_payload, new_slug
+from app.utils.pdf import extract_pdf_text
+
+log = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ACTIVE = (QUEUED, RUNNING)
+
+_stats_lock = threading.Lock()
+_stats = {"claimed": 0, "done": 0, "retried": 0, "failed": 0, "lease_lost": 0}
+
+
+class JobRejected(Exception):
+    """The input can never be analysed (e.g. no text in the PDF); fail without retrying."""
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+# -------------------- submit / poll (request path) --------------------
+async def submit(
+    db: AsyncSession,
+    pdf: bytes,
+    filename: str,
+    job_description: str,
+    user_id: Optional[int] = None,
+    client_ip: Optional[str] = None,
+    extras: Optional[dict] = None,
+) -> AnalysisJob:
+    now = time.time()
+    job = AnalysisJob(
+        public_id=secrets.token_urlsafe(12),
+        status=QUEUED,
+        attempts=0,
+        enqueued_at=now,
+        run_after=now,
+        filename=filename,
+        pdf=pdf,
+        job_description=job_description,
+        user_id=user_id,
+        client_ip=client_ip,
+        extras=extras or None,
+        slug=new_slug(),
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+async def get_job(db: AsyncSession, public_id: str) -> Optional[AnalysisJob]:
+    return await db.scalar(select(AnalysisJob).where(AnalysisJob.public_id == public_id))
+
+async def queue_depth(db: AsyncSession) -> int:
+    return (await db.scalar(select(func.count(AnalysisJob.id)).where(AnalysisJob.status == QUEUED))) or 0
+
+async def pending_for(db: AsyncSession, user_id: Optional[int], client_ip: Optional[str]) -> int:
+    """Jobs of this user (or anonymous IP) not finished yet; they count against the daily limit."""
+    who = AnalysisJob.user_id == user_id if user_id else and_(AnalysisJob.user_id.is_(None), AnalysisJob.client_ip == client_ip)
+    return (await db.scalar(select(func.count(AnalysisJob.id)).where(AnalysisJob.status.in_(ACTIVE), who))) or 0
+
+
+# -------------------- worker side (sync) --------------------
+def _claimable(now: float):
+    return or_(
+        and_(AnalysisJob.status == QUEUED, AnalysisJob.run_after <= now),
+        and_(AnalysisJob.status == RUNNING, AnalysisJob.locked_until < now),  # claim expired
+    )
+
+def claim(db: Session) -> Optional[AnalysisJob]:
+    """Take the oldest claimable job, or None if there is nothing to do."""
+    now = time.time()
+    q = select(AnalysisJob.id).where(_claimable(now)).order_by(AnalysisJob.id).limit(1)
+    if db.get_bind().dialect.name == "postgresql":
+        q = q.with_for_update(skip_locked=True)
+    for _ in range(5):
+        job_id = db.scalar(q)
+        if job_id is None:
+            db.rollback()
+            return None
+        lease = secrets.token_hex(8)
+        res = db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, _claimable(now))
+            .values(status=RUNNING, lease=lease, locked_until=now + cfg.job_visibility_timeout,
+                    attempts=AnalysisJob.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if res.rowcount == 1:
+            _count("claimed")
+            job = db.get(AnalysisJob, job_id)
+            # kept off the mapped column: a rollback/commit reloads `job.lease`,
+            # which by then may be another worker's claim
+            job._claim = lease
+            return job
+        # another worker got it first (SQLite); try the next one
+    return None
+
+def _finish(db: Session, job: AnalysisJob, **values) -> bool:
+    """Update a claimed job if the claim is still ours; False if it expired and was taken over."""
+    res = db.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job.id, AnalysisJob.lease == job._claim)
+        .values(lease=None, locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount != 1:
+        db.rollback()
+        _count("lease_lost")
+        log.warning("Analysis job %s: claim expired before it finished", job.public_id)
+        return False
+    db.commit()
+    return True
+
+def fail(db: Session, job: AnalysisJob, error: str, retry: bool = True) -> None:
+    if retry and job.attempts < cfg.job_max_attempts:
+        delay = cfg.job_retry_backoff * (2 ** (job.attempts - 1))
+        if _finish(db, job, status=QUEUED, run_after=time.time() + delay, error=error):
+            _count("retried")
+    elif _finish(db, job, status=FAILED, pdf=None, error=error):
+        _count("failed")
+
+def run_analysis(job: AnalysisJob) -> tuple:
+    """The /ui-match pipeline for a queued job: (resume, jd, payload), nothing written yet."""
+    try:
+        text, pages, chars = extract_pdf_text(BytesIO(job.pdf or b""))
+    except Exception as e:  # a broken PDF stays broken; retrying will not help
+        raise JobRejected("Could not read the PDF.") from e
+    resume_doc, job_doc = Document(text), Document(job.job_description)
+    if len(resume_doc.cleaned) < 40 or len(job_doc.cleaned) < 40:
+        raise JobRejected("Please provide a valid PDF and a sufficiently detailed JD.")
+
+    degrade.apply(resume_doc, job_doc)  # one level for both texts
+    resume = Resume(filename=job.filename, text=resume_doc.cleaned)
+    jd = Job(title=PASTED_JD_TITLE, description=job_doc.cleaned)
+    analysis = analyze_resume(None, resume, resume_doc)
+    matched = match_resume_job(None, resume, jd, resume_doc, job_doc)
+    payload = build_result_payload(analysis, matched, pages=pages, chars=chars)
+    payload.update(job.extras or {})  # utm, client_ip (see ui._request_extras)
+    return resume, jd, payload
+
+def process(db: Session, job: AnalysisJob) -> None:
+    """Run a claimed job and record the outcome."""
+    if job.attempts > cfg.job_max_attempts:
+        # only reachable through expired claims: the worker running it died or hung
+        fail(db, job, "Gave up after repeated worker timeouts.", retry=False)
+        return
+    try:
+        resume, jd, payload = run_analysis(job)
+    except JobRejected as e:
+        fail(db, job, str(e), retry=False)
+        return
+    except Exception as e:
+        log.exception("Analysis job %s failed (attempt %s)", job.public_id, job.attempts)
+        fail(db, job, f"{type(e).__name__}: {e}")
+        return
+
+    try:
+        # report and job status commit together, and only while the claim is still ours
+        add_analysis(db, resume, jd, payload, user_id=job.user_id, slug=job.slug)
+    except IntegrityError:
+        # a previous attempt already wrote this slug (its claim expired after the insert)
+        db.rollback()
+    if _finish(db, job, status=DONE, pdf=None, error=None):
+        _count("done")
+
+def work_once(session_factory=SessionLocal) -> bool:
+    """Claim and process one job; False if the queue had nothing claimable."""
+    with session_factory() as db:
+        job = claim(db)
+        if job is None:
+            return False
+        process(db, job)
+        return True
+
+
+class WorkerPool:
+    """`threads` workers polling the queue until `stop()`; used by the CLI and (JOB_WORKERS) the web app."""
+
+    def __init__(self, threads: int, poll_interval: Optional[float] = None):
+        self.threads = max(1, threads)
+        self.poll_interval = cfg.job_poll_interval if poll_interval is None else poll_interval
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if work_once():
+                    continue
+            except Exception:
+                log.exception("Analysis worker loop error")
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> "WorkerPool":
+        for i in range(self.threads):
+            t = threading.Thread(target=self._loop, name=f"analysis-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Let running jobs finish (up to `timeout`); unfinished claims expire and are retried elsewhere."""
+        self._stop.set()
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+    def wait(self) -> None:
+        while any(t.is_alive() for t in self._threads):
+            for t in self._threads:
+                t.join(0.5)
+
+
+def stats() -> dict:
+    """Queue depth by status plus this process's worker counters (for /metricsz)."""
+    with SessionLocal() as db:
+        by_status = dict(db.execute(select(AnalysisJob.status, func.count(AnalysisJob.id)).group_by(AnalysisJob.status)).all())
+        oldest = db.scalar(select(func.min(AnalysisJob.enqueued_at)).where(AnalysisJob.status == QUEUED))
+    with _stats_lock:
+        counters = dict(_stats)
+    return {
+        "depth": by_status.get(QUEUED, 0),
+        "running": by_status.get(RUNNING, 0),
+        "done_total": by_status.get(DONE, 0),
+        "failed_total": by_status.get(FAILED, 0),
+        "oldest_queued_s": round(time.time() - oldest, 1) if oldest else 0.0,
+        **counters,
+    }
@@ -1,22 +1,44 @@
 # app/services/analyze_service.py
 from __future__ import annotations
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models import Resume
-from app.nlp.skills_extractor import extract_skills
+from app.nlp.document import Document
+from app.services import degrade
+from app.utils.metrics import extract_metrics, metrics_as_dicts
 from app.utils.timing import timer
 
-def analyze_resume(db: Session, resume: Resume) -> dict:
+# Where quantified achievements are expected; metrics are only extracted from these sections
+ACHIEVEMENT_SECTIONS = ("experience", "projects")
+
+def analyze_resume(db: AsyncSession, resume: Resume, doc: Optional[Document] = None, sections: bool = False) -> dict:
     # No Analysis table; return computed metrics only.
+    # Pass the request's Document to reuse views other stages already computed.
+    # `sections` adds the per-section breakdown (text, skills, metrics) the /analyze API returns.
+    # Under load (app/services/degrade.py) the skipped stages are listed in "degraded".
     with timer() as elapsed:
-        text = resume.text or ""
-        skills = sorted(set(extract_skills(text)))
-        tokens = len(text.split())
+        doc = doc or Document(resume.text)
+        degrade.apply(doc)
+        skills = doc.skills
+        tokens = len(doc.tokens)
+        out = {}
+        if sections:
+            out["sections"] = doc.sections
+            out["skills_by_section"] = {name: s.names() for name, s in doc.section_skills.items() if s}
+            if "metrics" in doc.degraded:
+                out["metrics"] = []
+            else:
+                # no headings found: fall back to the whole text
+                achievements = doc.section_text(*ACHIEVEMENT_SECTIONS) if doc.sections else doc.cleaned
+                out["metrics"] = metrics_as_dicts(extract_metrics(achievements))
+        if doc.degraded:
+            out["degraded"] = list(doc.degraded)
         runtime = elapsed()
 
     return {
         "resume_id": resume.id,
         "tokens": tokens,
         "skills": skills,
+        **out,
         "runtime_ms": runtime,
     }
-
@@ -0,0 +1,241 @@
+# app/services/bulk_ingest.py
+"""
+Streaming bulk inserts for POST /resumes/bulk and /jobs/bulk.
+
+Items arrive as NDJSON lines read straight off the request body (or as the
+PDF parts of a multipart form), are validated one by one and inserted
+BULK_BATCH_SIZE rows per transaction. After each commit one NDJSON line per
+item goes back to the client, with the new id or the reason the item was
+refused, so a partner can match results to input lines while the upload is
+still running. Memory is bounded by one batch plus one line: nothing holds
+the whole body.
+
+`after_commit` receives the ids of every committed batch. The jobs endpoint
+passes a `BatchTasks`, which starts feature precomputation
+(app/services/job_ingest.py) for each batch as soon as it is committed, while
+the rest of the upload is still being read. Resumes have no stored features
+(a Resume row holds only its text; matches compute resume skills and
+embeddings per request), so /resumes/bulk has nothing to precompute.
+
+The results are sent with `IngestResponse`: a plain StreamingResponse
+watches `receive` for a disconnect while it streams, and that watcher would
+swallow the body chunks the generator is still reading.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings as cfg
+
+log = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+
+# (reference echoed back to the client, parsed item or None, error or None)
+Item = Tuple[Dict[str, Any], Any, Optional[str]]
+
+
+class IngestResponse(StreamingResponse):
+    """
+    Streams a body generator that reads the request body itself. The
+    generator is the only reader of `receive`; it sees a disconnect as
+    ClientDisconnect from request.stream().
+    """
+
+    def __init__(self, content, **kwargs):
+        kwargs.setdefault("media_type", NDJSON)
+        super().__init__(content, **kwargs)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+class BatchTasks:
+    """
+    `after_commit` hook that runs the sync `fn(*ids)` in the threadpool for
+    each committed batch right away, one batch at a time per upload (so one
+    upload never holds more than one model call). The work survives a client
+    disconnect; `wait()` returns once every batch queued so far is done.
+    """
+
+    _running: set = set()  # strong references: the loop only keeps weak ones to tasks
+
+    def __init__(self, fn: Callable[..., None]):
+        self.fn = fn
+        self._last: Optional[asyncio.Task] = None
+
+    def __call__(self, ids: List[int]) -> None:
+        task = asyncio.get_running_loop().create_task(self._run(self._last, ids))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        self._last = task
+
+    async def _run(self, previous: Optional[asyncio.Task], ids: List[int]) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await run_in_threadpool(self.fn, *ids)
+        except Exception:
+            log.exception("Work for bulk batch %s failed", ids[:10])
+
+    async def wait(self) -> None:
+        if self._last is not None:
+            await asyncio.wait([self._last])
+
+
+def _line(obj: dict) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _error(e: Exception) -> str:
+    if isinstance(e, ValidationError):
+        first = e.errors()[0]
+        return f"{'.'.join(str(p) for p in first['loc']) or 'item'}: {first['msg']}"
+    return str(e)
+
+
+async def ndjson_items(chunks: AsyncIterator[bytes], max_line: Optional[int] = None) -> AsyncIterator[Item]:
+    """Parse NDJSON from body chunks; blank lines are skipped, overlong or malformed lines become errors."""
+    max_line = max_line or cfg.bulk_max_line_bytes
+    buf = bytearray()
+    n = 0
+    skipping = False  # inside a line already reported as too long
+
+    def parse(raw: bytes) -> Item:
+        try:
+            obj = json.loads(raw)
+        except ValueError:
+            return {"line": n}, None, "invalid JSON"
+        if not isinstance(obj, dict):
+            return {"line": n}, None, "expected a JSON object"
+        return {"line": n}, obj, None
+
+    async for chunk in chunks:
+        buf += chunk
+        while True:
+            i = buf.find(b"\n")
+            if i < 0:
+                break
+            raw = bytes(buf[:i])
+            del buf[:i + 1]
+            if skipping:
+                skipping = False
+                continue
+            n += 1
+            if len(raw) > max_line:
+                yield {"line": n}, None, f"line longer than {max_line} bytes"
+            elif raw.strip():
+                yield parse(raw)
+        if len(buf) > max_line and not skipping:
+            n += 1
+            skipping = True
+            yield {"line": n}, None, f"line longer than {max_line} bytes"
+        if skipping:
+            buf.clear()
+    if buf.strip() and not skipping:
+        n += 1
+        yield parse(bytes(buf))  # a final line without its newline
+
+
+async def insert_stream(
+    db: AsyncSession,
+    items: AsyncIterator[Item],
+    build: Callable[[Any], Any],
+    id_key: str,
+    after_commit: Optional[Callable[[List[int]], None]] = None,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Insert `build(item)` rows in batched transactions and yield one NDJSON
+    result line per item, then a summary line. `build` raises ValueError or
+    ValidationError to refuse an item. If the client disconnects, the batch
+    not yet committed is dropped.
+    """
+    batch_size = max(1, batch_size or cfg.bulk_batch_size)
+    batch: List[Tuple[dict, Any]] = []
+    counts = {"created": 0, "failed": 0}
+    seen = 0
+
+    async def flush() -> List[bytes]:
+        rows = [row for _, row in batch]
+        out: List[bytes] = []
+        try:
+            db.add_all(rows)
+            await db.commit()
+        except SQLAlchemyError:
+            log.exception("Bulk insert of %s rows failed", len(rows))
+            await db.rollback()
+            counts["failed"] += len(batch)
+            out = [_line({**ref, "error": "could not be stored"}) for ref, _ in batch]
+        else:
+            counts["created"] += len(batch)
+            out = [_line({**ref, id_key: row.id}) for ref, row in batch]
+            if after_commit is not None:
+                after_commit([row.id for row in rows])
+        db.expunge_all()
+        batch.clear()
+        return out
+
+    try:
+        async for ref, item, error in items:
+            seen += 1
+            if seen > cfg.bulk_max_items:
+                counts["failed"] += 1
+                yield _line({**ref, "error": f"over the limit of {cfg.bulk_max_items} items per request"})
+                continue
+            if error is None:
+                try:
+                    batch.append((ref, build(item)))
+                except (ValidationError, ValueError) as e:
+                    error = _error(e)
+            if error is not None:
+                counts["failed"] += 1
+                yield _line({**ref, "error": error})
+            elif len(batch) >= batch_size:
+                for line in await flush():
+                    yield line
+    except ClientDisconnect:
+        # the client is gone: earlier batches stay committed, the open one is dropped
+        log.info("Bulk upload disconnected after %s committed rows", counts["created"])
+        return
+    if batch:
+        for line in await flush():
+            yield line
+    yield _line({"done": True, **counts})
+
+
+async def pdf_items(form) -> AsyncIterator[Item]:
+    """The PDF parts of a parsed multipart form as items ({"text", "filename"}), text extracted off the event loop."""
+    from starlette.datastructures import UploadFile
+
+    from app.utils.pdf import extract_pdf_text
+
+    for field, part in form.multi_items():
+        if not isinstance(part, UploadFile):
+            continue
+        ref = {"file": part.filename or field}
+        if part.content_type != "application/pdf":
+            yield ref, None, "only PDF supported"
+            continue
+        try:
+            text, _, _ = await run_in_threadpool(extract_pdf_text, part.file)
+        except Exception:
+            yield ref, None, "could not read the PDF"
+            continue
+        yield ref, {"text": text, "filename": part.filename}, None
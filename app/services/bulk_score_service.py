@@ -0,0 +1,293 @@
+# app/services/bulk_score_service.py
+"""
+Offline re-scoring of many (resume, job) pairs.
+
+Pairs are streamed in chunks from the database (every stored Report) or from
+JSONL/CSV files; each chunk is embedded with one `embed_many` call, skills are
+extracted across a process pool, and results are written back to the reports
+in bulk or to JSONL/Parquet. Progress is checkpointed after every chunk so an
+interrupted run picks up where it stopped.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Job, Report, Resume
+from app.nlp.embeddings import embed_many
+from app.nlp.skills_extractor import extract_skill_mask, extract_skill_set, skills_version, skills_vocab
+from app.nlp.skillset import SkillSet
+from app.services.match_service import bucket, score_match
+from app.services.report_service import evict_reports, summary_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_ARROW = True
+except Exception:
+    _HAS_ARROW = False
+
+_RESUME_FIELDS = ("resume_text", "resume", "text")
+_JD_FIELDS = ("jd_text", "job_description", "description", "jd")
+
+
+@dataclass
+class Pair:
+    key: str                      # report id (db) or row id / ordinal (files)
+    resume_text: str
+    jd_text: str
+    payload: Optional[dict] = field(default=None)  # existing report payload (db source only)
+
+
+# -------------------- sources --------------------
+def iter_db_pairs(db: Session, chunk_size: int, after_id: int = 0) -> Iterator[List[Pair]]:
+    """Keyset-walk Reports by id, joining their resume and job text."""
+    last = after_id
+    while True:
+        rows = db.execute(
+            select(Report.id, Report.payload, Resume.text, Job.description)
+            .join(Resume, Resume.id == Report.resume_id)
+            .join(Job, Job.id == Report.job_id)
+            .where(Report.id > last)
+            .order_by(Report.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield [Pair(str(rid), rtext or "", jtext or "", dict(payload or {})) for rid, payload, rtext, jtext in rows]
+        last = rows[-1][0]
+
+
+def _pick(row: dict, names) -> str:
+    for n in names:
+        v = row.get(n)
+        if v:
+            return str(v)
+    return ""
+
+
+def _iter_rows(path: Path) -> Iterator[dict]:
+    if path.suffix.lower() == ".csv":
+        csv.field_size_limit(sys.maxsize)
+        with path.open(encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+    else:
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def iter_file_pairs(path: Path, chunk_size: int, skip: int = 0) -> Iterator[List[Pair]]:
+    """Stream pairs from JSONL/CSV, skipping the first `skip` rows (already processed)."""
+    chunk: List[Pair] = []
+    for i, row in enumerate(_iter_rows(path)):
+        if i < skip:
+            continue
+        key = str(row.get("id") if row.get("id") not in (None, "") else i)
+        chunk.append(Pair(key, _pick(row, _RESUME_FIELDS), _pick(row, _JD_FIELDS)))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -------------------- scoring --------------------
+def _skill_sets(texts: List[str], pool: Optional[Executor]) -> List[SkillSet]:
+    """
+    Skills per text as bitsets. Pool workers send back (version, int mask)
+    instead of name lists; a mask from a different dictionary version (a
+    reload raced the run) is re-extracted here.
+    """
+    if pool is None:
+        return [extract_skill_set(t) for t in texts]
+    version, vocab = skills_version(), skills_vocab()
+    out = []
+    for t, (v, mask) in zip(texts, pool.map(extract_skill_mask, texts, chunksize=max(1, len(texts) // 32))):
+        out.append(SkillSet(mask, vocab) if v == version else extract_skill_set(t))
+    return out
+
+
+def score_pairs(pairs: List[Pair], pool: Optional[Executor] = None) -> List[dict]:
+    """Score a chunk: one batched embedding call, skills via `pool` when given."""
+    # Identical JDs (and resumes) are common within a chunk: embed/extract each text once.
+    texts = list(dict.fromkeys([p.resume_text for p in pairs] + [p.jd_text for p in pairs]))
+    index = {t: i for i, t in enumerate(texts)}
+
+    vecs = np.asarray(embed_many(texts), dtype=np.float32)
+    skills = _skill_sets(texts, pool)
+
+    r_idx = np.fromiter((index[p.resume_text] for p in pairs), dtype=np.int64, count=len(pairs))
+    j_idx = np.fromiter((index[p.jd_text] for p in pairs), dtype=np.int64, count=len(pairs))
+    # embeddings are L2-normalised, so cosine is a row-wise dot product
+    sims = np.clip(np.einsum("ij,ij->i", vecs[r_idx], vecs[j_idx]), 0.0, 1.0)
+
+    return [
+        score_match(float(sims[k]), skills[r_idx[k]], skills[j_idx[k]])
+        for k in range(len(pairs))
+    ]
+
+
+def merge_into_payload(payload: dict, scored: dict) -> dict:
+    """Overlay fresh scores onto a stored report payload (keeps pages, utm, etc.)."""
+    out = dict(payload or {})
+    out.update(scored)
+    out["skills"] = scored["resume_skills"]
+    for short, key in (("ms", "match_score"), ("ss", "semantic_similarity"), ("so", "skill_overlap")):
+        label, pct = bucket(scored[key])
+        out[short] = {"label": label, "pct": pct}
+    return out
+
+
+# -------------------- sinks --------------------
+class DbSink:
+    """
+    Bulk UPDATE of report payloads by primary key, one transaction per chunk.
+    The rewritten reports are evicted from the public report caches (see
+    report_service.evict_reports) once the chunk is committed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def write(self, pairs: List[Pair], results: List[dict]) -> None:
+        rows = []
+        for p, r in zip(pairs, results):
+            payload = merge_into_payload(p.payload or {}, r)
+            rows.append({"id": int(p.key), "payload": payload, **summary_columns(payload)})
+        self.db.execute(update(Report), rows)
+        slugs = self.db.scalars(select(Report.slug).where(Report.id.in_([row["id"] for row in rows]))).all()
+        self.db.commit()
+        evict_reports(slugs)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink:
+    def __init__(self, path: Path):
+        self.f = path.open("a", encoding="utf-8")
+
+    def write(self, pairs: List[Pair], results: List[dict]) -> None:
+        for p, r in zip(pairs, results):
+            self.f.write(json.dumps({"id": p.key, **r}, ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+class ParquetSink:
+    """One part file per chunk under a directory, so resumed runs never rewrite earlier parts."""
+
+    def __init__(self, directory: Path):
+        if not _HAS_ARROW:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+        directory.mkdir(parents=True, exist_ok=True)
+        self.dir = directory
+
+    def write(self, pairs: List[Pair], results: List[dict]) -> None:
+        table = pa.Table.from_pylist([{"id": p.key, **r} for p, r in zip(pairs, results)])
+        pq.write_table(table, self.dir / f"part-{time.time_ns()}.parquet")
+
+    def close(self) -> None:
+        pass
+
+
+def open_sink(out: str, db: Optional[Session] = None):
+    if out == "db":
+        if db is None:
+            raise ValueError("--out db needs a database session")
+        return DbSink(db)
+    path = Path(out)
+    if path.suffix.lower() == ".parquet":
+        return ParquetSink(path)
+    return JsonlSink(path)
+
+
+# -------------------- checkpoints --------------------
+def load_checkpoint(path: Optional[Path], source: str) -> Dict:
+    if not path or not path.exists():
+        return {"source": source, "position": 0, "rows": 0}
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("source") != source:
+        raise ValueError(f"Checkpoint {path} belongs to source {state.get('source')!r}, not {source!r}")
+    return state
+
+
+def save_checkpoint(path: Optional[Path], state: Dict) -> None:
+    if not path:
+        return
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# -------------------- driver --------------------
+def run_bulk_score(
+    source: str,
+    out: str,
+    *,
+    db: Optional[Session] = None,
+    chunk_size: int = 256,
+    workers: int = 0,
+    checkpoint: Optional[Path] = None,
+    limit: Optional[int] = None,
+    log=print,
+) -> Dict:
+    """
+    Re-score every pair in `source` ("db" or a .jsonl/.csv path) into `out`
+    ("db", a .jsonl file or a .parquet directory). Returns the final checkpoint state.
+    """
+    if out == "db" and source != "db":
+        raise ValueError("--out db only applies to --source db (results are merged into existing reports)")
+    state = load_checkpoint(checkpoint, source)
+    if source == "db":
+        if db is None:
+            raise ValueError("source 'db' needs a database session")
+        chunks: Iterable[List[Pair]] = iter_db_pairs(db, chunk_size, after_id=int(state["position"]))
+    else:
+        chunks = iter_file_pairs(Path(source), chunk_size, skip=int(state["position"]))
+
+    sink = open_sink(out, db)
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    start = time.perf_counter()
+    done = 0
+    try:
+        for pairs in chunks:
+            if limit is not None:
+                if done >= limit:
+                    break
+                pairs = pairs[:limit - done]  # never more than `limit` rows, even mid-chunk
+            results = score_pairs(pairs, pool)
+            sink.write(pairs, results)
+
+            done += len(pairs)
+            state["rows"] = int(state.get("rows", 0)) + len(pairs)
+            state["position"] = int(pairs[-1].key) if source == "db" else int(state["position"]) + len(pairs)
+            save_checkpoint(checkpoint, state)
+
+            elapsed = time.perf_counter() - start
+            log(f"[score] {state['rows']} rows total, {done} this run, {done / elapsed:.1f} rows/s")
+    finally:
+        sink.close()
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    state["rows_per_sec"] = (done / elapsed) if elapsed else 0.0
+    log(f"[score] done: {done} rows in {elapsed:.1f}s ({state['rows_per_sec']:.1f} rows/s)")
+    return state
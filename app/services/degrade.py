@@ -0,0 +1,153 @@
+# app/services/degrade.py
+"""
+Cheaper analyses while the process is saturated.
+
+A slightly less thorough answer now beats a full one after the client gave
+up. The controller watches two signals: analyses waiting for a slot
+(app/services/scheduler.py) and the p95 of the last DEGRADE_WINDOW match
+pipelines. Crossing a level's threshold in DEGRADE_QUEUE or DEGRADE_LATENCY_MS
+switches that level on at once; it is switched off one level at a time, after
+the signals stayed under its thresholds for DEGRADE_COOLDOWN seconds.
+
+  level 1  fuzzy_skills  strict alias matching only (no fuzzy / semantic recall pass)
+  level 2  metrics       + no metric extraction in /analyze
+  level 3  small_model   + embeddings from DEGRADE_MODEL (only if it is set)
+
+`apply` fixes the level for the Documents of a request once, so every stage
+of one request (both texts, all stages) runs at the same level; entry points
+apply it to the resume and the JD together before the first stage. Results computed at a degraded level carry
+"degraded": [what was skipped] and are never memoized or stored as JD
+features; stored and memoized full results are still used when they exist.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from app.core.config import settings as cfg
+from app.nlp.document import Document
+from app.services.scheduler import scheduler
+
+log = logging.getLogger(__name__)
+
+LEVELS: Tuple[Tuple[str, ...], ...] = (
+    (),
+    ("fuzzy_skills",),
+    ("fuzzy_skills", "metrics"),
+    ("fuzzy_skills", "metrics", "small_model"),
+)
+
+
+def _threshold(values, level: int) -> Optional[float]:
+    return values[level - 1] if len(values) >= level and values[level - 1] > 0 else None
+
+
+class Controller:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._level = 0
+        self._calm_since: Optional[float] = None  # when the signals dropped under the current level
+        self._changed = time.monotonic()
+        self._latencies: Deque[float] = deque(maxlen=max(1, cfg.degrade_window))
+        self._counts = {"raised": 0, "lowered": 0, "applied": [0] * len(LEVELS)}
+
+    def max_level(self) -> int:
+        return 3 if cfg.degrade_model and cfg.degrade_model != cfg.sentence_model else 2
+
+    def observe(self, ms: float) -> None:
+        """Record how long a fully computed match pipeline took."""
+        with self._lock:
+            self._latencies.append(ms)
+
+    def _p95(self) -> float:
+        # caller holds the lock
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _target(self, queued: int, p95: float) -> int:
+        for level in range(self.max_level(), 0, -1):
+            q, ms = _threshold(cfg.degrade_queue, level), _threshold(cfg.degrade_latency_ms, level)
+            if (q is not None and queued >= q) or (ms is not None and p95 >= ms):
+                return level
+        return 0
+
+    def level(self) -> int:
+        """The level for an analysis starting now (re-evaluated on every call)."""
+        if not cfg.degrade:
+            return 0
+        queued = scheduler.queue_depth()
+        now = time.monotonic()
+        with self._lock:
+            p95 = self._p95()
+            target = self._target(queued, p95)
+            if target > self._level:
+                log.warning("Degrading analyses to level %s (queued=%s, p95=%.0f ms)", target, queued, p95)
+                self._level, self._calm_since, self._changed = target, None, now
+                self._counts["raised"] += 1
+            elif target < self._level:
+                if self._calm_since is None:
+                    self._calm_since = now
+                elif now - self._calm_since >= cfg.degrade_cooldown:
+                    self._level -= 1
+                    self._calm_since, self._changed = now, now
+                    self._counts["lowered"] += 1
+                    log.info("Analyses back to level %s (queued=%s, p95=%.0f ms)", self._level, queued, p95)
+            else:
+                self._calm_since = None
+            return self._level
+
+    def apply(self, *docs: Document) -> None:
+        """
+        Fix a level on each Document that has none yet (before any of its views
+        are computed). Documents of one request share a level: if any of `docs`
+        already has one, the others get that one instead of the current level.
+        """
+        todo = [d for d in docs if "degraded" not in d.__dict__]
+        if not todo:
+            return
+        fixed = next((d for d in docs if "degraded" in d.__dict__), None)
+        if fixed is not None:
+            level, model = LEVELS.index(fixed.degraded), fixed.model
+        else:
+            level = self.level()
+            model = cfg.degrade_model if "small_model" in LEVELS[level] else None
+        with self._lock:
+            self._counts["applied"][level] += len(todo)
+        skipped = LEVELS[level]
+        for doc in todo:
+            doc.degraded = skipped
+            doc.fuzzy = "fuzzy_skills" not in skipped
+            doc.model = model
+
+    def reset(self) -> None:
+        with self._lock:
+            self._level, self._calm_since, self._changed = 0, None, time.monotonic()
+            self._latencies.clear()
+
+    def stats(self) -> dict:
+        """Current level and signals, plus how many analyses ran at each level, for /metricsz."""
+        queued = scheduler.queue_depth()
+        with self._lock:
+            return {
+                "enabled": cfg.degrade,
+                "level": self._level,
+                "skipped": list(LEVELS[self._level]),
+                "max_level": self.max_level(),
+                "queued": queued,
+                "latency_p95_ms": round(self._p95(), 1),
+                "seconds_at_level": round(time.monotonic() - self._changed, 1),
+                "raised": self._counts["raised"],
+                "lowered": self._counts["lowered"],
+                "applied_by_level": list(self._counts["applied"]),
+            }
+
+
+controller = Controller()
+apply = controller.apply
+observe = controller.observe
+stats = controller.stats
@@ -0,0 +1,139 @@
+# app/services/job_features.py
+"""
+Reuse of job-description features (skills, embedding) across near-identical JDs.
+
+Users paste the same posting over and over with trivial edits: tracking
+parameters in links, whitespace, one changed line. Each JD whose features
+the match pipeline computes is remembered here: the features go into a
+bounded LRU keyed by the text hash, and its MinHash signature into an LSH
+index (app/nlp/minhash.py). A new JD first looks for its exact hash, then
+for an indexed JD with estimated Jaccard similarity >= JD_DEDUP_THRESHOLD
+over word shingles, and adopts that JD's skills and embedding instead of
+computing them.
+
+Features are only reused while the skills dictionary version (and semantic
+skill settings, see `skills_key`) and the model they were computed with are
+still current.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings as cfg
+from app.nlp.document import Document
+from app.nlp.minhash import LSHIndex, MinHasher
+from app.nlp.skills_extractor import skills_version
+from app.nlp.skillset import SkillSet
+from app.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class JobFeatures:
+    skills_version: str
+    model: str
+    skill_set: SkillSet
+    embedding: np.ndarray
+    text_hash: str  # the JD they were computed from
+
+
+hasher = MinHasher(cfg.jd_dedup_bands, cfg.jd_dedup_rows, cfg.jd_dedup_shingle)
+index = LSHIndex(hasher, capacity=cfg.jd_features_cache_size)
+features = TTLCache(maxsize=cfg.jd_features_cache_size)
+
+_stats_lock = threading.Lock()
+_stats = {"exact": 0, "near": 0, "miss": 0, "remembered": 0, "lookup_ms_total": 0.0}
+
+
+def _count(key: str, ms: float) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+        _stats["lookup_ms_total"] += ms
+
+def skills_key() -> str:
+    """The skills dictionary version plus the settings that change what Document.skill_set returns."""
+    key = skills_version()
+    if cfg.skills_semantic:
+        key += f"+semantic:{cfg.skills_semantic_threshold}:{cfg.skills_semantic_max_ngram}"
+    return key
+
+def _current(f: Optional[JobFeatures]) -> bool:
+    return f is not None and f.skills_version == skills_key() and f.model == cfg.sentence_model
+
+def lookup(doc: Document) -> Optional[JobFeatures]:
+    """Features of this JD or of a near-duplicate already seen, if still current."""
+    t0 = time.perf_counter()
+    hit = features.get(doc.hash)
+    if _current(hit):
+        _count("exact", (time.perf_counter() - t0) * 1000)
+        return hit
+    sig = hasher.signature(doc.cleaned) if cfg.jd_dedup else None
+    if sig is not None:
+        for _, key in index.query(sig, cfg.jd_dedup_threshold):
+            hit = features.get(key)
+            if _current(hit):
+                _count("near", (time.perf_counter() - t0) * 1000)
+                return hit
+    _count("miss", (time.perf_counter() - t0) * 1000)
+    return None
+
+def reuse(doc: Document) -> bool:
+    """
+    Seed `doc` with the features of the same or a near-identical JD; False if
+    there are none. Features of another text mark `doc` as borrowed, so they
+    are never persisted as this text's own (see job_ingest.store).
+    """
+    if cfg.jd_features_cache_size <= 0 or "skill_set" in doc.__dict__:
+        return False
+    f = lookup(doc)
+    if f is None:
+        return False
+    doc.seed(skill_set=f.skill_set, embedding=f.embedding)
+    if f.text_hash != doc.hash:
+        doc.borrowed_from = f.text_hash
+    return True
+
+def remember(doc: Document) -> None:
+    """Record a JD's computed skills and embedding (call once both exist)."""
+    if cfg.jd_features_cache_size <= 0:
+        return
+    features.set(doc.hash, JobFeatures(skills_key(), cfg.sentence_model, doc.skill_set, doc.embedding, doc.hash))
+    sig = hasher.signature(doc.cleaned) if cfg.jd_dedup else None
+    if sig is not None:
+        index.add(doc.hash, sig)
+    with _stats_lock:
+        _stats["remembered"] += 1
+
+def remember_seeded(doc: Document) -> bool:
+    """
+    Record the skills and embedding `doc` already holds for its own text at full
+    quality (seeded from its Job row, see job_ingest.seed) unless they are cached;
+    nothing is computed. False if there was nothing to record.
+    """
+    if (
+        cfg.jd_features_cache_size <= 0 or doc.borrowed_from or doc.degraded or doc.model is not None
+        or "skill_set" not in doc.__dict__ or "embedding" not in doc.__dict__
+        or _current(features.get(doc.hash))
+    ):
+        return False
+    remember(doc)
+    return True
+
+def clear() -> None:
+    features.clear()
+    index.clear()
+
+def stats() -> dict:
+    """Reuse counters (exact text / near duplicate / miss) for /metricsz."""
+    with _stats_lock:
+        out = dict(_stats)
+    lookups = out["exact"] + out["near"] + out["miss"]
+    out["lookup_ms_avg"] = round(out.pop("lookup_ms_total") / lookups, 3) if lookups else 0.0
+    out["hit_rate"] = (out["exact"] + out["near"]) / lookups if lookups else 0.0
+    out["indexed"] = len(index)
+    out["cached"] = len(features)
+    return out
@@ -0,0 +1,120 @@
+# app/services/job_ingest.py
+"""
+JD features stored on the Job row.
+
+`POST /jobs` answers as soon as the row exists; `precompute` then runs as a
+background task (once per insert batch for /jobs/bulk) and writes the
+description's text hash, extracted skills and embedding (float32 bytes)
+onto the row. `match_resume_job` seeds the
+JD's Document from those columns (`seed`), so matches against a stored job
+skip skill extraction and the JD half of the model call. Stored features
+count only while the text hash, skills key and model still match; otherwise
+the match computes them as before and `store` refreshes the row. Features a
+match borrowed from a near-duplicate JD (job_features.reuse) are never
+stored: the row only holds features computed from its own text.
+
+`backfill` (python -m app.cli backfill-jobs) fills in jobs created before
+these columns existed or after a dictionary / model change, one batched
+model call per batch.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings as cfg
+from app.db.models import Job
+from app.nlp.document import Document, embed_documents
+from app.nlp.skills_extractor import skills_vocab
+from app.nlp.skillset import SkillSet
+from app.services.job_features import skills_key
+
+log = logging.getLogger(__name__)
+
+
+def is_current(job: Job, doc: Optional[Document] = None) -> bool:
+    """Whether the row's stored features apply to its description with today's dictionary and model."""
+    return (
+        job.skills is not None and job.embedding is not None
+        and job.skills_version == skills_key() and job.embedding_model == cfg.sentence_model
+        and job.text_hash == (doc or Document(job.description)).hash
+    )
+
+def seed(job: Job, doc: Document) -> bool:
+    """Give `doc` the skills and embedding stored on `job`; False if there are none that still apply."""
+    if "skill_set" in doc.__dict__ or doc.model is not None or not is_current(job, doc):
+        return False
+    doc.seed(
+        skill_set=SkillSet.from_names(job.skills, skills_vocab()),
+        embedding=np.frombuffer(job.embedding, dtype=np.float32),
+    )
+    return True
+
+def store(job: Job, doc: Document) -> bool:
+    """
+    Copy `doc`'s skills and embedding onto `job` if both were computed from
+    this exact text at full quality (not borrowed from a near-duplicate JD,
+    not degraded) and the row lacks them (no commit).
+    """
+    if doc.borrowed_from or doc.degraded or "skill_set" not in doc.__dict__ or "embedding" not in doc.__dict__:
+        return False
+    if is_current(job, doc):
+        return False
+    job.text_hash = doc.hash
+    job.skills = doc.skills
+    job.skills_version = skills_key()
+    job.embedding = np.asarray(doc.embedding, dtype=np.float32).tobytes()
+    job.embedding_model = cfg.sentence_model
+    return True
+
+def compute(jobs: Iterable[Job]) -> int:
+    """Compute and set features for the given rows (one model call for all of them). Returns how many changed."""
+    docs = [(job, Document(job.description)) for job in jobs]
+    todo = [(job, doc) for job, doc in docs if not is_current(job, doc)]
+    for _, doc in todo:
+        doc.skill_set  # noqa: B018  (compute the view)
+    embed_documents(*(doc for _, doc in todo))
+    return sum(store(job, doc) for job, doc in todo)
+
+
+def precompute(*job_ids: int) -> None:
+    """
+    Background task after POST /jobs (and per batch of /jobs/bulk): fill in
+    the new rows' features with one model call (sync; Starlette runs it in a thread).
+    """
+    from app.db.session import SessionLocal
+
+    try:
+        with SessionLocal() as db:
+            rows = db.execute(select(Job).where(Job.id.in_(job_ids))).scalars().all()
+            if compute(rows):
+                db.commit()
+    except Exception:
+        # the match path computes them on miss; nothing is lost
+        log.exception("Precomputing features for jobs %s failed", list(job_ids)[:10])
+
+
+def backfill(db: Session, batch_size: int = 100, force: bool = False, log=print) -> int:
+    """Fill in features for jobs without current ones (sync, for the CLI). Returns how many rows were written."""
+    stale = or_(
+        Job.text_hash.is_(None), Job.skills.is_(None), Job.embedding.is_(None),
+        Job.skills_version.is_distinct_from(skills_key()), Job.embedding_model.is_distinct_from(cfg.sentence_model),
+    )
+    done = 0
+    last = 0
+    while True:
+        query = select(Job).where(Job.id > last).order_by(Job.id).limit(batch_size)
+        rows = db.execute(query if force else query.where(stale)).scalars().all()
+        if not rows:
+            return done
+        if force:
+            for job in rows:
+                job.text_hash = None
+        done += compute(rows)
+        db.commit()
+        last = rows[-1].id
+        log(f"[backfill-jobs] job features written: {done}")
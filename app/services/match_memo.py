@@ -0,0 +1,108 @@
+# app/services/match_memo.py
+"""
+Memo of finished match results.
+
+The same (resume, JD) pair is matched again and again: /demo on every visit,
+users resubmitting an unchanged pair, re-runs of queued jobs. A match is a
+pure function of the two cleaned texts, the embedding model, the skills
+dictionary and the scoring code, so the key is built from exactly those
+(see match_service.memo_key) and nothing ever has to be invalidated by hand:
+reloading skills, switching the model or bumping SCORING_VERSION changes
+every key, and old entries age out of the LRU (and expire in Redis).
+
+Lookups go to the in-process LRU first, then Redis when MATCH_MEMO_REDIS is
+set (shared by all workers); a Redis failure is logged and treated as a miss.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from typing import Optional
+
+from app.core.config import settings as cfg
+from app.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "match:"
+
+memo = TTLCache(maxsize=max(1, cfg.match_memo_size), ttl=cfg.match_memo_ttl)
+_redis = None
+_stats_lock = threading.Lock()
+_stats = {"redis_hits": 0, "redis_misses": 0, "redis_errors": 0, "stored": 0}
+
+
+def enabled() -> bool:
+    return cfg.match_memo_size > 0
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+def _redis_client():
+    global _redis
+    if _redis is None and cfg.match_memo_redis and cfg.redis_url:
+        import redis
+        _redis = redis.from_url(cfg.redis_url, decode_responses=True)
+    return _redis
+
+def _copy(out: dict) -> dict:
+    # callers add keys and keep the lists in payloads; never hand out the cached objects
+    return {k: list(v) if isinstance(v, list) else v for k, v in out.items()}
+
+def get(key: str) -> Optional[dict]:
+    if not enabled():
+        return None
+    hit = memo.get(key)
+    if hit is not None:
+        return _copy(hit)
+    r = _redis_client()
+    if r is None:
+        return None
+    try:
+        raw = r.get(_REDIS_PREFIX + key)
+    except Exception:
+        _count("redis_errors")
+        log.warning("match memo: redis get failed", exc_info=True)
+        return None
+    if not raw:
+        _count("redis_misses")
+        return None
+    _count("redis_hits")
+    out = json.loads(raw)
+    memo.set(key, out)
+    return _copy(out)
+
+def put(key: str, out: dict) -> None:
+    if not enabled():
+        return
+    out = _copy(out)
+    memo.set(key, out)
+    _count("stored")
+    r = _redis_client()
+    if r is not None:
+        try:
+            r.set(_REDIS_PREFIX + key, json.dumps(out), ex=cfg.match_memo_ttl or None)
+        except Exception:
+            _count("redis_errors")
+            log.warning("match memo: redis set failed", exc_info=True)
+
+def clear() -> None:
+    """Drop this process's entries (Redis entries expire on their own; keys are versioned)."""
+    memo.clear()
+
+def stats() -> dict:
+    """LRU counters plus Redis hits/misses, for /metricsz."""
+    with _stats_lock:
+        counters = dict(_stats)
+    local = memo.stats()
+    lookups = local["hits"] + local["misses"]
+    hits = local["hits"] + counters["redis_hits"]
+    return {
+        **local,
+        **counters,
+        "enabled": enabled(),
+        "redis": _redis is not None,
+        "hit_rate": (hits / lookups) if lookups else 0.0,
+    }
@@ -1,13 +1,22 @@
 # app/services/match_service.py
 from __future__ import annotations
 
-from typing import List
-from sqlalchemy.orm import Session
+import hashlib
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings as cfg
 from app.db.models import Resume, Job  # type hints only
-from app.nlp.embeddings import embed
-from app.nlp.skills_extractor import extract_skills
-from app.utils.timing import timer
+from app.nlp.document import Document, embed_documents
+from app.nlp.skillset import SkillSet
+from app.services import degrade, job_features, job_ingest, match_memo
+
+# Blend weights for match_score
+SEMANTIC_WEIGHT = 0.6
+SKILL_WEIGHT = 0.4
+# Bump whenever score_match/_recommendations change what they return: memoized results are keyed on it
+SCORING_VERSION = 1
 
 
 def _cosine(u, v) -> float:
@@ -41,48 +50,156 @@ def _recommendations(missing: List[str], jd_skills: List[str], coverage: float)
     return tips
 
 
-def match_resume_job(db: Session, resume: Resume, job: Job) -> dict:
-    """
-    Pure function: compute similarity + skill overlap and suggested actions.
-    (No DB writes; persistence happens when creating the Report.)
-    """
-    with timer() as elapsed:
-        r_text = resume.text or ""
-        j_text = job.description or ""
-
-        # Embeddings similarity
-        r_vec = embed(r_text)
-        j_vec = embed(j_text)
-        semantic_similarity = _cosine(r_vec, j_vec)
-
-        # Skills overlap
-        jd_skills = sorted(set(extract_skills(j_text)))
-        resume_skills = sorted(set(extract_skills(r_text)))
+def bucket(score: float):
+    """(label, percent) for a 0..1 score, as shown on report cards."""
+    score = 0.0 if score is None else float(score)
+    pct = int(round(max(0.0, min(1.0, score)) * 100))
+    if score < 0.4: return ("Weak", pct)
+    if score < 0.6: return ("Medium", pct)
+    return ("Strong", pct)
 
-        jd_set = set(jd_skills)
-        res_set = set(resume_skills)
-        overlap = sorted(list(jd_set & res_set))
-        missing = sorted(list(jd_set - res_set))
 
-        skill_overlap = (len(overlap) / len(jd_skills)) if jd_skills else 0.0
+def score_match(
+    semantic_similarity: float,
+    resume_skills: Union[SkillSet, Iterable[str]],
+    jd_skills: Union[SkillSet, Iterable[str]],
+) -> dict:
+    """
+    Blend an already computed semantic similarity with skill overlap.
+    Shared by the request path and the bulk re-scoring CLI. Skills may be
+    SkillSets from the same dictionary or plain name lists; overlap and gaps
+    are bit operations either way and names are only produced for the result.
+    """
+    same_dictionary = (
+        isinstance(resume_skills, SkillSet) and isinstance(jd_skills, SkillSet)
+        and (resume_skills.vocab is jd_skills.vocab or resume_skills.vocab == jd_skills.vocab)
+    )
+    if not same_dictionary:  # name lists, or sets from before and after a dictionary reload
+        resume_skills, jd_skills = SkillSet.pair(
+            resume_skills.names() if isinstance(resume_skills, SkillSet) else resume_skills,
+            jd_skills.names() if isinstance(jd_skills, SkillSet) else jd_skills,
+        )
+    overlap = resume_skills & jd_skills
+    missing = jd_skills - resume_skills
 
-        # Blended score (tweak weights if you want)
-        match_score = round(0.6 * semantic_similarity + 0.4 * skill_overlap, 4)
+    n_jd = len(jd_skills)
+    skill_overlap = (len(overlap) / n_jd) if n_jd else 0.0
 
-        # Recommendations
-        recs = _recommendations(missing, jd_skills, skill_overlap)
+    # Blended score (tweak weights if you want)
+    match_score = round(SEMANTIC_WEIGHT * semantic_similarity + SKILL_WEIGHT * skill_overlap, 4)
 
-        runtime_ms = int(elapsed())
+    jd_names = jd_skills.names()
+    missing_names = missing.names()
+    # Recommendations
+    recs = _recommendations(missing_names, jd_names, skill_overlap)
 
     return {
-        "jd_skills": jd_skills,
-        "resume_skills": resume_skills,
-        "overlap_skills": overlap,
-        "missing_skills": missing,
+        "jd_skills": jd_names,
+        "resume_skills": resume_skills.names(),
+        "overlap_skills": overlap.names(),
+        "missing_skills": missing_names,
         "semantic_similarity": float(semantic_similarity),
         "skill_overlap": float(skill_overlap),
         "match_score": float(match_score),
         "recommendations": recs,
-        "runtime_ms": runtime_ms,
     }
 
+
+def memo_key(resume_doc: Document, job_doc: Document) -> str:
+    """Everything a match result depends on: both texts, the model, the skills dictionary and the scoring code."""
+    parts = (
+        resume_doc.hash, job_doc.hash, cfg.sentence_model, job_features.skills_key(),
+        f"{SCORING_VERSION}:{SEMANTIC_WEIGHT}:{SKILL_WEIGHT}",
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _memoized_stages(out: dict) -> Iterator[Tuple[str, dict]]:
+    yield "skills", {k: out[k] for k in ("resume_skills", "jd_skills", "overlap_skills", "missing_skills")}
+    yield "semantic", {"semantic_similarity": out["semantic_similarity"]}
+    yield "match", out
+
+
+def match_stages(resume_doc: Document, job_doc: Document) -> Iterator[Tuple[str, dict]]:
+    """
+    The match pipeline one stage at a time, for callers that report progress:
+      ("skills", {resume_skills, jd_skills,
+                  overlap_skills, missing_skills})  after skill extraction
+      ("semantic", {semantic_similarity})           after both texts are embedded
+      ("match", <match_resume_job result>)          blended score, gaps, tips
+    runtime_ms counts only the time spent inside the stages, not between yields.
+    A pair seen before (see match_memo) replays the stored result at once; the
+    JD's features are then only recorded if the Job row already supplied them.
+    Under load the stages run degraded (see degrade); such results say what
+    they skipped in "degraded" and are not memoized.
+    """
+    t0 = time.perf_counter()
+    degrade.apply(resume_doc, job_doc)
+    key = memo_key(resume_doc, job_doc)
+    hit = match_memo.get(key)
+    if hit is not None:
+        # A replay computes no JD features, and the run that stored this pair recorded
+        # its own (see below); embedding the JD here just to record it again would cost
+        # what the memo saves. Features seeded from the Job row are free, so keep those.
+        job_features.remember_seeded(job_doc)
+        hit["runtime_ms"] = int((time.perf_counter() - t0) * 1000)
+        yield from _memoized_stages(hit)
+        return
+
+    skipped = sorted(set(resume_doc.degraded) | set(job_doc.degraded))
+    # a JD seen before (or a near-identical one) brings its skills and embedding along,
+    # unless this request embeds with the smaller model
+    reused = job_doc.model is None and job_features.reuse(job_doc)
+    resume_skills, jd_skills = resume_doc.skill_set, job_doc.skill_set
+    spent = time.perf_counter() - t0
+    yield "skills", {
+        "resume_skills": resume_doc.skills,
+        "jd_skills": job_doc.skills,
+        "overlap_skills": (resume_skills & jd_skills).names(),
+        "missing_skills": (jd_skills - resume_skills).names(),
+    }
+
+    # Embeddings similarity (both texts in one model call)
+    t0 = time.perf_counter()
+    embed_documents(resume_doc, job_doc)
+    semantic_similarity = _cosine(resume_doc.embedding, job_doc.embedding)
+    if not reused and not job_doc.degraded:
+        job_features.remember(job_doc)
+    spent += time.perf_counter() - t0
+    yield "semantic", {"semantic_similarity": float(semantic_similarity)}
+
+    # Skills overlap
+    t0 = time.perf_counter()
+    out = score_match(semantic_similarity, resume_skills, jd_skills)
+    spent += time.perf_counter() - t0
+    out["runtime_ms"] = int(spent * 1000)
+    degrade.observe(spent * 1000)
+    if skipped:
+        out["degraded"] = skipped
+    else:
+        match_memo.put(key, out)
+    yield "match", out
+
+
+def match_resume_job(
+    db: AsyncSession,
+    resume: Resume,
+    job: Job,
+    resume_doc: Optional[Document] = None,
+    job_doc: Optional[Document] = None,
+) -> dict:
+    """
+    Compute similarity + skill overlap and suggested actions.
+    JD skills and embedding precomputed on the Job row are used when current;
+    otherwise the ones computed here are set on the row (see job_ingest).
+    No DB writes: the caller commits, e.g. when creating the Report.
+    """
+    resume_doc = resume_doc or Document(resume.text)
+    job_doc = job_doc or Document(job.description)
+    degrade.apply(resume_doc, job_doc)
+    job_ingest.seed(job, job_doc)
+    out: dict = {}
+    for _, out in match_stages(resume_doc, job_doc):
+        pass
+    job_ingest.store(job, job_doc)
+    return out
@@ -1,37 +1,355 @@
 # app/services/report_service.py
 from __future__ import annotations
+import hashlib
+import json
+import logging
 import secrets
 import string
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
 
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Report
+from app.core.config import settings as cfg
+from app.db.models import Job, Report, Resume
+from app.db.session import AsyncSessionLocal
+from app.nlp.skillset import SkillSet
+from app.services.match_service import bucket
+from app.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
 
 # short slug generator
 _ALPH = string.ascii_lowercase + string.digits
+
+
 def _slug(n: int = 10) -> str:
     return "".join(secrets.choice(_ALPH) for _ in range(n))
 
-def create_report(
+
+# Job.title of JDs pasted into the analysis form (they have no title of their own)
+PASTED_JD_TITLE = "Job Description"
+TITLE_MAX = 120
+
+
+def report_title(title: Optional[str], description: Optional[str]) -> Optional[str]:
+    """Dashboard title for a report: the job's title, or the JD's first line when it was pasted."""
+    title = (title or "").strip()
+    if not title or title == PASTED_JD_TITLE:
+        title = next((line.strip() for line in (description or "").splitlines() if line.strip()), "")
+    return title[:TITLE_MAX] or None
+
+
+def summary_columns(payload: Optional[dict], job: Optional[Job] = None) -> dict:
+    """
+    Narrow columns denormalized for list views: from the payload, plus the
+    title when the report's job is at hand (otherwise the column is left alone).
+    """
+    payload = payload or {}
+    score = payload.get("match_score")
+    out = {
+        "match_score": float(score) if score is not None else None,
+        "client_ip": payload.get("client_ip"),
+    }
+    if job is not None:
+        out["title"] = report_title(job.title, job.description)
+    return out
+
+
+def build_result_payload(analysis: dict, matched: dict, pages: int, chars: int) -> dict:
+    """The report payload for one analysis (what index.html and /r/{slug} render)."""
+    jd_sk = matched.get("jd_skills") or []
+    rs_sk = analysis.get("skills") or matched.get("resume_skills") or []
+    overlap = matched.get("overlap_skills")
+    if overlap is None:
+        rs, jd = SkillSet.pair(rs_sk, jd_sk)
+        overlap = (rs & jd).names()
+
+    ms_label, ms_pct = bucket(matched.get("match_score", 0.0))
+    ss_label, ss_pct = bucket(matched.get("semantic_similarity", 0.0))
+    so_label, so_pct = bucket(matched.get("skill_overlap", 0.0))
+
+    payload = {
+        "resume_id": analysis.get("resume_id"),
+        "tokens": analysis.get("tokens", 0),
+        "skills": rs_sk,
+        "match_score": float(matched.get("match_score", 0.0)),
+        "semantic_similarity": float(matched.get("semantic_similarity", 0.0)),
+        "skill_overlap": float(matched.get("skill_overlap", 0.0)),
+        "ms": {"label": ms_label, "pct": ms_pct},
+        "ss": {"label": ss_label, "pct": ss_pct},
+        "so": {"label": so_label, "pct": so_pct},
+        "jd_skills": jd_sk,
+        "resume_skills": rs_sk,
+        "overlap_skills": overlap,
+        "missing_skills": matched.get("missing_skills", []),
+        "recommendations": matched.get("recommendations", []),
+        "parsed_metrics": matched.get("parsed_metrics", []),
+        "improvements": matched.get("improvements", []),
+        "pages": pages,
+        "chars": chars,
+        "runtime_ms": matched.get("runtime_ms", 0),
+    }
+    # stages skipped under load (app/services/degrade.py)
+    degraded = sorted(set(analysis.get("degraded", ())) | set(matched.get("degraded", ())))
+    if degraded:
+        payload["degraded"] = degraded
+    return payload
+
+
+def new_slug() -> str:
+    """Report slug, generated up front so the share URL is known before anything is written."""
+    return _slug(12)
+
+
+async def get_report(db: AsyncSession, slug: str) -> Optional[Report]:
+    return await db.scalar(select(Report).where(Report.slug == slug))
+
+
+def _report_for(resume: Resume, job: Job, payload: dict, user_id: Optional[int], slug: Optional[str]) -> Report:
+    payload = dict(payload or {})
+    payload["resume_id"] = resume.id
+    return Report(
+        slug=slug or new_slug(),
+        payload=payload,
+        resume_id=resume.id,
+        job_id=job.id,
+        user_id=user_id,
+        **summary_columns(payload, job),
+    )
+
+
+async def save_analysis(
+    db: AsyncSession,
+    resume: Resume,
+    job: Job,
+    payload: dict,
+    user_id: Optional[int] = None,
+    slug: Optional[str] = None,
+) -> Report:
+    """
+    Unit of work for one analysis: resume, job and report are inserted in a
+    single transaction. Ids come from one flush instead of a commit+refresh
+    per row, so this is one commit (one fsync on SQLite) instead of four.
+    """
+    db.add_all([resume, job])
+    await db.flush()
+    rpt = _report_for(resume, job, payload, user_id, slug)
+    db.add(rpt)
+    await db.commit()
+    return rpt
+
+
+def add_analysis(
     db: Session,
+    resume: Resume,
+    job: Job,
     payload: dict,
-    resume_id: int,
-    job_id: int,
-    match_id: Optional[int] = None,   # kept for API compatibility (unused)
     user_id: Optional[int] = None,
+    slug: Optional[str] = None,
 ) -> Report:
-    slug = _slug(12)
-    rpt = Report(
-        slug=slug,
-        payload=payload or {},
-        resume_id=resume_id,
-        job_id=job_id,
-        user_id=user_id,
-    )
-    db.add(rpt); db.commit(); db.refresh(rpt)
+    """`save_analysis` for sync sessions (queue workers), without the commit so the caller can add to the transaction."""
+    db.add_all([resume, job])
+    db.flush()
+    rpt = _report_for(resume, job, payload, user_id, slug)
+    db.add(rpt)
+    db.flush()
     return rpt
 
-def get_report(db: Session, slug: str) -> Optional[Report]:
-    return db.query(Report).filter(Report.slug == slug).first()
 
+async def save_analysis_detached(**kwargs) -> None:
+    """
+    `save_analysis` on its own session, for use as a background task after the
+    response has been sent (the request's session is closed by then).
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await save_analysis(db, **kwargs)
+    except Exception:
+        log.exception("Deferred report write failed (slug=%s)", kwargs.get("slug"))
+
+
+async def list_user_reports(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+) -> Tuple[list, bool, bool]:
+    """
+    Keyset page of a user's reports, newest first, touching only narrow columns.
+
+    `after` / `before` are the id of the last / first row of the page the user
+    came from; its (created_at, id) is looked up in SQL, so the comparison uses
+    the stored representation and no COUNT(*) or OFFSET scan is needed.
+    Returns (rows, has_prev, has_next).
+    """
+    cols = (Report.id, Report.slug, Report.created_at, Report.match_score, Report.title)
+    q = select(*cols).where(Report.user_id == user_id)
+
+    anchor_id = before if before is not None else after
+    if anchor_id is not None:
+        anchor = select(Report.created_at).where(Report.id == anchor_id, Report.user_id == user_id).scalar_subquery()
+        # written as a range on created_at plus a tie-break so the composite index drives the scan
+        if before is not None:
+            q = q.where(Report.created_at >= anchor, or_(Report.created_at > anchor, Report.id > anchor_id))
+        else:
+            q = q.where(Report.created_at <= anchor, or_(Report.created_at < anchor, Report.id < anchor_id))
+
+    if before is not None:
+        q = q.order_by(Report.created_at.asc(), Report.id.asc())
+    else:
+        q = q.order_by(Report.created_at.desc(), Report.id.desc())
+
+    rows = (await db.execute(q.limit(limit + 1))).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before is not None:
+        rows.reverse()
+        return rows, more, True
+    return rows, after is not None, more
+
+
+def backfill_report_summary(db: Session, batch_size: int = 1000, log=print) -> int:
+    """Populate the summary columns (and titles) for reports written before they were set (sync, for the CLI)."""
+    done = 0
+    last = 0
+    while True:
+        rows = db.execute(
+            select(Report.id, Report.payload, Job.title, Job.description)
+            .outerjoin(Job, Job.id == Report.job_id)
+            .where(
+                Report.id > last,
+                or_(
+                    Report.match_score.is_(None),
+                    Report.title.is_(None),
+                    and_(Report.user_id.is_(None), Report.client_ip.is_(None)),
+                ),
+            )
+            .order_by(Report.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return done
+        db.execute(update(Report), [
+            {"id": rid, **summary_columns(payload), "title": report_title(title, description)}
+            for rid, payload, title, description in rows
+        ])
+        db.commit()
+        done += len(rows)
+        last = rows[-1][0]
+        log(f"[migrate] report summary backfilled: {done}")
+
+
+# -------------------- public report cache --------------------
+# A report's payload changes when it is deleted (invalidate_report) or re-scored
+# in place (`python -m app.cli score --out db`, which calls evict_reports). Both
+# drop this process's entries and the shared Redis keys; entries cached in other
+# workers' memory keep the old payload and ETag until REPORT_CACHE_TTL expires.
+payload_cache = TTLCache(maxsize=cfg.report_cache_size, ttl=cfg.report_cache_ttl)
+html_cache = TTLCache(maxsize=cfg.report_html_cache_size, ttl=cfg.report_cache_ttl)
+
+_REDIS_PREFIX = "report:"
+_redis = None
+
+# ETags also change when the app version or the report template changes
+_TEMPLATE = Path(__file__).resolve().parents[1] / "templates" / "index.html"
+_RENDER_VERSION = hashlib.sha1(
+    cfg.api_version.encode() + (_TEMPLATE.read_bytes() if _TEMPLATE.exists() else b"")
+).hexdigest()[:8]
+
+
+def _redis_client():
+    global _redis
+    if _redis is None and cfg.report_cache_redis and cfg.redis_url:
+        import redis.asyncio as aioredis
+        _redis = aioredis.from_url(cfg.redis_url, decode_responses=True)
+    return _redis
+
+
+def payload_etag(payload: dict) -> str:
+    raw = json.dumps(payload or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + _RENDER_VERSION + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+async def get_report_payload(db: AsyncSession, slug: str) -> Optional[Tuple[dict, str]]:
+    """
+    Read-through lookup of a report's (payload, etag): in-process LRU, then
+    Redis (REPORT_CACHE_REDIS), then the database. Misses are not cached, so
+    a report whose deferred write is still in flight shows up on the next try.
+    """
+    hit = payload_cache.get(slug)
+    if hit is not None:
+        return hit
+
+    r = _redis_client()
+    if r is not None:
+        try:
+            raw = await r.get(_REDIS_PREFIX + slug)
+            if raw:
+                payload = json.loads(raw)
+                entry = (payload, payload_etag(payload))
+                payload_cache.set(slug, entry)
+                return entry
+        except Exception:
+            log.warning("report cache: redis get failed", exc_info=True)
+
+    rpt = await get_report(db, slug)
+    if not rpt:
+        return None
+    payload = rpt.payload or {}
+    entry = (payload, payload_etag(payload))
+    payload_cache.set(slug, entry)
+    if r is not None:
+        try:
+            await r.set(_REDIS_PREFIX + slug, json.dumps(payload, default=str), ex=cfg.report_cache_ttl)
+        except Exception:
+            log.warning("report cache: redis set failed", exc_info=True)
+    return entry
+
+
+async def invalidate_report(slug: str) -> None:
+    payload_cache.delete(slug)
+    html_cache.delete_where(lambda k: isinstance(k, tuple) and k and k[0] == slug)
+    r = _redis_client()
+    if r is not None:
+        try:
+            await r.delete(_REDIS_PREFIX + slug)
+        except Exception:
+            log.warning("report cache: redis delete failed", exc_info=True)
+
+
+def evict_reports(slugs: Iterable[str]) -> None:
+    """
+    invalidate_report for many slugs, without an event loop: for offline jobs
+    that rewrite payloads in place. Other workers' in-process entries are
+    bounded by REPORT_CACHE_TTL only.
+    """
+    slugs = set(slugs)
+    if not slugs:
+        return
+    for slug in slugs:
+        payload_cache.delete(slug)
+    html_cache.delete_where(lambda k: isinstance(k, tuple) and k and k[0] in slugs)
+    if not (cfg.report_cache_redis and cfg.redis_url):
+        return
+    try:
+        import redis
+
+        client = redis.Redis.from_url(cfg.redis_url)
+        try:
+            client.delete(*(_REDIS_PREFIX + slug for slug in slugs))
+        finally:
+            client.close()
+    except Exception:
+        log.warning("report cache: redis delete failed", exc_info=True)
+
+
+async def delete_report(db: AsyncSession, slug: str) -> bool:
+    """Delete a report and drop it from every cache layer."""
+    res = await db.execute(delete(Report).where(Report.slug == slug))
+    await db.commit()
+    await invalidate_report(slug)
+    return bool(res.rowcount)
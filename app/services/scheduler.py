@@ -0,0 +1,209 @@
+# app/services/scheduler.py
+"""
+Fair admission for in-request analyses (/ui-match, /ui-match/stream).
+
+At most ANALYSIS_CONCURRENCY analyses run at once in a web process, and
+each subject (a signed-in user, or an anonymous IP) has its own in-flight
+cap by tier (ANALYSIS_PER_ANON / _FREE / _PREMIUM). Requests beyond either
+limit wait in a per-subject queue. When a slot frees up, it goes to the
+waiting subject with the fewest analyses in flight (among those under their
+cap), ties broken round-robin: a subject that was served moves to the back
+of the line. So one user firing 15 uploads gets
+their share of the slots, not all of them.
+
+Requests are shed instead of queued:
+  429  the subject already has ANALYSIS_QUEUE_PER_SUBJECT requests waiting
+  503  ANALYSIS_QUEUE_MAX requests are waiting in total, or this one waited
+       ANALYSIS_QUEUE_TIMEOUT seconds without getting a slot
+
+Admission (`admit`) is synchronous, so routes can answer 429/503 before a
+streaming response starts. Waiting for the slot and releasing it go through
+the returned Ticket (`async with ticket:`). The limits apply per process,
+like the other in-process state here. The queued analyses in
+app/services/analysis_jobs.py are bounded by their worker threads instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings as cfg
+
+TIERS = ("anon", "free", "premium")
+
+
+class Shed(Exception):
+    """The request is refused instead of queued; `status` is 429 or 503."""
+
+    def __init__(self, status: int, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+def per_subject(tier: str) -> int:
+    return max(1, {
+        "anon": cfg.analysis_per_anon,
+        "free": cfg.analysis_per_free,
+        "premium": cfg.analysis_per_premium,
+    }.get(tier, cfg.analysis_per_anon))
+
+
+class Ticket:
+    QUEUED, RUNNING, DONE = "queued", "running", "done"
+
+    def __init__(self, scheduler: "FairScheduler", subject: str, tier: str):
+        self.scheduler = scheduler
+        self.subject = subject
+        self.tier = tier
+        self.state = self.QUEUED
+        self.enqueued = time.perf_counter()
+        self.waited_ms = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._granted: Optional[asyncio.Future] = None
+
+    async def wait(self) -> None:
+        """Until this ticket holds a slot; Shed(503) after ANALYSIS_QUEUE_TIMEOUT."""
+        if self.state != self.QUEUED:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._granted), cfg.analysis_queue_timeout or None)
+        except asyncio.TimeoutError:
+            self.release()
+            self.scheduler._count(self.tier, "timed_out")
+            raise Shed(503, "The server is busy; please try again in a moment.", retry_after=10)
+        except BaseException:
+            self.release()  # cancelled (client gone) while waiting, or granted just now
+            raise
+
+    def release(self) -> None:
+        """Give the slot (or the queue place) back; safe to call more than once."""
+        self.scheduler._release(self)
+
+    async def __aenter__(self) -> "Ticket":
+        await self.wait()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
+
+
+class FairScheduler:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+        self._running: Dict[str, int] = {}
+        self._waiting: "OrderedDict[str, Deque[Ticket]]" = OrderedDict()  # round-robin order of subjects
+        self._queued = 0
+        self._waits: Deque[float] = deque(maxlen=1000)  # ms, recent admissions
+        self._tiers = {t: {"in_flight": 0, "peak": 0, "admitted": 0, "queued": 0,
+                           "shed_429": 0, "shed_503": 0, "timed_out": 0} for t in TIERS}
+
+    def _count(self, tier: str, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._tiers.setdefault(tier, {k: 0 for k in self._tiers["anon"]})[key] += n
+
+    def _start(self, t: Ticket) -> None:
+        # caller holds the lock
+        t.state = Ticket.RUNNING
+        t.waited_ms = (time.perf_counter() - t.enqueued) * 1000
+        self._active += 1
+        self._running[t.subject] = self._running.get(t.subject, 0) + 1
+        self._waits.append(t.waited_ms)
+        tier = self._tiers[t.tier]
+        tier["admitted"] += 1
+        tier["in_flight"] += 1
+        tier["peak"] = max(tier["peak"], tier["in_flight"])
+
+    def _grant_next(self) -> None:
+        # caller holds the lock: hand free slots to waiting subjects, round-robin
+        while self._active < cfg.analysis_concurrency and self._waiting:
+            eligible = [s for s, q in self._waiting.items() if self._running.get(s, 0) < per_subject(q[0].tier)]
+            if not eligible:
+                return  # every waiting subject is at its own cap
+            # fewest in flight first; ties go by round-robin order (min keeps the first)
+            subject = min(eligible, key=lambda s: self._running.get(s, 0))
+            queue = self._waiting[subject]
+            t = queue.popleft()
+            self._queued -= 1
+            del self._waiting[subject]
+            if queue:
+                self._waiting[subject] = queue  # back of the line
+            self._start(t)
+            t._loop.call_soon_threadsafe(_resolve, t._granted)
+
+    def admit(self, subject: str, tier: str) -> Ticket:
+        """A ticket that runs now or waits its turn; raises Shed when the queues are full."""
+        t = Ticket(self, subject, tier)
+        with self._lock:
+            if tier not in self._tiers:
+                tier = t.tier = "anon"
+            free = self._active < cfg.analysis_concurrency and self._running.get(subject, 0) < per_subject(tier)
+            if free and not self._waiting.get(subject):
+                self._start(t)
+                return t
+            if len(self._waiting.get(subject, ())) >= cfg.analysis_queue_per_subject:
+                self._tiers[tier]["shed_429"] += 1
+                raise Shed(429, "You already have analyses running; wait for them to finish.")
+            if self._queued >= cfg.analysis_queue_max:
+                self._tiers[tier]["shed_503"] += 1
+                raise Shed(503, "The server is busy; please try again in a moment.", retry_after=30)
+            t._loop = asyncio.get_running_loop()
+            t._granted = t._loop.create_future()
+            self._waiting.setdefault(subject, deque()).append(t)
+            self._queued += 1
+            self._tiers[tier]["queued"] += 1
+        return t
+
+    def _release(self, t: Ticket) -> None:
+        with self._lock:
+            if t.state == Ticket.RUNNING:
+                self._active -= 1
+                left = self._running.get(t.subject, 1) - 1
+                if left:
+                    self._running[t.subject] = left
+                else:
+                    self._running.pop(t.subject, None)
+                self._tiers[t.tier]["in_flight"] -= 1
+            elif t.state == Ticket.QUEUED:
+                queue = self._waiting.get(t.subject)
+                if queue is not None and t in queue:
+                    queue.remove(t)
+                    self._queued -= 1
+                    if not queue:
+                        del self._waiting[t.subject]
+            t.state = Ticket.DONE
+            self._grant_next()
+
+    def queue_depth(self) -> int:
+        """Analyses waiting for a slot right now (see app/services/degrade.py)."""
+        return self._queued
+
+    def stats(self) -> dict:
+        """Slots, queue and wait times, plus per-tier counters, for /metricsz."""
+        with self._lock:
+            waits = sorted(self._waits)
+            out = {
+                "capacity": cfg.analysis_concurrency,
+                "active": self._active,
+                "queued": self._queued,
+                "waiting_subjects": len(self._waiting),
+                "tiers": {k: dict(v, cap=per_subject(k)) for k, v in self._tiers.items()},
+            }
+        out["wait_ms_p50"] = round(statistics.median(waits), 2) if waits else 0.0
+        out["wait_ms_p95"] = round(waits[int(0.95 * (len(waits) - 1))], 2) if waits else 0.0
+        return out
+
+
+def _resolve(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+scheduler = FairScheduler()
+stats = scheduler.stats
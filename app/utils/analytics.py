@@ -0,0 +1,196 @@
+# app/utils/analytics.py
+"""
+Product analytics off the request path.
+
+`capture` only appends a tuple to a bounded in-process queue. A daemon
+thread drains it in batches into a sink: PostHog's batch endpoint, or a
+JSONL file (ANALYTICS_FILE) for local runs and tests. When the queue is
+full, events are dropped and counted rather than slowing the request down.
+`shutdown` flushes whatever is still queued.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings as cfg
+
+log = logging.getLogger(__name__)
+
+# (unix time, distinct id, event, properties)
+Event = Tuple[float, str, str, dict]
+
+
+def _message(ev: Event) -> dict:
+    ts, ident, event, props = ev
+    return {
+        "event": event,
+        "distinct_id": ident,
+        "properties": {**props, "$lib": "resume-analyzer", "$geoip_disable": True},
+        "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+    }
+
+
+class FileSink:
+    """Appends one JSON object per event to a local file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def send(self, batch: List[Event]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            for ev in batch:
+                f.write(json.dumps(_message(ev), default=str) + "\n")
+
+
+class PostHogSink:
+    """One POST to PostHog's /batch endpoint per batch."""
+
+    def __init__(self, api_key: str, host: str, timeout: float = 10.0):
+        self.api_key, self.host, self.timeout = api_key, host, timeout
+
+    def send(self, batch: List[Event]) -> None:
+        from posthog.request import batch_post
+
+        batch_post(self.api_key, self.host, timeout=self.timeout, batch=[_message(ev) for ev in batch])
+
+
+class EventQueue:
+    def __init__(self, sink, maxsize: int = 10000, batch_size: int = 100, flush_interval: float = 2.0):
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._q: "queue.Queue[Event]" = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.enqueued = self.dropped = self.sent = self.failed = self.batches = 0
+
+    def start(self) -> "EventQueue":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="analytics-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def put(self, ident: str, event: str, props: Optional[dict] = None) -> bool:
+        try:
+            self._q.put_nowait((time.time(), ident, event, props or {}))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def _drain(self, limit: int) -> List[Event]:
+        batch: List[Event] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._q.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _send(self, batch: List[Event]) -> None:
+        try:
+            self.sink.send(batch)
+            self.sent += len(batch)
+        except Exception:
+            self.failed += len(batch)
+            log.warning("Analytics batch of %d events failed", len(batch), exc_info=True)
+        self.batches += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # wait for the first event, then give the batch up to flush_interval to fill
+            try:
+                first = self._q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=min(remaining, 0.05)))
+                except queue.Empty:
+                    continue
+            self._send(batch)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the flusher and send everything still queued (bounded by `timeout`)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            self._send(batch)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._q.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+# -------------------- process-wide queue --------------------
+_queue: Optional[EventQueue] = None
+_lock = threading.Lock()
+
+
+def _build_sink():
+    if cfg.analytics_file:
+        return FileSink(cfg.analytics_file)
+    if cfg.posthog_key:
+        return PostHogSink(cfg.posthog_key, cfg.posthog_host)
+    return None
+
+
+def get_event_queue() -> Optional[EventQueue]:
+    """The shared queue, started on first use; None when analytics is not configured."""
+    global _queue
+    if _queue is None:
+        with _lock:
+            if _queue is None:
+                sink = _build_sink()
+                if sink is None:
+                    return None
+                _queue = EventQueue(
+                    sink,
+                    maxsize=cfg.analytics_queue_size,
+                    batch_size=cfg.analytics_batch_size,
+                    flush_interval=cfg.analytics_flush_interval,
+                ).start()
+    return _queue
+
+
+def capture(ident: str, event: str, props: Optional[dict] = None) -> bool:
+    q = get_event_queue()
+    return q.put(ident, event, props) if q is not None else False
+
+
+def stats() -> dict:
+    return _queue.stats() if _queue is not None else {"enabled": False}
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    global _queue
+    with _lock:
+        if _queue is not None:
+            _queue.close(timeout)
+            _queue = None
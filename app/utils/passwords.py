@@ -1,23 +1,109 @@
 # app/utils/passwords.py
+"""
+The one place passwords are hashed and verified.
+
+Argon2 is deliberately slow (~100-200 ms of CPU per call), so request
+handlers use the async functions: work runs on a small dedicated thread
+pool (argon2-cffi releases the GIL), at most PASSWORD_WORKERS calls run at
+once, and a caller that cannot get a slot within PASSWORD_QUEUE_TIMEOUT
+gets PasswordServiceBusy instead of piling up behind a login flood.
+The sync functions remain for scripts and the CLI.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-# Prefer Argon2, but also recognize older hashes if they exist.
+from app.core.config import settings as cfg
+
+# Prefer Argon2, but also recognize older hashes if they exist. Hashes made with
+# other schemes or other Argon2 parameters are upgraded on the next login.
 _pwd = CryptContext(
     schemes=["argon2", "bcrypt_sha256", "bcrypt"],
     default="argon2",
     deprecated="auto",
+    argon2__rounds=cfg.password_time_cost,
+    argon2__memory_cost=cfg.password_memory_cost,
+    argon2__parallelism=cfg.password_parallelism,
 )
 
+_MAX_LEN = 4096
+
+
+class PasswordServiceBusy(Exception):
+    """No hashing slot became free within PASSWORD_QUEUE_TIMEOUT."""
+
+
+def _clean(raw: str) -> str:
+    # Cap absurdly long inputs (defense-in-depth)
+    return (raw or "").strip()[:_MAX_LEN]
+
 def hash_password(raw: str) -> str:
-    raw = (raw or "").strip()
+    raw = _clean(raw)
     if len(raw) < 8:
         raise ValueError("Password must be at least 8 characters")
-    # Cap absurdly long inputs (defense-in-depth)
-    if len(raw) > 4096:
-        raw = raw[:4096]
     return _pwd.hash(raw)
 
 def verify_password(raw: str, hashed: str) -> bool:
-    raw = (raw or "").strip()
-    return _pwd.verify(raw, hashed or "")
+    return _pwd.verify(_clean(raw), hashed or "")
+
+def verify_and_update(raw: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(ok, new_hash); new_hash is set when the stored hash uses outdated parameters."""
+    if not hashed:
+        return False, None
+    return _pwd.verify_and_update(_clean(raw), hashed)
+
+
+# -------------------- async (request path) --------------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# asyncio.Semaphore is bound to the loop it is first used on
+_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_stats = {"calls": 0, "busy": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=cfg.password_workers, thread_name_prefix="pwhash")
+    return _executor
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    sem = _slots.get(loop)
+    if sem is None:
+        sem = _slots[loop] = asyncio.Semaphore(cfg.password_workers)
+    try:
+        await asyncio.wait_for(sem.acquire(), timeout=cfg.password_queue_timeout)
+    except asyncio.TimeoutError:
+        _stats["busy"] += 1
+        raise PasswordServiceBusy() from None
+    try:
+        _stats["calls"] += 1
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        sem.release()
+
+async def hash_password_async(raw: str) -> str:
+    return await _run(hash_password, raw)
+
+async def verify_and_update_async(raw: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return await _run(verify_and_update, raw, hashed)
+
+def stats() -> dict:
+    waiting = sum(len(getattr(s, "_waiters", None) or ()) for s in list(_slots.values()))
+    return {**_stats, "workers": cfg.password_workers, "waiting": waiting}
 
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -1,7 +1,6 @@
-from pypdf import PdfReader
-
-
 def extract_pdf_text(file) -> tuple[str, int, int]:
+	from pypdf import PdfReader  # imported on first upload, not at startup
+
 	reader = PdfReader(file)
 	pages = len(reader.pages)
 	text = []
@@ -0,0 +1,92 @@
+# app/utils/static.py
+"""
+Fingerprinted, precompressed static assets (/images).
+
+Templates link assets through `asset_url("logo.png")`, which returns
+"/images/logo.<hash>.png" with a hash of the file's content. Those URLs never
+change meaning, so they are served with
+`Cache-Control: public, max-age=STATIC_MAX_AGE, immutable` and browsers stop
+revalidating them; a new file gets a new URL. The plain name keeps working
+for old links with a short max-age.
+
+Text assets (svg, css, js, ...) are gzip- and, with the `brotli` package,
+brotli-compressed once when the directory is scanned and sent with the
+matching Content-Encoding. Images that are already compressed (png, jpg,
+webp) are sent as they are.
+"""
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+from typing import Dict, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.config import settings
+from app.middleware.compression import CODINGS, accepted, compress, compressible
+
+PLAIN_MAX_AGE = 3600  # seconds, un-fingerprinted URLs
+
+
+class FingerprintedStatic(StaticFiles):
+    def __init__(self, directory: str, prefix: str) -> None:
+        super().__init__(directory=directory)
+        self.prefix = prefix.rstrip("/")
+        self._urls: Dict[str, str] = {}      # "logo.png" -> "logo.<hash>.png"
+        self._names: Dict[str, Tuple[str, str]] = {}  # "logo.<hash>.png" -> ("logo.png", hash)
+        self._encoded: Dict[Tuple[str, str], bytes] = {}  # (name, coding) -> body
+        self.scan()
+
+    def scan(self) -> None:
+        """Hash (and precompress) every file under the directory; call again after assets change."""
+        urls, names, encoded = {}, {}, {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                full = os.path.join(root, filename)
+                name = os.path.relpath(full, self.directory).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    data = f.read()
+                stem, ext = os.path.splitext(name)
+                digest = hashlib.sha256(data).hexdigest()[:12]
+                urls[name] = f"{stem}.{digest}{ext}"
+                names[urls[name]] = (name, digest)
+                if compressible(mimetypes.guess_type(name)[0] or "") and len(data) >= settings.compress_min_bytes > 0:
+                    for coding in CODINGS:
+                        encoded[(name, coding)] = compress(data, coding)
+        self._urls, self._names, self._encoded = urls, names, encoded
+
+    def url(self, name: str) -> str:
+        """The URL to put in a page for the asset `name` (fingerprinted when the file exists)."""
+        return f"{self.prefix}/{self._urls.get(name, name)}"
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        name, digest = self._names.get(path.replace(os.sep, "/"), (None, None))
+        if name is None:
+            response = await super().get_response(path, scope)
+            response.headers.setdefault("Cache-Control", f"public, max-age={PLAIN_MAX_AGE}")
+            return response
+
+        cache = f"public, max-age={settings.static_max_age}, immutable"
+        request_headers = Headers(scope=scope)
+        coding = accepted(request_headers.get("accept-encoding", ""))
+        body = self._encoded.get((name, coding)) if coding else None
+        if body is None:
+            response = await super().get_response(name, scope)
+            response.headers["Cache-Control"] = cache
+            if (name, CODINGS[-1]) in self._encoded:
+                response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        # the precompressed variant; the fingerprint is the validator
+        headers = {"Cache-Control": cache, "Content-Encoding": coding, "ETag": f'W/"{digest}"', "Vary": "Accept-Encoding"}
+        if self.is_not_modified(Headers({"etag": f'"{digest}"'}), request_headers):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type=mimetypes.guess_type(name)[0], headers=headers)
+
+
+images = FingerprintedStatic(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), "images"), prefix="/images")
+asset_url = images.url
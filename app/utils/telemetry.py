@@ -0,0 +1,30 @@
+# app/utils/telemetry.py
+"""
+Registry of in-process counters exposed on /metricsz.
+
+Modules register a zero-argument callable returning a dict; `snapshot`
+calls each one, so values are always current and nothing is sampled.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict
+
+log = logging.getLogger(__name__)
+
+_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, fn: Callable[[], dict]) -> None:
+    _sources[name] = fn
+
+
+def snapshot() -> Dict[str, dict]:
+    out: Dict[str, dict] = {}
+    for name, fn in list(_sources.items()):
+        try:
+            out[name] = fn()
+        except Exception as e:
+            log.warning("Telemetry source %s failed: %s", name, e)
+            out[name] = {"error": str(e)}
+    return out
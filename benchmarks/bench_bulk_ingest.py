@@ -0,0 +1,103 @@
+# benchmarks/bench_bulk_ingest.py
+"""
+Job ingestion throughput: one POST /jobs per document vs. POST /jobs/bulk.
+
+  single   N requests to POST /jobs, one commit each
+  bulk     one POST /jobs/bulk with N NDJSON lines, sent in 64 KB chunks
+           while the results stream back (BULK_BATCH_SIZE rows per commit)
+
+Feature precomputation is switched off for the run so only ingestion is
+timed. Reports documents per minute and, for bulk, the tracemalloc peak,
+which should stay flat as N grows (one batch plus one line in memory).
+
+    python -m benchmarks.bench_bulk_ingest --docs 2000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import List
+
+from benchmarks.harness import DEMO_JD, boot_app, resolve_database_url, running
+
+CHUNK = 64 * 1024
+
+
+async def call(app, method: str, path: str, headers: list, body: bytes) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench"), *headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    pos = 0
+    out: List[bytes] = []
+
+    async def receive():
+        nonlocal pos
+        if pos >= len(body) and pos:
+            await asyncio.sleep(3600)
+            return {"type": "http.disconnect"}
+        chunk = body[pos:pos + CHUNK]
+        pos += max(len(chunk), 1)
+        return {"type": "http.request", "body": chunk, "more_body": pos < len(body)}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            out.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(out)
+
+
+async def run(args) -> None:
+    app = boot_app(resolve_database_url(args.db), rate_limit=False)
+    from app.core.config import settings
+    from app.routes import jobs
+
+    jobs.precompute = lambda *ids: None
+    settings.api_key = settings.api_key or "bench-key"  # the API is closed without one
+    key = [(b"x-api-key", settings.api_key.encode())]
+
+    async with running(app):
+        print(f"# batch size {settings.bulk_batch_size}")
+        print(f"{'docs':>7} {'mode':<7} {'seconds':>8} {'docs/min':>10} {'peak MB':>8}")
+        for n in args.docs:
+            docs = [{"title": f"Backend #{i}", "description": f"{DEMO_JD}\nReq {i}"} for i in range(n)]
+
+            if n <= args.single_max:
+                t0 = time.perf_counter()
+                for d in docs:
+                    body = json.dumps(d).encode()
+                    await call(app, "POST", "/jobs", key + [(b"content-type", b"application/json"),
+                                                         (b"content-length", str(len(body)).encode())], body)
+                s = time.perf_counter() - t0
+                print(f"{n:>7} {'single':<7} {s:>8.2f} {n / s * 60:>10.0f} {'':>8}")
+
+            body = b"".join(json.dumps(d).encode() + b"\n" for d in docs)
+            del docs
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            t0 = time.perf_counter()
+            out = await call(app, "POST", "/jobs/bulk", key + [(b"content-type", b"application/x-ndjson")], body)
+            s = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1] - base - len(out)  # the collected response is the bench's, not the app's
+            tracemalloc.stop()
+            summary = json.loads(out.splitlines()[-1])
+            assert summary["created"] == n, summary
+            print(f"{n:>7} {'bulk':<7} {s:>8.2f} {n / s * 60:>10.0f} {peak / 1e6:>8.1f}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="sqlite", help="sqlite | postgres | auto | SQLAlchemy URL")
+    p.add_argument("--docs", type=int, nargs="+", default=[2000, 10000])
+    p.add_argument("--single-max", type=int, default=2000, help="skip the one-per-request run above this size")
+    asyncio.run(run(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
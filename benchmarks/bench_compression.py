@@ -0,0 +1,85 @@
+# benchmarks/bench_compression.py
+"""
+Bytes on the wire and p50 latency of the landing and report pages.
+
+  before      compression off (COMPRESS_MIN_BYTES=0), no validators sent:
+              what every view cost before the response layer
+  gzip        Accept-Encoding: gzip (br too, with the `brotli` package)
+  revalidate  a repeat view: If-None-Match with the ETag from the last
+              response, answered 304 (report pages only; the landing page
+              varies per visitor and has no validator)
+
+Bytes are the response body as sent (compressed size, not decoded size).
+Also prints the logo's cache policy: fingerprinted URLs are immutable, so a
+repeat view does not ask for it at all.
+
+    python -m benchmarks.bench_compression --requests 300
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_report_reads import seed_reports
+from benchmarks.harness import boot_app, resolve_database_url, running, summarize
+
+
+async def measure(client: httpx.AsyncClient, path: str, n: int, headers: Dict[str, str]) -> dict:
+    lat: List[float] = []
+    size = 0
+    status = 0
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = await client.get(path, headers=headers)
+        lat.append((time.perf_counter() - t0) * 1000.0)
+        size, status = r.num_bytes_downloaded, r.status_code
+    return {"bytes": size, "status": status, **summarize(lat)}
+
+
+async def amain(args) -> None:
+    app = boot_app(resolve_database_url(args.db), rate_limit=False)
+    from app.core.config import settings
+    from app.utils.static import asset_url
+
+    async with running(app):
+        slug = seed_reports(1)[0]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            enabled = settings.compress_min_bytes
+            encodings = "br, gzip" if args.brotli else "gzip"
+            print(f"# {args.requests} sequential requests per row; Accept-Encoding: {encodings}")
+            print(f"{'page':<8} {'mode':<11} {'status':>6} {'bytes':>8} {'p50 ms':>8} {'p95 ms':>8}")
+            for page, path in (("landing", "/"), ("report", f"/r/{slug}")):
+                await measure(client, path, 20, {})  # warm-up: templates, caches
+
+                settings.compress_min_bytes = 0
+                rows = [("before", await measure(client, path, args.requests, {"Accept-Encoding": "identity"}))]
+                settings.compress_min_bytes = enabled
+                after = await measure(client, path, args.requests, {"Accept-Encoding": encodings})
+                rows.append(("gzip" if not args.brotli else "br/gzip", after))
+                etag: Optional[str] = (await client.get(path, headers={"Accept-Encoding": encodings})).headers.get("etag")
+                if etag:
+                    rows.append(("revalidate", await measure(
+                        client, path, args.requests, {"Accept-Encoding": encodings, "If-None-Match": etag})))
+                for mode, r in rows:
+                    print(f"{page:<8} {mode:<11} {r['status']:>6} {r['bytes']:>8} {r['p50']:>8.2f} {r['p95']:>8.2f}")
+
+            for url in ("/images/logo.png", asset_url("logo.png")):
+                r = await client.get(url)
+                print(f"# {url}: Cache-Control: {r.headers.get('cache-control')}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="sqlite", help="sqlite | postgres | auto | SQLAlchemy URL")
+    p.add_argument("--requests", type=int, default=300)
+    p.add_argument("--brotli", action="store_true", help="offer br as well (needs the brotli package)")
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
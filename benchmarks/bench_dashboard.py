@@ -0,0 +1,133 @@
+# benchmarks/bench_dashboard.py
+"""
+/dashboard page load for a user with many reports (default 50k).
+
+Compares the previous query shape (COUNT(*) + ORDER BY created_at OFFSET/LIMIT
+loading full payloads) with the keyset query over narrow columns, at the first
+page and deep into the history, and times the real /dashboard route.
+
+    python -m benchmarks.bench_dashboard --reports 50000
+    python -m benchmarks.bench_dashboard --db postgres
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks.bench_report_reads import SAMPLE_PAYLOAD
+from benchmarks.harness import boot_app, resolve_database_url, running, summarize
+
+PAGE = 20
+
+
+def seed(n: int) -> int:
+    from sqlalchemy import insert
+    from app.db.models import Job, Report, Resume, User
+    from app.db.session import SessionLocal
+    from app.services.report_service import summary_columns
+    from app.utils.passwords import hash_password
+
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", name="bench", password_hash=hash_password("benchmark-pw"))
+        resume = Resume(filename="bench.pdf", text="python " * 100)
+        job = Job(title="Bench JD", description="python " * 30)
+        db.add_all([user, resume, job]); db.flush()
+        # a realistic payload is a few KB of JSON
+        payload = dict(SAMPLE_PAYLOAD, recommendations=SAMPLE_PAYLOAD["recommendations"] * 20)
+        t0 = datetime.now(timezone.utc) - timedelta(days=365)
+        batch = []
+        for i in range(n):
+            batch.append({
+                "slug": f"dash{i:08d}", "payload": payload, "resume_id": resume.id, "job_id": job.id,
+                "user_id": user.id, "created_at": t0 + timedelta(seconds=i * 30), **summary_columns(payload),
+            })
+            if len(batch) == 5000:
+                db.execute(insert(Report), batch); batch = []
+        if batch:
+            db.execute(insert(Report), batch)
+        db.commit()
+        return user.id
+
+
+async def time_query(fn, repeat: int) -> dict:
+    from app.db.session import AsyncSessionLocal
+    lat = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            t0 = time.perf_counter()
+            await fn(db)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+    return summarize(lat)
+
+
+async def amain(args) -> None:
+    from sqlalchemy import func, select
+
+    db_url = resolve_database_url(args.db)
+    app = boot_app(db_url, rate_limit=False)
+    async with running(app):
+        from app.db.migrate import sync_schema
+        from app.db.models import Report
+        from app.db.session import AsyncSessionLocal, engine
+        from app.services.report_service import list_user_reports
+
+        sync_schema(engine)
+        uid = seed(args.reports)
+        deep_offset = args.reports - 2 * PAGE
+
+        async def legacy(db, offset):
+            await db.scalar(select(func.count(Report.id)).where(Report.user_id == uid))
+            rows = (await db.scalars(
+                select(Report).where(Report.user_id == uid)
+                .order_by(Report.created_at.desc().nullslast()).offset(offset).limit(PAGE)
+            )).all()
+            return [(r.payload or {}).get("match_score") for r in rows]
+
+        async with AsyncSessionLocal() as db:
+            # id of the row just before the deep page, as a cursor
+            deep_anchor = (await db.execute(
+                select(Report.id).where(Report.user_id == uid)
+                .order_by(Report.created_at.desc(), Report.id.desc()).offset(deep_offset - 1).limit(1)
+            )).scalar_one()
+
+        cases = [
+            ("offset p1", lambda db: legacy(db, 0)),
+            ("offset deep", lambda db: legacy(db, deep_offset)),
+            ("keyset p1", lambda db: list_user_reports(db, uid, PAGE)),
+            ("keyset deep", lambda db: list_user_reports(db, uid, PAGE, after=deep_anchor)),
+        ]
+        print(f"# dashboard query  db={db_url.split('://', 1)[0]}  reports={args.reports}  page={PAGE}")
+        print(f"{'case':<12} {'mean':>8} {'p50':>8} {'p95':>8}  (ms)")
+        for name, fn in cases:
+            await time_query(fn, 1)  # warm-up
+            s = await time_query(fn, args.repeat)
+            print(f"{name:<12} {s['mean']:>8.2f} {s['p50']:>8.2f} {s['p95']:>8.2f}")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/login/password", data={"email": "bench@example.com", "password": "benchmark-pw"})
+            for name, url in (("GET p1", "/dashboard"), ("GET deep", f"/dashboard?after={deep_anchor}")):
+                lat = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    r = await client.get(url)
+                    lat.append((time.perf_counter() - t0) * 1000.0)
+                    assert r.status_code == 200, r.status_code
+                s = summarize(lat)
+                print(f"{name:<12} {s['mean']:>8.2f} {s['p50']:>8.2f} {s['p95']:>8.2f}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="auto")
+    p.add_argument("--reports", type=int, default=50000)
+    p.add_argument("--repeat", type=int, default=20)
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
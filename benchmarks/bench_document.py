@@ -0,0 +1,140 @@
+# benchmarks/bench_document.py
+"""
+Text passes per /ui-match analysis: separate per-service passes vs. one
+shared Document.
+
+  separate   what analyze_resume + match_resume_job used to do: clean both
+             texts, extract_skills(resume) in analyze, resume.split(), then
+             embed each text and extract_skills on both again in match
+  document   the same stages over one Document per input (app/nlp/document.py)
+
+Reports, per analysis, the tracemalloc peak, the transient bytes summed over
+stages (peak above the starting size of each stage; the stages' big
+temporaries are what the shared Document avoids rebuilding), and wall time
+without tracing. Model internals are native and not traced.
+
+    python -m benchmarks.bench_document --pages 10
+    python -m benchmarks.bench_document --no-embed     # text passes only
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from benchmarks.harness import DEMO_JD, DEMO_RESUME
+
+
+def large_resume(pages: int, seed: int = 3) -> str:
+    """~6 KB of resume-like text per page, with CRs as PDF extraction often leaves them."""
+    rng = random.Random(seed)
+    lines = [l for l in DEMO_RESUME.splitlines() if l.strip()]
+    out = []
+    while sum(len(l) for l in out) < pages * 6000:
+        line = rng.choice(lines)
+        if rng.random() < 0.3:
+            line = f"{line} Improved p95 latency by {rng.randint(5, 80)}% for {rng.randint(2, 90)}k users."
+        out.append(line + "\r")
+    return "\n".join(out)
+
+
+def _noop() -> None:
+    pass
+
+
+def separate(resume: str, jd: str, with_embed: bool, mark: Callable[[], None] = _noop) -> None:
+    from app.nlp.embeddings import embed
+    from app.nlp.skills_extractor import extract_skills
+
+    def clean(s: str) -> str:
+        return (s or "").encode("utf-8", "ignore").decode("utf-8", "ignore").replace("\r", "")
+
+    r, j = clean(resume), clean(jd)
+    mark()
+    sorted(set(extract_skills(r)))          # analyze_resume
+    mark()
+    len(r.split())
+    mark()
+    if with_embed:                          # match_resume_job
+        embed(r)
+        embed(j)
+        mark()
+    extract_skills(r)
+    mark()
+    extract_skills(j)
+    mark()
+
+
+def document(resume: str, jd: str, with_embed: bool, mark: Callable[[], None] = _noop) -> None:
+    from app.nlp.document import Document, embed_documents
+
+    rd, jdoc = Document(resume), Document(jd)
+    rd.cleaned, jdoc.cleaned
+    mark()
+    rd.skills                               # analyze_resume
+    mark()
+    len(rd.tokens)
+    mark()
+    if with_embed:                          # match_resume_job
+        embed_documents(rd, jdoc)
+        mark()
+    rd.skills
+    mark()
+    jdoc.skills
+    mark()
+
+
+def traced(fn: Callable[[Callable[[], None]], None]) -> tuple:
+    """(peak bytes, transient bytes summed over stages) for one call; fn calls `mark` after each stage."""
+    transient = 0
+    peak = 0
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    def mark() -> None:
+        nonlocal transient, peak, start
+        current, stage_peak = tracemalloc.get_traced_memory()
+        transient += stage_peak - start
+        peak = max(peak, stage_peak)
+        tracemalloc.reset_peak()
+        start = current
+
+    fn(mark)
+    tracemalloc.stop()
+    return peak, transient
+
+
+def timed(fn: Callable[[], None], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(times)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--pages", type=int, default=10)
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--no-embed", action="store_true", help="skip the embedding model (text passes only)")
+    args = p.parse_args()
+
+    resume, jd = large_resume(args.pages), DEMO_JD * 4
+    with_embed = not args.no_embed
+    for fn in (separate, document):  # warm-up: model load, skills dictionary
+        fn(resume, jd, with_embed)
+
+    print(f"# one analysis  resume={len(resume) / 1e3:.0f} KB  embed={'on' if with_embed else 'off'}")
+    print(f"{'pipeline':<10} {'peak KB':>9} {'stages KB':>10} {'median ms':>10}")
+    for name, fn in (("separate", separate), ("document", document)):
+        peak, transient = traced(lambda mark: fn(resume, jd, with_embed, mark))
+        ms = timed(lambda: fn(resume, jd, with_embed), args.repeat)
+        print(f"{name:<10} {peak / 1e3:>9.0f} {transient / 1e3:>10.0f} {ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
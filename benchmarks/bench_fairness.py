@@ -0,0 +1,87 @@
+# benchmarks/bench_fairness.py
+"""
+Queue wait of light users while one user floods the analysis endpoint.
+
+One "heavy" user fires --burst analyses at once; --light other users each
+send one shortly after. Every analysis holds a slot for --service-ms
+(a stand-in for the pipeline, which runs in a thread). Compared:
+
+  fifo   an asyncio.Semaphore(ANALYSIS_CONCURRENCY): first come, first served
+  fair   app/services/scheduler.py with the configured per-subject caps
+
+Reports wait p50/p95 for light users and for the heavy user's requests, and
+how many requests were shed (429/503).
+
+    python -m benchmarks.bench_fairness --burst 15 --light 5 --service-ms 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+
+def _pct(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * (len(values) - 1) + 0.5))]
+
+
+async def run(mode: str, args) -> Dict[str, List[float]]:
+    from app.core.config import settings
+    from app.services.scheduler import FairScheduler, Shed
+
+    waits: Dict[str, List[float]] = {"heavy": [], "light": [], "shed": []}
+    sem = asyncio.Semaphore(settings.analysis_concurrency)
+    sched = FairScheduler()
+
+    async def analysis(who: str, subject: str) -> None:
+        t0 = time.perf_counter()
+        if mode == "fifo":
+            async with sem:
+                waits[who].append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(args.service_ms / 1000)
+            return
+        try:
+            async with sched.admit(subject, "free"):
+                waits[who].append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(args.service_ms / 1000)
+        except Shed as e:
+            waits["shed"].append(e.status)
+
+    async def light(i: int) -> None:
+        await asyncio.sleep(args.light_delay_ms / 1000)
+        await analysis("light", f"u:light{i}")
+
+    await asyncio.gather(
+        *(analysis("heavy", "u:heavy") for _ in range(args.burst)),
+        *(light(i) for i in range(args.light)),
+    )
+    return waits
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--burst", type=int, default=15, help="simultaneous requests from the heavy user")
+    p.add_argument("--light", type=int, default=5, help="other users, one request each")
+    p.add_argument("--light-delay-ms", type=float, default=10.0)
+    p.add_argument("--service-ms", type=float, default=200.0)
+    args = p.parse_args()
+
+    from app.core.config import settings
+
+    print(f"# concurrency {settings.analysis_concurrency}, per free user {settings.analysis_per_free}, "
+          f"queue per user {settings.analysis_queue_per_subject}, service {args.service_ms:g} ms")
+    print(f"{'mode':<5} {'light p50':>10} {'light p95':>10} {'heavy p50':>10} {'heavy p95':>10} {'heavy ok':>9} {'shed':>5}")
+    for mode in ("fifo", "fair"):
+        w = asyncio.run(run(mode, args))
+        print(f"{mode:<5} {statistics.median(w['light']):>10.0f} {_pct(w['light'], 0.95):>10.0f} "
+              f"{statistics.median(w['heavy']):>10.0f} {_pct(w['heavy'], 0.95):>10.0f} "
+              f"{len(w['heavy']):>9} {len(w['shed']):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/bench_jd_dedup.py
+"""
+Near-duplicate JD lookup (app/nlp/minhash.py) on a synthetic corpus.
+
+A stream of JD submissions is generated: fresh postings, and reposts of
+earlier ones that are exact copies or carry trivial edits (whitespace,
+tracking parameters on the apply link, one changed or added line). For each
+submission the benchmark asks
+
+  exact   is this exact text cached? (what a text-hash cache can reuse)
+  lsh     is there an indexed JD with estimated Jaccard >= threshold?
+
+and reports hit rates, how many LSH hits are false (true shingle Jaccard
+below the threshold) and how many true duplicates were missed, plus the
+signature and lookup time against a brute-force scan of all signatures.
+With --sweep it repeats for several band/row splits of the signature.
+
+No model or database is involved.
+
+    python -m benchmarks.bench_jd_dedup --postings 5000 --submissions 20000
+    python -m benchmarks.bench_jd_dedup --sweep
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from app.nlp.minhash import LSHIndex, MinHasher, brute_force, shingles
+
+_WORDS = (
+    "python fastapi django postgresql redis docker kubernetes aws terraform kafka react typescript go rust java "
+    "spring grpc graphql ci/cd github actions observability prometheus grafana linux microservices airflow spark "
+    "design build ship own maintain scale mentor review collaborate improve reliability latency throughput "
+    "customers platform team product data pipelines services apis infrastructure security testing on-call "
+    "experience years strong solid hands-on familiarity plus nice required preferred remote hybrid office "
+    "benefits equity salary health vacation learning budget growth inclusive diverse values mission impact"
+).split()
+
+
+def _posting(rng: random.Random, i: int) -> List[str]:
+    lines = [f"Senior Backend Engineer #{i} at Company{rng.randint(1, 400)}"]
+    for _ in range(rng.randint(12, 20)):
+        lines.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 18))) + ".")
+    lines.append(f"Apply: https://jobs.example.com/p/{i}")
+    return lines
+
+def _edit(rng: random.Random, lines: List[str]) -> Tuple[str, str]:
+    kind = rng.choice(["exact", "whitespace", "tracking", "changed line", "added line"])
+    out = list(lines)
+    if kind == "whitespace":
+        out = ["  " + l.replace(" ", "  ", 2) + "  " for l in out]
+    elif kind == "tracking":
+        out[-1] += f"?utm_source=linkedin&utm_campaign={rng.randint(1, 10**6)}&ref=share"
+    elif kind == "changed line":
+        j = rng.randrange(1, len(out) - 1)
+        out[j] = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 18))) + "."
+    elif kind == "added line":
+        out.insert(rng.randrange(1, len(out)), "We sponsor visas and offer relocation support.")
+    return kind, "\n".join(out)
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def run(args, bands: int, rows: int) -> dict:
+    rng = random.Random(11)
+    hasher = MinHasher(bands, rows, args.shingle)
+    index = LSHIndex(hasher, capacity=args.postings * 4)
+    texts: List[str] = []
+    sigs = []
+    exact = set()
+    postings: List[List[str]] = []
+    counts = {"repost": 0, "exact": 0, "lsh": 0, "false": 0, "missed": 0}
+    sig_ms, lsh_ms, scan_ms = [], [], []
+    sample_scan = max(1, args.submissions // 200)
+
+    for n in range(args.submissions):
+        if postings and rng.random() < args.repost_share:
+            src = rng.randrange(len(postings))
+            _, text = _edit(rng, postings[src])
+            counts["repost"] += 1
+        else:
+            src = None
+            postings.append(_posting(rng, len(postings)))
+            text = "\n".join(postings[-1])
+
+        t0 = time.perf_counter()
+        sig = hasher.signature(text)
+        t1 = time.perf_counter()
+        found = index.query(sig, args.threshold)
+        t2 = time.perf_counter()
+        sig_ms.append((t1 - t0) * 1000)
+        lsh_ms.append((t2 - t1) * 1000)
+        if n % sample_scan == 0:
+            t0 = time.perf_counter()
+            brute_force(sig, sigs, args.threshold)
+            scan_ms.append((time.perf_counter() - t0) * 1000)
+
+        if text in exact:
+            counts["exact"] += 1
+        mine = set(shingles(text, args.shingle))
+        if found:
+            counts["lsh"] += 1
+            if _jaccard(mine, set(shingles(texts[found[0][1]], args.shingle))) < args.threshold:
+                counts["false"] += 1
+        elif src is not None and _jaccard(mine, set(shingles("\n".join(postings[src]), args.shingle))) >= args.threshold:
+            counts["missed"] += 1
+
+        exact.add(text)
+        index.add(len(texts), sig)
+        texts.append(text)
+        sigs.append(sig)
+
+    res = {
+        "bands": bands, "rows": rows,
+        "exact_rate": counts["exact"] / args.submissions,
+        "lsh_rate": counts["lsh"] / args.submissions,
+        "false": counts["false"], "missed": counts["missed"],
+        "sig_us": statistics.median(sig_ms) * 1000,
+        "lsh_us": statistics.median(lsh_ms) * 1000,
+        "scan_ms": statistics.median(scan_ms),
+    }
+    return res
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--submissions", type=int, default=20000)
+    p.add_argument("--postings", type=int, default=5000, help="index capacity hint (x4)")
+    p.add_argument("--repost-share", type=float, default=0.4)
+    p.add_argument("--threshold", type=float, default=0.85)
+    p.add_argument("--bands", type=int, default=20)
+    p.add_argument("--rows", type=int, default=5)
+    p.add_argument("--shingle", type=int, default=3)
+    p.add_argument("--sweep", action="store_true", help="compare several band/row splits")
+    args = p.parse_args()
+
+    splits = [(args.bands, args.rows)]
+    if args.sweep:
+        splits = [(50, 2), (25, 4), (20, 5), (16, 8), (10, 10)]
+    print(f"# {args.submissions} submissions, {args.repost_share:.0%} reposts of earlier postings, "
+          f"shingle {args.shingle} words, threshold {args.threshold}")
+    print(f"{'bands x rows':<13} {'exact hit':>9} {'lsh hit':>8} {'false':>6} {'missed':>7} "
+          f"{'sig us':>7} {'lookup us':>10} {'scan ms':>8}")
+    for b, r in splits:
+        res = run(args, b, r)
+        print(f"{f'{b} x {r}':<13} {res['exact_rate']:>9.1%} {res['lsh_rate']:>8.1%} {res['false']:>6} "
+              f"{res['missed']:>7} {res['sig_us']:>7.0f} {res['lsh_us']:>10.1f} {res['scan_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
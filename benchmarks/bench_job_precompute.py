@@ -0,0 +1,81 @@
+# benchmarks/bench_job_precompute.py
+"""
+Matching a resume against stored jobs, with and without JD features
+precomputed on the Job row (app/services/job_ingest.py).
+
+  on miss      the job rows carry no features: every match extracts the
+               JD's skills and embeds the JD together with the resume
+  stored       job_ingest.compute() filled the rows first (what the
+               POST /jobs background task and backfill-jobs do); matches
+               seed the JD from the row and embed only the resume
+
+The match memo and the in-process JD feature cache are disabled so each
+match does its own work. Also reports what compute() costs per job, in
+batches as backfill-jobs runs it. Rows are built in memory; no database.
+
+    python -m benchmarks.bench_job_precompute --jobs 200
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+from benchmarks.harness import DEMO_JD, DEMO_RESUME
+
+
+def _jobs(n: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    lines = [l for l in DEMO_JD.splitlines() if l.strip()]
+    return ["\n".join(rng.sample(lines, k=max(1, len(lines) - 2)) + [f"Req #{i}"]) for i in range(n)]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--jobs", type=int, default=200)
+    p.add_argument("--batch-size", type=int, default=100)
+    args = p.parse_args()
+
+    from app.core.config import settings
+    from app.db.models import Job, Resume
+    from app.nlp.document import Document
+    from app.nlp.embeddings import embed
+    from app.services import job_ingest
+    from app.services.match_service import match_resume_job
+
+    settings.match_memo_size = 0
+    settings.jd_features_cache_size = 0
+    embed("warm up")
+    texts = _jobs(args.jobs)
+    resume = Resume(filename="bench.txt", text=DEMO_RESUME)
+
+    def run(rows: List[Job]) -> List[float]:
+        ms = []
+        for job in rows:
+            t0 = time.perf_counter()
+            match_resume_job(None, resume, job, Document(DEMO_RESUME), Document(job.description))
+            ms.append((time.perf_counter() - t0) * 1000)
+        return ms
+
+    cold = [Job(title="bench", description=t) for t in texts]
+    # store() would fill the rows during the run; match copies so every job stays a miss
+    miss = run([Job(title=j.title, description=j.description) for j in cold])
+
+    t0 = time.perf_counter()
+    for i in range(0, len(cold), args.batch_size):
+        job_ingest.compute(cold[i:i + args.batch_size])
+    compute_ms = (time.perf_counter() - t0) * 1000 / len(cold)
+    stored = run(cold)
+
+    print(f"# {args.jobs} jobs, model {settings.sentence_model}")
+    print(f"{'mode':<10} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, ms in (("on miss", miss), ("stored", stored)):
+        q = statistics.quantiles(ms, n=20)
+        print(f"{mode:<10} {statistics.median(ms):>8.2f} {q[18]:>8.2f}")
+    print(f"compute(): {compute_ms:.2f} ms per job in batches of {args.batch_size}")
+
+
+if __name__ == "__main__":
+    main()
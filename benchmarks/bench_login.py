@@ -0,0 +1,119 @@
+# benchmarks/bench_login.py
+"""
+Login flood: password-login throughput and the latency everyone else sees.
+
+Fires `--logins` POST /login/password requests with `--concurrency` in
+flight, while a probe client requests GET /healthz in a loop. Runs twice:
+  inline  Argon2 verify called directly in the async handler (the old code)
+  pooled  the bounded password executor (app/utils/passwords.py)
+
+    python -m benchmarks.bench_login --logins 200 --concurrency 32
+    PASSWORD_WORKERS=4 python -m benchmarks.bench_login
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.harness import boot_app, resolve_database_url, running, summarize
+
+EMAIL, PASSWORD = "flood@example.com", "correct-horse-battery"
+
+
+def seed_user() -> None:
+    from sqlalchemy import select
+    from app.db.models import User
+    from app.db.session import SessionLocal
+    from app.utils.passwords import hash_password
+
+    with SessionLocal() as db:
+        if db.scalar(select(User).where(User.email == EMAIL)) is None:
+            db.add(User(email=EMAIL, name="flood", password_hash=hash_password(PASSWORD)))
+            db.commit()
+
+
+def use_mode(mode: str) -> None:
+    from app.routes import auth
+    from app.utils import passwords
+
+    if mode == "inline":
+        async def inline(raw, hashed):
+            return passwords.verify_and_update(raw, hashed)  # blocks the event loop
+
+        auth.verify_and_update_async = inline
+    else:
+        auth.verify_and_update_async = passwords.verify_and_update_async
+
+
+async def flood(app, logins: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    login_lat: List[float] = []
+    probe_lat: List[float] = []
+    statuses: dict = {}
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            while not done.is_set():
+                t0 = time.perf_counter()
+                await c.get("/healthz")
+                probe_lat.append((time.perf_counter() - t0) * 1000.0)
+                await asyncio.sleep(0.005)
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with sem:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+                t0 = time.perf_counter()
+                r = await c.post("/login/password", data={"email": EMAIL, "password": PASSWORD})
+                login_lat.append((time.perf_counter() - t0) * 1000.0)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    probe_task = asyncio.create_task(probe())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await probe_task
+    return {
+        "rps": logins / elapsed,
+        "login": summarize(login_lat),
+        "probe": summarize(probe_lat),
+        "statuses": statuses,
+    }
+
+
+async def amain(args) -> None:
+    app = boot_app(resolve_database_url(args.db), rate_limit=False)
+    from app.core.config import settings as cfg
+
+    print(f"# login flood  logins={args.logins} concurrency={args.concurrency} workers={cfg.password_workers}")
+    print(f"{'mode':<8} {'logins/s':>9} {'login p50':>10} {'login p99':>10} {'probe p50':>10} {'probe p99':>10}  statuses")
+    async with running(app):
+        seed_user()
+        for mode in ("inline", "pooled"):
+            use_mode(mode)
+            await flood(app, 4, 2)  # warm-up
+            r = await flood(app, args.logins, args.concurrency)
+            print(
+                f"{mode:<8} {r['rps']:>9.1f} {r['login']['p50']:>10.1f} {r['login']['p99']:>10.1f} "
+                f"{r['probe']['p50']:>10.2f} {r['probe']['p99']:>10.2f}  {r['statuses']}"
+            )
+    print("(ms; probe = GET /healthz issued while the flood is running)")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--logins", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=32)
+    p.add_argument("--db", default="sqlite")
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_match_memo.py
+"""
+match_resume_job with and without the result memo (app/services/match_memo.py).
+
+  cold   every pair is new: skills, embeddings and scoring run in full
+  warm   the same pairs again: key hash + LRU lookup + copy
+  mix    a stream where --repeat-share of requests repeat an earlier pair
+         (/demo visits, resubmits); reports the memo hit rate and mean time
+
+Needs the embedding model (loaded once before timing). Texts get a unique
+suffix per pair, so nothing is shared between pairs by accident.
+
+    python -m benchmarks.bench_match_memo --pairs 50 --requests 500 --repeat-share 0.4
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.nlp import embeddings
+from app.nlp.document import Document
+from app.services import match_memo
+from app.services.match_service import match_resume_job
+from benchmarks.harness import DEMO_JD, DEMO_RESUME
+
+
+def _run(pair) -> float:
+    t0 = time.perf_counter()
+    match_resume_job(None, None, None, Document(pair[0]), Document(pair[1]))
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--pairs", type=int, default=50)
+    p.add_argument("--requests", type=int, default=500, help="length of the mixed stream")
+    p.add_argument("--repeat-share", type=float, default=0.4)
+    args = p.parse_args()
+
+    embeddings.get_model()
+    pairs = [(f"{DEMO_RESUME}\nRef {i}", f"{DEMO_JD}\nReq {i}") for i in range(args.pairs)]
+
+    match_memo.clear()
+    cold = [_run(pair) for pair in pairs]
+    warm = [_run(pair) for pair in pairs]
+    print(f"{'':<6} {'median ms':>10} {'p95 ms':>8}")
+    for name, xs in (("cold", cold), ("warm", warm)):
+        xs = sorted(xs)
+        print(f"{name:<6} {statistics.median(xs):>10.3f} {xs[int(len(xs) * 0.95) - 1]:>8.3f}")
+
+    match_memo.clear()
+    before = match_memo.stats()
+    rng = random.Random(5)
+    seen, fresh, times = [], 0, []
+    for _ in range(args.requests):
+        if seen and rng.random() < args.repeat_share:
+            pair = rng.choice(seen)
+        else:
+            fresh += 1
+            pair = (f"{DEMO_RESUME}\nNew {fresh}", f"{DEMO_JD}\nNew {fresh}")
+            seen.append(pair)
+        times.append(_run(pair))
+    after = match_memo.stats()
+    hits = after["hits"] - before["hits"]
+    lookups = hits + after["misses"] - before["misses"]
+    print(f"mix    {args.requests} requests, {args.repeat_share:.0%} repeats: hit rate {hits / lookups:.1%}, "
+          f"mean {statistics.mean(times):.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_persist.py
+"""
+DB time per analysis: the old commit-per-row pattern vs. the single
+`save_analysis` unit of work.
+
+    python -m benchmarks.bench_persist --iterations 300 --db sqlite
+    python -m benchmarks.bench_persist --db postgres
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.bench_report_reads import SAMPLE_PAYLOAD
+from benchmarks.harness import configure_env, resolve_database_url, summarize
+
+RESUME_TEXT = "Built a FastAPI backend with PostgreSQL and Docker. " * 40
+JD_TEXT = "Backend engineer with Python/FastAPI, PostgreSQL, Redis, Docker. " * 10
+
+
+async def commit_per_row(db) -> None:
+    """What ui_match/demo used to do: an add/commit/refresh round per row (resume, job, report)."""
+    from app.db.models import Job, Report, Resume
+    from app.services.report_service import new_slug, summary_columns
+
+    resume = Resume(filename="bench.pdf", text=RESUME_TEXT); db.add(resume); await db.commit(); await db.refresh(resume)
+    job = Job(title="Bench JD", description=JD_TEXT); db.add(job); await db.commit(); await db.refresh(job)
+    payload = dict(SAMPLE_PAYLOAD)
+    rpt = Report(slug=new_slug(), payload=payload, resume_id=resume.id, job_id=job.id, **summary_columns(payload, job))
+    db.add(rpt); await db.commit(); await db.refresh(rpt)
+
+
+async def unit_of_work(db) -> None:
+    from app.db.models import Job, Resume
+    from app.services.report_service import save_analysis
+
+    await save_analysis(
+        db,
+        resume=Resume(filename="bench.pdf", text=RESUME_TEXT),
+        job=Job(title="Bench JD", description=JD_TEXT),
+        payload=dict(SAMPLE_PAYLOAD),
+    )
+
+
+async def measure(fn, iterations: int) -> dict:
+    from app.db.session import AsyncSessionLocal
+
+    lat: List[float] = []
+    for _ in range(iterations):
+        async with AsyncSessionLocal() as db:
+            t0 = time.perf_counter()
+            await fn(db)
+            lat.append((time.perf_counter() - t0) * 1000.0)
+    return summarize(lat)
+
+
+async def amain(args) -> None:
+    db_url = resolve_database_url(args.db)
+    configure_env(db_url)
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.session import Base, engine, async_engine
+
+    Base.metadata.create_all(bind=engine)
+    await measure(unit_of_work, 10)  # warm-up: pool + statement cache
+
+    print(f"# DB time per analysis  db={db_url.split('://', 1)[0]}  iterations={args.iterations}")
+    print(f"{'pattern':<16} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for name, fn in (("commit-per-row", commit_per_row), ("unit-of-work", unit_of_work)):
+        s = await measure(fn, args.iterations)
+        print(f"{name:<16} {s['mean']:>8.2f} {s['p50']:>8.2f} {s['p95']:>8.2f} {s['p99']:>8.2f}")
+    await async_engine.dispose()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="auto")
+    p.add_argument("--iterations", type=int, default=300)
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
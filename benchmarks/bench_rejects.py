@@ -0,0 +1,130 @@
+# benchmarks/bench_rejects.py
+"""
+What a rejected upload costs the server: request-body bytes the app pulls
+in and CPU time spent, for requests that end up refused.
+
+  route       quota enforced only inside the /ui-match handlers (the old
+              setup): the multipart form is parsed and the PDF buffered
+              before the daily count is looked up
+  middleware  RateLimitMiddleware decodes the session cookie and checks the
+              quota / Content-Length before the body is read
+
+Cases: an anonymous and a signed-in user over their daily quota (limits are
+set to 0), and an upload over MAX_UPLOAD_BYTES with and without a
+Content-Length header. The app is called in-process; the body is offered in
+64 KB chunks and only what the app asks for is counted.
+
+    python -m benchmarks.bench_rejects --pdf-mb 2 --requests 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.bench_stream import encode_upload
+from benchmarks.harness import FakeRedis, boot_app, make_resume_pdf, resolve_database_url, running
+
+CHUNK = 64 * 1024
+
+
+def session_cookie(user_id: int, secret: str) -> bytes:
+    """A cookie SessionMiddleware would have set for a signed-in user."""
+    import json
+    from base64 import b64encode
+
+    import itsdangerous
+
+    data = b64encode(json.dumps({"user_id": user_id}).encode())
+    return b"session=" + itsdangerous.TimestampSigner(secret).sign(data)
+
+
+async def post(app, path: str, headers: list, body: bytes, chunked: bool = False) -> Tuple[int, int, float]:
+    """(status, body bytes consumed, CPU ms) for one request."""
+    if chunked:
+        headers = [(k, v) for k, v in headers if k != b"content-length"] + [(b"transfer-encoding", b"chunked")]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench"), *headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    pos = 0
+    status = 0
+
+    async def receive():
+        nonlocal pos
+        if pos >= len(body):
+            await asyncio.sleep(3600)
+            return {"type": "http.disconnect"}
+        chunk = body[pos:pos + CHUNK]
+        pos += len(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": pos < len(body)}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    c0 = time.process_time()
+    await app(scope, receive, send)
+    return status, pos, (time.process_time() - c0) * 1000.0
+
+
+async def run(args) -> None:
+    database_url = resolve_database_url(args.db)
+    cap = int(args.max_upload_mb * 1024 * 1024)
+    os.environ.update(ANON_DAILY_LIMIT="0", FREE_DAILY_LIMIT="0", MAX_UPLOAD_BYTES=str(cap))
+    app = boot_app(database_url, rate_limit=False)
+    from app.core.config import settings
+    from app.middleware.rate_limit import RateLimitMiddleware
+
+    pdf = make_resume_pdf()
+    pdf += b"%" + b"x" * max(0, int(args.pdf_mb * 1024 * 1024) - len(pdf))  # padding after %%EOF
+    headers, body = encode_upload(pdf)
+    big_headers, big_body = encode_upload(pdf + b"x" * (cap + CHUNK))
+    signed = headers + [(b"cookie", session_cookie(1, settings.oauth_secret))]
+
+    # (name, path, headers, body, chunked, anonymous quota for the case)
+    cases = [
+        ("anon over quota", "/ui-match", headers, body, False, 0),
+        ("user over quota", "/ui-match", signed, body, False, 0),
+        ("user over quota (stream)", "/ui-match/stream", signed, body, False, 0),
+        ("too large", "/ui-match", big_headers, big_body, False, 10**9),
+        ("too large, no length", "/ui-match", big_headers, big_body, True, 10**9),
+    ]
+    stacks = {"route": app, "middleware": RateLimitMiddleware(app, client=FakeRedis())}
+
+    async with running(app):
+        print(f"# upload {len(body) / 1e6:.1f} MB, oversized {len(big_body) / 1e6:.1f} MB, cap {cap / 1e6:.1f} MB, "
+              f"{args.requests} requests per case")
+        print(f"{'case':<26} {'stack':<11} {'status':>6} {'KB read':>9} {'CPU ms':>8}")
+        for name, path, hdrs, payload, chunked, anon_limit in cases:
+            settings.anon_daily_limit = anon_limit
+            for stack, target in stacks.items():
+                rows: List[Tuple[int, int, float]] = []
+                for _ in range(args.requests):
+                    rows.append(await post(target, path, hdrs, payload, chunked))
+                statuses: Dict[int, int] = {}
+                for s, _, _ in rows:
+                    statuses[s] = statuses.get(s, 0) + 1
+                status = "/".join(str(s) for s in sorted(statuses))
+                kb = statistics.mean(r[1] for r in rows) / 1024
+                cpu = statistics.median(r[2] for r in rows)
+                print(f"{name:<26} {stack:<11} {status:>6} {kb:>9.0f} {cpu:>8.2f}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="sqlite", help="sqlite | postgres | auto | SQLAlchemy URL")
+    p.add_argument("--pdf-mb", type=float, default=2.0, help="size of the over-quota uploads")
+    p.add_argument("--max-upload-mb", type=float, default=10.0, help="MAX_UPLOAD_BYTES for the run")
+    p.add_argument("--requests", type=int, default=20)
+    asyncio.run(run(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
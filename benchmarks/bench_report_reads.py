@@ -0,0 +1,104 @@
+# benchmarks/bench_report_reads.py
+"""
+Throughput of concurrent public report reads (GET /r/{slug}).
+
+Seeds N reports straight into the database, then hammers /r/{slug} in-process
+at increasing concurrency. Needs no model download, so it isolates the
+request path's database and template work.
+
+    python -m benchmarks.bench_report_reads --reports 200 --requests 2000 --concurrency 1,8,32,64
+    python -m benchmarks.bench_report_reads --db postgres
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.harness import boot_app, resolve_database_url, running, summarize
+
+SAMPLE_PAYLOAD = {
+    "match_score": 0.71, "semantic_similarity": 0.66, "skill_overlap": 0.8,
+    "ms": {"label": "Strong", "pct": 71}, "ss": {"label": "Strong", "pct": 66}, "so": {"label": "Strong", "pct": 80},
+    "skills": ["docker", "fastapi", "postgresql", "python", "redis"],
+    "resume_skills": ["docker", "fastapi", "postgresql", "python", "redis"],
+    "jd_skills": ["aws", "docker", "fastapi", "postgresql", "python"],
+    "overlap_skills": ["docker", "fastapi", "postgresql", "python"],
+    "missing_skills": ["aws"],
+    "recommendations": ["Show experience with: aws (projects, bullets, or links)."],
+    "pages": 1, "chars": 1800, "tokens": 300, "runtime_ms": 120,
+}
+
+
+def seed_reports(n: int) -> List[str]:
+    from app.db.models import Job, Report, Resume
+    from app.db.session import SessionLocal
+
+    slugs = []
+    with SessionLocal() as db:
+        resume = Resume(filename="bench.pdf", text="python fastapi docker " * 50)
+        job = Job(title="Bench JD", description="python aws docker " * 20)
+        db.add_all([resume, job]); db.flush()
+        for i in range(n):
+            slug = f"bench{i:07d}"
+            db.add(Report(slug=slug, payload=dict(SAMPLE_PAYLOAD), resume_id=resume.id, job_id=job.id))
+            slugs.append(slug)
+        db.commit()
+    return slugs
+
+
+async def run_level(app, slugs: List[str], concurrency: int, requests: int) -> dict:
+    lat: List[float] = []
+    errors = 0
+    remaining = requests
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                t0 = time.perf_counter()
+                r = await client.get(f"/r/{random.choice(slugs)}")
+                lat.append((time.perf_counter() - t0) * 1000.0)
+                if r.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+    out = summarize(lat)
+    out.update(concurrency=concurrency, rps=len(lat) / wall, errors=errors)
+    return out
+
+
+async def amain(args) -> None:
+    db_url = resolve_database_url(args.db)
+    app = boot_app(db_url, rate_limit=False)
+    async with running(app):
+        from app.db.session import Base, engine
+        Base.metadata.create_all(bind=engine)
+        slugs = seed_reports(args.reports)
+        await run_level(app, slugs, 4, 50)  # warm-up: templates, pool, statement cache
+
+        print(f"# GET /r/{{slug}}  db={db_url.split('://', 1)[0]}  reports={args.reports}")
+        print(f"{'conc':>5} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}")
+        for c in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+            r = await run_level(app, slugs, c, args.requests)
+            print(f"{c:>5} {r['rps']:>9.1f} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f} {r['errors']:>5}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", default="auto")
+    p.add_argument("--reports", type=int, default=200)
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--concurrency", default="1,8,32,64")
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_sections.py
+"""
+Resume segmentation throughput on multi-page resumes.
+
+  regex     what Document used to do: normalize(cleaned) for skill matching,
+            a MULTILINE heading regex over the whole text for `sections`,
+            and normalize() again over each section body to get per-section
+            skills
+  segment   one pass over the lines (app/nlp/sections.py) that yields the
+            normalized text and the section offsets into both texts; the
+            per-section normalized text is a slice
+
+Both sides produce the same normalized text and section bodies (checked
+before timing). Reports median ms per resume and MB/s of cleaned text.
+
+    python -m benchmarks.bench_sections --pages 1 5 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.nlp.sections import HEADER, HEADINGS, segment
+from app.nlp.skills_extractor import normalize
+from benchmarks.bench_document import large_resume
+
+_HEADING_LINE = re.compile(r"^[ \t]*([A-Za-z][A-Za-z ]{1,30}?)[ \t]*:?[ \t]*$", re.MULTILINE)
+_TITLES = ["Summary", "Experience", "Work Experience:", "Skills", "Projects", "Education", "Certifications"]
+
+
+def sectioned_resume(pages: int, seed: int = 5) -> str:
+    """large_resume() text with a heading every ~25 lines, CRs removed (as Document.cleaned)."""
+    rng = random.Random(seed)
+    lines = large_resume(pages, seed).replace("\r", "").split("\n")
+    for i in range(len(lines) - 1, 0, -25):
+        lines.insert(i, rng.choice(_TITLES))
+    return "\n".join(lines)
+
+
+def regex_pass(cleaned: str) -> Dict[str, str]:
+    normalized = normalize(cleaned)
+    marks = [(m.start(), m.end(), HEADINGS[m.group(1).strip().lower()])
+             for m in _HEADING_LINE.finditer(cleaned) if m.group(1).strip().lower() in HEADINGS]
+    out: Dict[str, str] = {"": normalized}
+    for i, (_, end, name) in enumerate(marks):
+        stop = marks[i + 1][0] if i + 1 < len(marks) else len(cleaned)
+        body = normalize(cleaned[end:stop])
+        out[name] = f"{out[name]} {body}" if name in out else body
+    return out
+
+def segment_pass(cleaned: str) -> Dict[str, str]:
+    normalized, segments = segment(cleaned)
+    out: Dict[str, str] = {"": normalized}
+    for s in segments:
+        if s.name == HEADER:
+            continue
+        body = normalized[s.norm_start:s.norm_end]
+        out[s.name] = f"{out[s.name]} {body}" if s.name in out else body
+    return out
+
+
+def _time(fn: Callable[[str], object], text: str, repeat: int) -> float:
+    ms: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        ms.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(ms)
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    p.add_argument("--repeat", type=int, default=50)
+    args = p.parse_args()
+
+    print(f"{'pages':>5} {'KB':>7} {'headings':>8} {'mode':<8} {'ms':>8} {'MB/s':>7}")
+    for pages in args.pages:
+        text = sectioned_resume(pages)
+        if regex_pass(text) != segment_pass(text):
+            raise SystemExit(f"regex and segment disagree on the {pages}-page resume")
+        n = sum(1 for s in segment(text)[1] if s.name != HEADER)
+        for mode, fn in (("regex", regex_pass), ("segment", segment_pass)):
+            ms = _time(fn, text, args.repeat)
+            print(f"{pages:>5} {len(text) / 1024:>7.0f} {n:>8} {mode:<8} {ms:>8.2f} {len(text) / 1e3 / ms:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_semantic_skills.py
+"""
+Skill extraction quality and latency: the alias matcher (strict + rapidfuzz
+fallback, the default) vs. semantic mode (strict + embedding match against
+the precomputed alias matrix, app/nlp/semantic_skills.py).
+
+Quality is micro precision / recall / F1 over a small labelled set of
+resume lines: some name skills by an alias, some only paraphrase them
+("container orchestration"), some contain near-miss words that should not
+match. Latency is the median per line and for one large resume; semantic
+mode includes embedding the candidate phrases, so it depends on the model
+and the hardware.
+
+    python -m benchmarks.bench_semantic_skills
+    python -m benchmarks.bench_semantic_skills --threshold 0.75 --pages 10
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Set, Tuple
+
+from app.core.config import settings as cfg
+from app.nlp import semantic_skills
+from app.nlp.document import Document
+from app.nlp.skills_extractor import extract_skill_set_normalized, normalize, skills_vocab
+from benchmarks.bench_document import large_resume
+
+# (line, skills a reader would tag it with)
+LABELLED: List[Tuple[str, Set[str]]] = [
+    ("Built REST APIs in Python with FastAPI and PostgreSQL.", {"python", "fastapi", "postgresql", "rest api"}),
+    ("Deployed services on k8s with Helm charts.", {"kubernetes", "helm"}),
+    ("Container orchestration for 40 microservices.", {"kubernetes", "microservices"}),
+    ("Wrote playbooks to configure 300 hosts.", {"ansible"}),
+    ("Infrastructure as code with HashiCorp tooling.", {"terraform"}),
+    ("Packaged every service as a Docker image.", {"docker"}),
+    ("Event streaming with Apache Kafka and consumer groups.", {"kafka"}),
+    ("Message broker (RabbitMQ) for background work.", {"rabbitmq"}),
+    ("Dashboards in Grafana fed by Prometheus metrics.", {"grafana", "prometheus"}),
+    ("Distributed tracing with OpenTelemetry and Jaeger.", {"opentelemetry", "jaeger"}),
+    ("Trained gradient boosted trees (XGBoost) and deep nets in PyTorch.", {"xgboost", "pytorch"}),
+    ("Data wrangling with pandas and numpy.", {"pandas", "numpy"}),
+    ("Frontend in React with TypeScript.", {"react", "typescript"}),
+    ("Unit tests with pytest; end-to-end tests with Playwright.", {"pytest", "playwright"}),
+    ("CI pipelines on GitHub Actions.", {"github actions"}),
+    ("Continuous integration with Jenkins.", {"jenkins"}),
+    ("Object-relational mapping with SQLAlchemy.", {"sqlalchemy"}),
+    ("Caching layer in Redis.", {"redis"}),
+    ("Full-text search on Elasticsearch clusters.", {"elasticsearch"}),
+    ("Workflow orchestration with Apache Airflow DAGs.", {"airflow"}),
+    ("Cloud: Amazon Web Services (EC2, S3, Lambda).", {"aws"}),
+    ("Google Cloud Platform and BigQuery analytics.", {"gcp", "bigquery"}),
+    ("Schema migrations with Flyway.", {"flyway"}),
+    ("Secrets management in HashiCorp Vault.", {"vault"}),
+    ("Service mesh with Istio.", {"istio"}),
+    ("Led a team of five engineers and mentored juniors.", set()),
+    ("Improved onboarding documentation and hiring process.", set()),
+    ("Reduced cloud spend by 30% through rightsizing.", set()),
+]
+
+
+def _alias(text: str) -> Set[str]:
+    return set(extract_skill_set_normalized(normalize(text)).names())
+
+def _semantic(text: str) -> Set[str]:
+    strict = extract_skill_set_normalized(normalize(text), fuzzy=False)
+    return set((strict | semantic_skills.match(text, strict.vocab)).names())
+
+def _quality(fn: Callable[[str], Set[str]], cases: List[Tuple[str, Set[str]]]) -> Tuple[float, float, float, List[str]]:
+    tp = fp = fn_ = 0
+    misses = []
+    for text, gold in cases:
+        got = fn(text)
+        tp += len(got & gold)
+        fp += len(got - gold)
+        fn_ += len(gold - got)
+        if got != gold:
+            misses.append(f"  {text[:48]:<48} +{sorted(got - gold)} -{sorted(gold - got)}")
+    p = tp / (tp + fp) if tp + fp else 1.0
+    r = tp / (tp + fn_) if tp + fn_ else 1.0
+    f1 = 2 * p * r / (p + r) if p + r else 0.0
+    return p, r, f1, misses
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(times)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--threshold", type=float, default=None, help="SKILLS_SEMANTIC_THRESHOLD to use")
+    p.add_argument("--pages", type=int, default=5, help="size of the large resume")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--verbose", action="store_true", help="print every line whose result differs from the label")
+    args = p.parse_args()
+    if args.threshold is not None:
+        cfg.skills_semantic_threshold = args.threshold
+
+    vocab = set(skills_vocab())
+    cases = [(t, gold & vocab) for t, gold in LABELLED]
+    unknown = set().union(*(gold for _, gold in LABELLED)) - vocab
+    if unknown:
+        print(f"(labels not in the dictionary, ignored: {sorted(unknown)})")
+
+    t0 = time.perf_counter()
+    m = semantic_skills.skill_matrix()
+    print(f"# skill matrix: {len(m.owner)} aliases x {m.matrix.shape[1]} dims, built in "
+          f"{(time.perf_counter() - t0) * 1000:.0f} ms (model {cfg.sentence_model}, threshold {cfg.skills_semantic_threshold})")
+
+    big = large_resume(args.pages)
+    print(f"{'method':<10} {'P':>6} {'R':>6} {'F1':>6} {'ms/line':>9} {'ms/resume':>10}")
+    for name, fn in (("alias", _alias), ("semantic", _semantic)):
+        prec, rec, f1, misses = _quality(fn, cases)
+        per_line = _median_ms(lambda: [fn(t) for t, _ in cases], args.repeat) / len(cases)
+        if name == "alias":
+            whole = _median_ms(lambda: extract_skill_set_normalized(Document(big).normalized), args.repeat)
+        else:
+            whole = _median_ms(lambda: _semantic(big), args.repeat)
+        print(f"{name:<10} {prec:>6.2f} {rec:>6.2f} {f1:>6.2f} {per_line:>9.2f} {whole:>10.1f}")
+        if args.verbose:
+            print("\n".join(misses))
+    print(f"(large resume: {len(big) // 1000} KB, {len(semantic_skills.candidates(big))} candidate phrases)")
+
+
+if __name__ == "__main__":
+    main()
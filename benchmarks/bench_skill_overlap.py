@@ -0,0 +1,104 @@
+# benchmarks/bench_skill_overlap.py
+"""
+Overlap / missing / coverage for many (resume, JD) skill-set pairs:
+
+  strings   sorted name lists -> set() per pair, & and -, sorted() again
+            (what score_match and the payload builder used to do)
+  bitset    SkillSet per pair: Python-int &, & ~, bit_count
+  packed    all pairs at once: uint64 matrices, NumPy & and popcount
+            (counts/coverage only; names are materialized separately)
+
+Skill sets are drawn from a synthetic dictionary, so no model or database
+is involved.
+
+    python -m benchmarks.bench_skill_overlap --pairs 20000 --skills 2000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable
+
+from app.nlp.skillset import SkillSet, coverage, pack
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(times)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--pairs", type=int, default=20000)
+    p.add_argument("--skills", type=int, default=2000, help="dictionary size")
+    p.add_argument("--resume-skills", type=int, default=25)
+    p.add_argument("--jd-skills", type=int, default=12)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    rng = random.Random(7)
+    vocab = tuple(sorted(f"skill-{i:05d}" for i in range(args.skills)))
+    # JDs are drawn partly from the resume's skills so overlaps are realistic
+    resumes, jds = [], []
+    for _ in range(args.pairs):
+        r = sorted(rng.sample(vocab, args.resume_skills))
+        j = sorted(set(rng.sample(r, args.jd_skills // 2) + rng.sample(vocab, args.jd_skills - args.jd_skills // 2)))
+        resumes.append(r)
+        jds.append(j)
+    r_sets = [SkillSet.from_names(r, vocab) for r in resumes]
+    j_sets = [SkillSet.from_names(j, vocab) for j in jds]
+
+    def strings():
+        out = []
+        for r, j in zip(resumes, jds):
+            jd_set, res_set = set(j), set(r)
+            overlap = sorted(jd_set & res_set)
+            missing = sorted(jd_set - res_set)
+            out.append((overlap, missing, len(overlap) / len(j) if j else 0.0))
+        return out
+
+    def bitset():
+        out = []
+        for r, j in zip(r_sets, j_sets):
+            overlap, missing, n = r & j, j - r, len(j)
+            out.append((overlap, missing, len(overlap) / n if n else 0.0))
+        return out
+
+    def bitset_names():
+        return [(o.names(), m.names(), c) for o, m, c in bitset()]
+
+    r_packed = pack([s.mask for s in r_sets], len(vocab))
+    j_packed = pack([s.mask for s in j_sets], len(vocab))
+
+    def packed():
+        return coverage(r_packed, j_packed)
+
+    # same answers
+    ref = strings()
+    assert [(o.names(), m.names(), c) for o, m, c in bitset()] == ref
+    assert all(abs(a - b[2]) < 1e-12 for a, b in zip(packed(), ref))
+
+    print(f"# {args.pairs} pairs, dictionary {args.skills} skills, {args.resume_skills}/{args.jd_skills} skills per resume/JD")
+    print(f"{'method':<24} {'ms':>9} {'us/pair':>9}")
+    rows = [
+        ("strings (sets, sorted)", strings),
+        ("bitset", bitset),
+        ("bitset + names", bitset_names),
+        ("packed numpy coverage", packed),
+    ]
+    for name, fn in rows:
+        ms = _median_ms(fn, args.repeat)
+        print(f"{name:<24} {ms:>9.2f} {ms * 1000 / args.pairs:>9.3f}")
+    t0 = time.perf_counter()
+    pack([s.mask for s in r_sets], len(vocab))
+    print(f"(packing {args.pairs} masks: {(time.perf_counter() - t0) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_skills_startup.py
+"""
+Skills dictionary load time: CSV parse vs. binary snapshot.
+
+Generates a synthetic dictionary (default 20k aliases), then times
+  csv        parse + normalize the CSV (hash check included)
+  snapshot   hash check + one mmap/unpickle of the file written by `build-skills`
+in-process (median of --repeat runs), and the first `extract_skills` call
+in a fresh interpreter, which also includes matching against every alias.
+With --baseline REV the first call is also timed for the extractor at a git
+revision (e.g. one that still compiled a regex per alias).
+
+    python -m benchmarks.bench_skills_startup --aliases 20000
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+
+def write_dictionary(path: Path, aliases: int, per_skill: int = 4, seed: int = 5) -> int:
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+
+    skills = aliases // per_skill
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["skill", "aliases"])
+        for _ in range(skills):
+            name = word() if rng.random() < 0.7 else f"{word()} {word()}"
+            extra = [word() if rng.random() < 0.6 else f"{word()} {word()}" for _ in range(per_skill - 1)]
+            w.writerow([name, ",".join(extra)])
+    return skills
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(times)
+
+
+_ROOT = Path(__file__).resolve().parents[1]
+_FIRST_CALL = (
+    "import time\n"
+    "{load}\n"
+    "t0 = time.perf_counter(); extract_skills('python and docker')\n"
+    "print((time.perf_counter() - t0) * 1000.0)\n"
+)
+
+
+def cold_start_ms(env: dict, module_file: Optional[Path] = None, cwd: Optional[Path] = None) -> float:
+    if module_file is None:
+        load = "from app.nlp.skills_extractor import extract_skills"
+    else:
+        load = (
+            "import importlib.util as u\n"
+            f"s = u.spec_from_file_location('baseline_extractor', {str(module_file)!r})\n"
+            "m = u.module_from_spec(s); s.loader.exec_module(m); extract_skills = m.extract_skills"
+        )
+    out = subprocess.run(
+        [sys.executable, "-c", _FIRST_CALL.format(load=load)],
+        env={**os.environ, "PYTHONPATH": str(_ROOT), **env},
+        cwd=cwd or _ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--aliases", type=int, default=20000)
+    p.add_argument("--repeat", type=int, default=7)
+    p.add_argument("--baseline", default=None, help="git revision whose extractor to time as well")
+    args = p.parse_args()
+
+    from app.nlp.skills_snapshot import build_snapshot, compile_data, file_hash, load_snapshot, parse_csv
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-skills-"))
+    src, snap = tmp / "skills.csv", tmp / "skills.snapshot"
+    skills = write_dictionary(src, args.aliases)
+
+    t0 = time.perf_counter()
+    _, data = build_snapshot(src, snap)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    n_aliases = sum(len(a) for a in data.canonical.values())
+    print(f"# skills dictionary: {skills} skills, {n_aliases} aliases")
+    print(f"csv {src.stat().st_size / 1e3:.0f} KB, snapshot {snap.stat().st_size / 1e3:.0f} KB, build {build_ms:.0f} ms")
+
+    rows = [
+        ("csv", lambda: compile_data(parse_csv(src), file_hash(src)[:12])),
+        ("snapshot", lambda: load_snapshot(snap, source=src)),
+    ]
+    print(f"{'load':<10} {'in-process ms':>14}")
+    for name, fn in rows:
+        print(f"{name:<10} {_median_ms(fn, args.repeat):>14.1f}")
+
+    env_csv = {"SKILLS_CSV": str(src), "SKILLS_SNAPSHOT": str(tmp / "missing.snapshot")}
+    env_snap = {"SKILLS_CSV": str(src), "SKILLS_SNAPSHOT": str(snap)}
+    print(f"{'first extract_skills in a fresh worker':<40} {'ms':>8}")
+    if args.baseline:
+        # older extractors read data/skills.csv relative to the working directory
+        (tmp / "data").mkdir()
+        shutil.copy(src, tmp / "data" / "skills.csv")
+        old = tmp / "baseline_extractor.py"
+        old.write_bytes(subprocess.run(
+            ["git", "show", f"{args.baseline}:app/nlp/skills_extractor.py"], cwd=_ROOT, capture_output=True, check=True,
+        ).stdout)
+        ms = statistics.median(cold_start_ms({}, module_file=old, cwd=tmp) for _ in range(3))
+        print(f"  {'baseline ' + args.baseline:<38} {ms:>8.1f}")
+    for name, env in (("csv", env_csv), ("snapshot", env_snap)):
+        ms = statistics.median(cold_start_ms(env) for _ in range(3))
+        print(f"  {name:<38} {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# benchmarks/bench_storage.py
+"""
+Compressed storage: bytes on disk and read-path decode cost.
+
+1. Per value: stored size and encode/decode time of a resume, a job
+   description and a report payload for each codec (legacy = plain
+   TEXT/JSON as written before app/db/types.py).
+2. Per database: a SQLite file of N legacy analyses, before and after
+   `compress_storage` + VACUUM, and the time to load a report + resume text
+   by primary key from each.
+
+    python -m benchmarks.bench_storage --rows 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.bench_report_reads import SAMPLE_PAYLOAD
+from benchmarks.harness import configure_env, summarize
+
+_WORDS = (
+    "built designed led owned shipped migrated reduced improved automated scaled mentored "
+    "service api pipeline platform backend frontend latency throughput cost customers team "
+    "python fastapi django flask postgresql mysql redis kafka docker kubernetes terraform aws gcp "
+    "react typescript ci/cd github actions observability grafana prometheus linux testing "
+    "with and for the to of by in across from over into using while a an"
+).split()
+
+
+def fake_text(rng: random.Random, words: int) -> str:
+    """Resume-like prose: a realistic vocabulary, numbers and line breaks (compresses like real text)."""
+    out: List[str] = []
+    for i in range(words):
+        w = rng.choice(_WORDS)
+        if rng.random() < 0.04:
+            w = f"{rng.randint(2, 95)}%"
+        elif rng.random() < 0.03:
+            w = f"{rng.randint(2010, 2025)}"
+        out.append(w)
+        if i % 14 == 13:
+            out.append(".\n-")
+    return " ".join(out)
+
+
+def sample_payload() -> dict:
+    return dict(
+        SAMPLE_PAYLOAD,
+        skills=list(SAMPLE_PAYLOAD["resume_skills"]),
+        recommendations=SAMPLE_PAYLOAD["recommendations"] * 4,
+        client_ip="203.0.113.7",
+    )
+
+
+def _time_us(fn: Callable[[], object], n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def per_value(iterations: int) -> None:
+    from app.core.config import settings as cfg
+    from app.db.types import CompressedText, ReportPayload, _HAS_ZSTD
+
+    rng = random.Random(7)
+    resume, jd, payload = fake_text(rng, 900), fake_text(rng, 220), sample_payload()
+    text_t, payload_t = CompressedText(), ReportPayload()
+
+    print("# per value")
+    print(f"{'codec':<8} {'column':<10} {'bytes':>8} {'ratio':>6} {'encode us':>10} {'decode us':>10}")
+    legacy_json = json.dumps(payload)
+    for name, raw in (("resume", resume), ("jd", jd)):
+        print(f"{'legacy':<8} {name:<10} {len(raw.encode()):>8} {'100%':>6} {'-':>10} {'-':>10}")
+    dec = _time_us(lambda: json.loads(legacy_json), iterations)
+    print(f"{'legacy':<8} {'payload':<10} {len(legacy_json):>8} {'100%':>6} {'-':>10} {dec:>10.1f}")
+
+    codecs = ["none", "zlib"] + (["zstd"] if _HAS_ZSTD else [])
+    saved = cfg.storage_codec
+    try:
+        for codec in codecs:
+            cfg.storage_codec = codec
+            for name, value, typ, base in (
+                ("resume", resume, text_t, len(resume.encode())),
+                ("jd", jd, text_t, len(jd.encode())),
+                ("payload", payload, payload_t, len(legacy_json)),
+            ):
+                stored = typ.process_bind_param(value, None)
+                enc = _time_us(lambda: typ.process_bind_param(value, None), iterations)
+                dec = _time_us(lambda: typ.process_result_value(stored, None), iterations)
+                print(f"{codec:<8} {name:<10} {len(stored):>8} {len(stored) / base:>6.0%} {enc:>10.1f} {dec:>10.1f}")
+    finally:
+        cfg.storage_codec = saved
+    if not _HAS_ZSTD:
+        print("(zstd skipped: `pip install zstandard` to compare)")
+
+
+def seed_legacy(path: Path, rows: int) -> None:
+    """The pre-compression schema and row format, written directly."""
+    rng = random.Random(11)
+    c = sqlite3.connect(path)
+    c.executescript(
+        """
+        CREATE TABLE resumes (id INTEGER PRIMARY KEY, filename VARCHAR, text VARCHAR);
+        CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR, description VARCHAR);
+        CREATE TABLE reports (
+            id INTEGER PRIMARY KEY, slug VARCHAR UNIQUE, payload JSON,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            resume_id INTEGER, job_id INTEGER, user_id INTEGER
+        );
+        """
+    )
+    for i in range(1, rows + 1):
+        c.execute("INSERT INTO resumes VALUES (?, ?, ?)", (i, "cv.pdf", fake_text(rng, rng.randint(500, 1200))))
+        c.execute("INSERT INTO jobs VALUES (?, ?, ?)", (i, "Backend Engineer", fake_text(rng, rng.randint(120, 320))))
+        c.execute(
+            "INSERT INTO reports (slug, payload, resume_id, job_id) VALUES (?, ?, ?, ?)",
+            (f"bench{i:07d}", json.dumps(sample_payload()), i, i),
+        )
+    c.commit()
+    c.close()
+
+
+def read_path(path: Path, reads: int) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.db.models import Report, Resume
+
+    engine = create_engine(f"sqlite:///{path}")
+    n = sqlite3.connect(path).execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+    rng = random.Random(3)
+    lat: List[float] = []
+    with Session(engine) as db:
+        for _ in range(reads):
+            rid = rng.randint(1, n)
+            t0 = time.perf_counter()
+            db.get(Report, rid).payload
+            db.get(Resume, rid).text
+            lat.append((time.perf_counter() - t0) * 1000.0)
+            db.expunge_all()
+    engine.dispose()
+    return summarize(lat)
+
+
+def per_database(rows: int, reads: int) -> None:
+    from sqlalchemy import create_engine
+    from app.db import models  # noqa: F401  (register tables)
+    from app.db.migrate import compress_storage, sync_schema
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench-storage-"))
+    try:
+        legacy, compact = tmp / "legacy.db", tmp / "compact.db"
+        seed_legacy(legacy, rows)
+        legacy_engine = create_engine(f"sqlite:///{legacy}")
+        sync_schema(legacy_engine)  # new nullable columns only; rows keep the legacy format
+        legacy_engine.dispose()
+        shutil.copy(legacy, compact)
+        engine = create_engine(f"sqlite:///{compact}")
+        t0 = time.perf_counter()
+        compress_storage(engine, log=lambda *_: None)
+        took = time.perf_counter() - t0
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+        engine.dispose()
+
+        a, b = legacy.stat().st_size, compact.stat().st_size
+        print(f"\n# per database  rows={rows}")
+        print(f"on disk: legacy {a / 1e6:.2f} MB -> compressed {b / 1e6:.2f} MB ({b / a:.0%}); migration {took:.1f}s")
+        print(f"{'db':<10} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}  (ms per report+resume load)")
+        for name, path in (("legacy", legacy), ("compressed", compact)):
+            read_path(path, 200)  # warm the page cache
+            s = read_path(path, reads)
+            print(f"{name:<10} {s['mean']:>8.3f} {s['p50']:>8.3f} {s['p95']:>8.3f} {s['p99']:>8.3f}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--rows", type=int, default=5000)
+    p.add_argument("--reads", type=int, default=2000)
+    p.add_argument("--iterations", type=int, default=2000, help="per-value timing loops")
+    args = p.parse_args()
+
+    configure_env("sqlite:///" + str(Path(tempfile.gettempdir()) / "bench-storage-app.db"))
+    per_value(args.iterations)
+    per_database(args.rows, args.reads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmarks/bench_stream.py
+"""
+Time to first byte / first skill for an upload: POST /ui-match (one HTML
+page when everything is done) vs. POST /ui-match/stream (Server-Sent Events
+per pipeline stage).
+
+For each request it records
+  ttfb     first non-empty body chunk
+  skills   the chunk that carries the skills (the `skills` event; for the
+           page, the only chunk)
+  total    end of the response
+In-process by default: the ASGI app is called directly and chunks are
+timestamped as the app sends them, so no server or network is involved.
+With --base-url the same is measured over HTTP against a running server.
+
+    python -m benchmarks.bench_stream --requests 30 --pages 3
+    python -m benchmarks.bench_stream --base-url http://localhost:8000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.harness import DEMO_JD, DEMO_RESUME, boot_app, make_resume_pdf, resolve_database_url, running, summarize
+
+ROUTES = {"page": "/ui-match", "stream": "/ui-match/stream"}
+
+
+def encode_upload(pdf: bytes) -> tuple:
+    """(headers, body) of the multipart form the browser would send."""
+    req = httpx.Request(
+        "POST", "http://bench/", files={"file": ("resume.pdf", pdf, "application/pdf")}, data={"job_description": DEMO_JD * 2}
+    )
+    return [(k.lower().encode(), v.encode()) for k, v in req.headers.items()], req.read()
+
+
+async def asgi_post(app, path: str, headers: list, body: bytes) -> Dict[str, Optional[float]]:
+    """Call the ASGI app directly and timestamp the body chunks it sends."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench"), *headers],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    sent = False
+    marks: Dict[str, Optional[float]] = {"ttfb": None, "skills": None, "total": None, "status": None}
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    t0 = time.perf_counter()
+
+    async def send(message):
+        now = (time.perf_counter() - t0) * 1000.0
+        if message["type"] == "http.response.start":
+            marks["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            if chunk and marks["ttfb"] is None:
+                marks["ttfb"] = now
+            if chunk and marks["skills"] is None and (path == ROUTES["page"] or b"event: skills" in chunk):
+                marks["skills"] = now
+            if not message.get("more_body", False):
+                marks["total"] = now
+
+    await app(scope, receive, send)
+    return marks
+
+
+async def http_post(client: httpx.AsyncClient, path: str, pdf: bytes) -> Dict[str, Optional[float]]:
+    marks: Dict[str, Optional[float]] = {"ttfb": None, "skills": None, "total": None, "status": None}
+    t0 = time.perf_counter()
+    files = {"file": ("resume.pdf", pdf, "application/pdf")}
+    async with client.stream("POST", path, files=files, data={"job_description": DEMO_JD * 2}) as r:
+        marks["status"] = r.status_code
+        async for chunk in r.aiter_raw():
+            now = (time.perf_counter() - t0) * 1000.0
+            if chunk and marks["ttfb"] is None:
+                marks["ttfb"] = now
+            if chunk and marks["skills"] is None and (path == ROUTES["page"] or b"event: skills" in chunk):
+                marks["skills"] = now
+    marks["total"] = (time.perf_counter() - t0) * 1000.0
+    return marks
+
+
+def report(name: str, runs: List[Dict[str, Optional[float]]]) -> None:
+    statuses = sorted({r["status"] for r in runs})
+    cols = []
+    for key in ("ttfb", "skills", "total"):
+        s = summarize([r[key] for r in runs if r[key] is not None])
+        cols.append(f"{s['p50']:>9.1f} {s['p95']:>9.1f}")
+    print(f"{name:<8} " + "  ".join(cols) + f"  {statuses}")
+
+
+async def amain(args) -> None:
+    pdf = make_resume_pdf(DEMO_RESUME, pages=args.pages)
+    print(f"# upload  pdf={len(pdf) / 1e3:.0f} KB pages={args.pages} requests={args.requests} (sequential)")
+    print(f"{'route':<8} {'ttfb p50':>9} {'ttfb p95':>9}  {'skill p50':>9} {'skill p95':>9}  {'total p50':>9} {'total p95':>9}  statuses")
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+            for name, path in ROUTES.items():
+                await http_post(client, path, pdf)  # warm-up
+                report(name, [await http_post(client, path, pdf) for _ in range(args.requests)])
+    else:
+        app = boot_app(resolve_database_url(args.db), rate_limit=False)
+        headers, body = encode_upload(pdf)
+        async with running(app):
+            for name, path in ROUTES.items():
+                await asgi_post(app, path, headers, body)  # warm-up: model, skills dictionary
+                report(name, [await asgi_post(app, path, headers, body) for _ in range(args.requests)])
+    print("(ms from the start of the request)")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--requests", type=int, default=30)
+    p.add_argument("--pages", type=int, default=3)
+    p.add_argument("--db", default="sqlite")
+    p.add_argument("--base-url", default=None, help="measure over HTTP against a running server instead")
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
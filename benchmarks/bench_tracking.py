@@ -0,0 +1,128 @@
+# benchmarks/bench_tracking.py
+"""
+Per-request cost of analytics tracking.
+
+Compares, on the landing page (one `track` call) and per `track` call:
+  off     analytics not configured
+  inline  the previous behaviour: posthog.capture() in the handler
+  queued  the bounded event queue (app/utils/analytics.py) with a file sink
+
+PostHog is pointed at a closed local port so no real events leave the
+machine; its client still does all of its per-event work in the handler.
+
+    python -m benchmarks.bench_tracking --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+from benchmarks.harness import boot_app, resolve_database_url, running, summarize
+
+DEAD_HOST = "http://127.0.0.1:9"
+
+
+def use_mode(mode: str, tmp: Path) -> None:
+    import posthog
+    from app.core.config import settings as cfg
+    from app.utils import analytics
+
+    analytics.shutdown(timeout=1.0)
+    analytics.capture = _ORIGINAL_CAPTURE
+    cfg.analytics_file = None
+    cfg.posthog_key = None
+    if mode == "inline":
+        posthog.project_api_key, posthog.host = "phc_bench", DEAD_HOST
+        logging.getLogger("posthog").setLevel(logging.CRITICAL)  # upload errors to the dead host
+
+        def inline(ident, event, props=None):
+            posthog.capture(ident, event, properties=props or {})
+            return True
+
+        analytics.capture = inline
+    elif mode == "queued":
+        cfg.analytics_file = str(tmp / "events.jsonl")
+
+
+def per_call(n: int) -> dict:
+    from app.utils import analytics
+
+    lat: List[float] = []
+    props = {"path": "/", "utm_source": "bench"}
+    for i in range(n):
+        t0 = time.perf_counter()
+        analytics.capture(f"10.0.{i % 255}.1", "pageview", props)
+        lat.append((time.perf_counter() - t0) * 1e6)
+    return summarize(lat)
+
+
+async def per_request(app, n: int) -> dict:
+    lat: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(n):
+            t0 = time.perf_counter()
+            r = await client.get("/?utm_source=bench")
+            lat.append((time.perf_counter() - t0) * 1000.0)
+            r.raise_for_status()
+    return summarize(lat)
+
+
+async def amain(args) -> None:
+    global _ORIGINAL_CAPTURE
+    app = boot_app(resolve_database_url("sqlite"), rate_limit=False)
+    from app.utils import analytics
+
+    _ORIGINAL_CAPTURE = analytics.capture
+    tmp = Path(tempfile.mkdtemp(prefix="bench-tracking-"))
+
+    print(f"# tracking overhead  requests={args.requests}")
+    print(f"{'mode':<8} {'call us p50':>12} {'call us p99':>12} {'GET / ms p50':>13} {'GET / ms mean':>14}")
+    async with running(app):
+        for mode in ("off", "inline", "queued"):
+            use_mode(mode, tmp)
+            per_call(200)
+            c = per_call(args.requests)
+            await per_request(app, 50)
+            r = await per_request(app, args.requests)
+            print(f"{mode:<8} {c['p50']:>12.1f} {c['p99']:>12.1f} {r['p50']:>13.3f} {r['mean']:>14.3f}")
+            if mode == "queued":
+                q = analytics.get_event_queue()
+                analytics.shutdown()
+                print(f"queued: {q.stats()}")
+
+        # overload: a tiny queue whose sink cannot keep up drops instead of blocking
+        from app.utils.analytics import EventQueue
+
+        class SlowSink:
+            def send(self, batch):
+                time.sleep(0.05)
+
+        q = EventQueue(SlowSink(), maxsize=100, batch_size=50, flush_interval=0.1).start()
+        t0 = time.perf_counter()
+        for i in range(args.requests * 5):
+            q.put("flood", "pageview", {})
+        took = (time.perf_counter() - t0) / (args.requests * 5) * 1e6
+        q.close(timeout=2.0)
+        print(f"overload: {took:.2f} us/put, {q.stats()}")
+    use_mode("off", tmp)
+
+
+_ORIGINAL_CAPTURE = None
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--requests", type=int, default=2000)
+    asyncio.run(amain(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
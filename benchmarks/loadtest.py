@@ -0,0 +1,241 @@
+# benchmarks/loadtest.py
+"""
+Load-test harness for the DevMatch web app.
+
+Replays a weighted mix of demo, upload (/ui-match), report view (/r/{slug})
+and PDF download (/r/{slug}.pdf) traffic at a fixed concurrency and reports
+throughput, latency percentiles and error rates per route.
+
+By default the app is booted in-process against a throwaway SQLite database
+(or a local Postgres if one is reachable with the docker-compose credentials)
+and an in-memory Redis stand-in, so no services are needed:
+
+    python -m benchmarks.loadtest --requests 500 --concurrency 16
+    python -m benchmarks.loadtest --mix view=8,pdf=1,demo=1 --duration 30
+    python -m benchmarks.loadtest --db postgres --json before.json
+    python -m benchmarks.loadtest --base-url http://localhost:8000   # a running server
+
+Use `--json` to save results and compare runs before/after a change.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.harness import (
+    DEMO_JD,
+    boot_app,
+    make_resume_pdf,
+    resolve_database_url,
+    running,
+    summarize,
+)
+
+ROUTES = ("demo", "upload", "view", "pdf")
+DEFAULT_MIX = "demo=1,upload=1,view=6,pdf=2"
+_SLUG_RX = re.compile(r"/r/([a-z0-9]{6,})")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route '{name}' in --mix (expected one of {', '.join(ROUTES)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix needs at least one route with a positive weight")
+    return mix
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def add(self, route: str, ms: float, status: Optional[int]):
+        self.latencies[route].append(ms)
+        self.statuses[route][status if status is not None else "exc"] += 1
+        if status is None or status >= 400:
+            self.errors[route] += 1
+
+    def report(self, wall_s: float) -> dict:
+        routes = {}
+        for route, lat in sorted(self.latencies.items()):
+            s = summarize(lat)
+            s["rps"] = s["n"] / wall_s if wall_s else 0.0
+            s["errors"] = self.errors[route]
+            s["error_rate"] = (self.errors[route] / s["n"]) if s["n"] else 0.0
+            s["statuses"] = {str(k): v for k, v in self.statuses[route].items()}
+            routes[route] = s
+        all_lat = [x for lat in self.latencies.values() for x in lat]
+        total = summarize(all_lat)
+        total["rps"] = total["n"] / wall_s if wall_s else 0.0
+        total["errors"] = sum(self.errors.values())
+        total["error_rate"] = (total["errors"] / total["n"]) if total["n"] else 0.0
+        return {"wall_s": wall_s, "routes": routes, "total": total}
+
+
+class Traffic:
+    """Issues one request per route kind and remembers report slugs for view/pdf traffic."""
+
+    def __init__(self, client: httpx.AsyncClient, pdf_bytes: bytes, jd: str):
+        self.client = client
+        self.pdf_bytes = pdf_bytes
+        self.jd = jd
+        self.slugs: List[str] = []
+
+    def _remember(self, html: str):
+        m = _SLUG_RX.search(html or "")
+        if m:
+            self.slugs.append(m.group(1))
+
+    async def demo(self) -> httpx.Response:
+        r = await self.client.get("/demo")
+        self._remember(r.text)
+        return r
+
+    async def upload(self) -> httpx.Response:
+        r = await self.client.post(
+            "/ui-match",
+            files={"file": ("resume.pdf", self.pdf_bytes, "application/pdf")},
+            data={"job_description": self.jd},
+        )
+        self._remember(r.text)
+        return r
+
+    async def view(self) -> httpx.Response:
+        return await self.client.get(f"/r/{random.choice(self.slugs)}")
+
+    async def pdf(self) -> httpx.Response:
+        return await self.client.get(f"/r/{random.choice(self.slugs)}.pdf")
+
+
+async def _run(args, app=None) -> dict:
+    mix = parse_mix(args.mix)
+    names, weights = zip(*mix.items())
+    rec = Recorder()
+
+    if app is not None:
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        transport = None
+        base_url = args.base_url
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=args.timeout, limits=limits, follow_redirects=False
+    ) as client:
+        traffic = Traffic(client, make_resume_pdf(pages=args.pages), DEMO_JD)
+
+        # Warm-up: loads the model, primes caches and seeds report slugs (not measured).
+        for _ in range(max(1, args.warmup)):
+            await traffic.demo()
+        if not traffic.slugs and ("view" in mix or "pdf" in mix):
+            raise SystemExit("Warm-up could not create a report to view; is /demo working?")
+
+        deadline = (time.perf_counter() + args.duration) if args.duration else None
+        remaining = args.requests
+
+        def _next() -> Optional[str]:
+            nonlocal remaining
+            if deadline is not None:
+                return random.choices(names, weights)[0] if time.perf_counter() < deadline else None
+            if remaining <= 0:
+                return None
+            remaining -= 1
+            return random.choices(names, weights)[0]
+
+        async def worker():
+            while (route := _next()) is not None:
+                t0 = time.perf_counter()
+                status = None
+                try:
+                    resp = await getattr(traffic, route)()
+                    status = resp.status_code
+                except Exception:
+                    pass
+                rec.add(route, (time.perf_counter() - t0) * 1000.0, status)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall = time.perf_counter() - start
+
+    return rec.report(wall)
+
+
+def _print_report(result: dict, meta: dict):
+    print(f"\n# {meta['target']}  concurrency={meta['concurrency']}  mix={meta['mix']}")
+    hdr = f"{'route':<8} {'n':>6} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    print(hdr)
+    print("-" * len(hdr))
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<8} {s['n']:>6} {s['rps']:>8.1f} {s['error_rate'] * 100:>5.1f}% "
+            f"{s['p50']:>8.1f} {s['p90']:>8.1f} {s['p95']:>8.1f} {s['p99']:>8.1f} {s['max']:>8.1f}"
+        )
+    print(f"(latencies in ms; wall {result['wall_s']:.2f}s)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="DevMatch load-test harness")
+    p.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted route mix (default: {DEFAULT_MIX})")
+    p.add_argument("--concurrency", "-c", type=int, default=8)
+    p.add_argument("--requests", "-n", type=int, default=200, help="total requests (ignored with --duration)")
+    p.add_argument("--duration", "-d", type=float, default=0.0, help="run for N seconds instead of -n requests")
+    p.add_argument("--warmup", type=int, default=3, help="unmeasured /demo calls before the run")
+    p.add_argument("--pages", type=int, default=1, help="pages in the uploaded resume PDF")
+    p.add_argument("--timeout", type=float, default=60.0)
+    p.add_argument("--db", default="auto", help="sqlite | postgres | auto | <SQLAlchemy URL> (in-process only)")
+    p.add_argument("--base-url", default=None, help="hit a running server instead of booting in-process")
+    p.add_argument("--no-rate-limit", action="store_true", help="do not mount RateLimitMiddleware in-process")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--json", dest="json_out", default=None, help="write results to this file")
+    return p
+
+
+async def amain(argv: Optional[List[str]] = None) -> dict:
+    args = build_parser().parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.base_url:
+        target = args.base_url
+        result = await _run(args)
+    else:
+        db_url = resolve_database_url(args.db)
+        target = f"in-process ({db_url.split('://', 1)[0]})"
+        app = boot_app(db_url, rate_limit=not args.no_rate_limit)
+        async with running(app):
+            result = await _run(args, app=app)
+
+    meta = {"target": target, "concurrency": args.concurrency, "mix": args.mix}
+    _print_report(result, meta)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, **result}, f, indent=2)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    result = asyncio.run(amain(argv))
+    return 1 if result["total"]["n"] and result["total"]["error_rate"] >= 0.5 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
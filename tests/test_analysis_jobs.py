@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.migrate import sync_schema
+from app.db.models import AnalysisJob
+from app.services import analysis_jobs
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a throwaway SQLite database (never the configured one)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    sync_schema(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _enqueue(db, n):
+    now = time.time()
+    for i in range(n):
+        db.add(AnalysisJob(
+            public_id=f"test-{i}-{now}", status="queued", attempts=0, enqueued_at=now, run_after=now,
+            filename="r.pdf", pdf=b"", job_description="jd", slug=f"slug-{i}-{now}",
+        ))
+    db.commit()
+
+
+def test_claims_are_exclusive_and_expired_claims_are_retaken(session_factory, monkeypatch):
+    with session_factory() as db:
+        _enqueue(db, 2)
+
+    with session_factory() as w1, session_factory() as w2, session_factory() as w3:
+        a, b = analysis_jobs.claim(w1), analysis_jobs.claim(w2)
+        assert a and b and a.id != b.id
+        assert analysis_jobs.claim(w3) is None  # both invisible while claimed
+
+        # w1's claim expires; another worker takes the job over and w1 can no longer finish it
+        monkeypatch.setattr(settings, "job_visibility_timeout", 0.0)
+        w1.execute(AnalysisJob.__table__.update().where(AnalysisJob.id == a.id).values(locked_until=time.time() - 1))
+        w1.commit()
+        again = analysis_jobs.claim(w3)
+        assert again.id == a.id and again.attempts == 2
+        assert analysis_jobs._finish(w1, a, status="done") is False
+
+
+def test_failures_back_off_then_give_up(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "job_max_attempts", 2)
+    monkeypatch.setattr(settings, "job_retry_backoff", 60.0)
+    with session_factory() as db:
+        _enqueue(db, 1)
+        job = analysis_jobs.claim(db)
+        analysis_jobs.fail(db, job, "boom")
+        db.refresh(job)
+        assert job.status == "queued" and job.run_after > time.time() + 30
+        assert analysis_jobs.claim(db) is None  # still backing off
+
+        job.run_after = 0
+        db.commit()
+        job = analysis_jobs.claim(db)
+        analysis_jobs.fail(db, job, "boom again")
+        db.refresh(job)
+        assert job.status == "failed" and job.error == "boom again" and job.pdf is None
@@ -0,0 +1,27 @@
+import json
+import time
+
+from app.utils.analytics import EventQueue, FileSink
+
+
+def test_queue_batches_to_file_sink_and_flushes_on_close(tmp_path):
+    path = tmp_path / "events.jsonl"
+    q = EventQueue(FileSink(str(path)), maxsize=100, batch_size=10, flush_interval=0.05).start()
+    for i in range(25):
+        assert q.put(f"user-{i}", "pageview", {"path": "/"})
+    q.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(events) == 25
+    assert events[0]["event"] == "pageview" and events[0]["properties"]["path"] == "/"
+    assert q.stats()["sent"] == 25 and q.stats()["dropped"] == 0
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    class StuckSink:
+        def send(self, batch):
+            time.sleep(0.2)
+
+    q = EventQueue(StuckSink(), maxsize=5, batch_size=1, flush_interval=0.01)  # not started: nothing drains
+    accepted = [q.put("u", "e") for _ in range(8)]
+    assert accepted.count(True) == 5
+    assert q.stats()["dropped"] == 3
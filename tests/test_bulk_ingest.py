@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.migrate import sync_schema
+from app.db.models import Job, Resume
+from app.routes import jobs, resumes
+from app.services.bulk_ingest import BatchTasks, insert_stream, ndjson_items
+from benchmarks.harness import DEMO_JD, make_resume_pdf
+
+NDJSON = {"content-type": "application/x-ndjson"}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The bulk routes on a throwaway SQLite database; precompute calls are recorded instead of run."""
+    path = tmp_path / "bulk.db"
+    engine = create_engine(f"sqlite:///{path}")
+    sync_schema(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    factory = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    monkeypatch.setattr(jobs, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(resumes, "AsyncSessionLocal", factory)
+    batches = []
+    monkeypatch.setattr(jobs, "precompute", lambda *ids: batches.append(list(ids)))
+    monkeypatch.setattr(settings, "bulk_batch_size", 2)
+
+    app = FastAPI()
+    app.include_router(jobs.router, prefix="/jobs")
+    app.include_router(resumes.router, prefix="/resumes")
+    yield TestClient(app), sessionmaker(bind=engine), batches
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def _results(r):
+    return [json.loads(line) for line in r.text.splitlines()]
+
+
+def test_ndjson_lines_split_across_chunks_and_overlong_lines():
+    async def chunks():
+        for c in (b'{"a": 1}\n{"a"', b': 2}\n\n' + b"x" * 40, b"x" * 40 + b'\n[1]\n{"a": 3}'):
+            yield c
+
+    async def collect():
+        return [item async for item in ndjson_items(chunks(), max_line=50)]
+
+    got = asyncio.run(collect())
+    assert got == [
+        ({"line": 1}, {"a": 1}, None),
+        ({"line": 2}, {"a": 2}, None),
+        ({"line": 4}, None, "line longer than 50 bytes"),
+        ({"line": 5}, None, "expected a JSON object"),
+        ({"line": 6}, {"a": 3}, None),
+    ]
+
+
+def test_jobs_are_inserted_in_batches_with_a_result_per_line(client):
+    c, Session, batches = client
+    lines = [
+        json.dumps({"title": "a", "description": DEMO_JD}),
+        "{not json",
+        json.dumps({"title": "b", "description": "too short"}),
+        json.dumps({"title": "c", "description": DEMO_JD + " (2)"}),
+        json.dumps({"description": DEMO_JD}),
+        json.dumps({"title": "d", "description": DEMO_JD + " (3)"}),
+    ]
+
+    def body():  # sent in several chunks while the response streams
+        for line in lines:
+            yield (line + "\n").encode()
+
+    r = c.post("/jobs/bulk", content=body(), headers=NDJSON)
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    results = _results(r)
+    assert results[-1] == {"done": True, "created": 3, "failed": 3}
+    by_line = {x["line"]: x for x in results[:-1]}
+    assert by_line[2]["error"] == "invalid JSON"
+    assert by_line[3]["error"] == "description too short"
+    assert by_line[5]["error"].startswith("title")
+    with Session() as db:
+        titles = dict(db.execute(select(Job.id, Job.title)).all())
+    assert {titles[by_line[n]["job_id"]] for n in (1, 4, 6)} == {"a", "c", "d"}
+    assert batches == [[by_line[1]["job_id"], by_line[4]["job_id"]], [by_line[6]["job_id"]]]  # one per commit
+
+
+def test_batch_work_starts_while_the_upload_is_still_arriving(tmp_path):
+    path = tmp_path / "batches.db"
+    sync_schema(create_engine(f"sqlite:///{path}"))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    done, order, calls = [], [], []
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def work(*ids):
+            loop.call_soon_threadsafe(started.set)
+            calls.append(ids)
+            if len(calls) == 1:
+                raise RuntimeError("model unavailable")  # logged, later batches still run
+            done.append(list(ids))
+
+        async def items():
+            for n in (1, 2):
+                yield {"line": n}, {"title": "t", "description": DEMO_JD}, None
+            # the first batch is committed; its work must not wait for the rest of the upload
+            await asyncio.wait_for(started.wait(), timeout=2)
+            order.append("first batch started")
+            yield {"line": 3}, {"title": "t", "description": DEMO_JD}, None
+
+        tasks = BatchTasks(work)
+        async with async_sessionmaker(bind=async_engine, expire_on_commit=False)() as db:
+            async for line in insert_stream(db, items(), jobs._job_row, "job_id", after_commit=tasks, batch_size=2):
+                order.append(json.loads(line).get("job_id", "done"))
+        await tasks.wait()
+        done.append("waited")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    assert order == [1, 2, "first batch started", 3, "done"]
+    assert done == [[3], "waited"]  # the failed first batch did not stop the second
+
+
+def test_bulk_resumes_from_pdfs_and_unsupported_content(client):
+    c, Session, _ = client
+    files = [
+        ("files", ("a.pdf", make_resume_pdf(), "application/pdf")),
+        ("files", ("b.txt", b"hello", "text/plain")),
+        ("files", ("c.pdf", b"not a pdf", "application/pdf")),
+    ]
+    results = _results(c.post("/resumes/bulk", files=files))
+    by_file = {x["file"]: x for x in results[:-1]}
+    assert by_file["b.txt"]["error"] == "only PDF supported"
+    assert by_file["c.pdf"]["error"] == "could not read the PDF"
+    assert results[-1] == {"done": True, "created": 1, "failed": 2}
+    with Session() as db:
+        assert db.get(Resume, by_file["a.pdf"]["resume_id"]).filename == "a.pdf"
+
+    assert c.post("/resumes/bulk", content=b"x", headers={"content-type": "text/plain"}).status_code == 415
@@ -0,0 +1,112 @@
+import hashlib
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrate import sync_schema
+from app.db.models import Job, Report, Resume
+from app.services import bulk_score_service
+from app.services.bulk_score_service import run_bulk_score
+
+RESUME = "Built Python services in Docker; PostgreSQL and Redis on Linux."
+JD = "Backend engineer: Python, Docker, Kubernetes and PostgreSQL."
+
+
+def _embed(texts, model=None):
+    """Deterministic unit vectors instead of the sentence model."""
+    out = []
+    for t in texts:
+        seed = int.from_bytes(hashlib.sha1(t.encode()).digest()[:4], "little")
+        v = np.random.default_rng(seed).random(16).astype(np.float32)
+        out.append(v / np.linalg.norm(v))
+    return np.stack(out)
+
+
+@pytest.fixture
+def scored(monkeypatch):
+    """Stub embeddings; returns the keys of every pair scored, in order."""
+    keys = []
+    score_pairs = bulk_score_service.score_pairs
+
+    def counting(pairs, pool=None):
+        keys.extend(p.key for p in pairs)
+        return score_pairs(pairs, pool)
+    monkeypatch.setattr(bulk_score_service, "embed_many", _embed)
+    monkeypatch.setattr(bulk_score_service, "score_pairs", counting)
+    return keys
+
+
+def _write_pairs(path, n):
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"id": f"p{i}", "resume_text": f"{RESUME} #{i}", "jd_text": JD}) + "\n")
+
+
+def _ids(path):
+    return [json.loads(line)["id"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_interrupted_file_run_resumes_without_rescoring(tmp_path, scored, monkeypatch):
+    src, out, ckpt = tmp_path / "pairs.jsonl", tmp_path / "scores.jsonl", tmp_path / "run.ckpt"
+    _write_pairs(src, 7)
+    write = bulk_score_service.JsonlSink.write
+
+    def dies_on_second_chunk(self, pairs, results):
+        if pairs[0].key == "p3":
+            raise KeyboardInterrupt
+        write(self, pairs, results)
+    monkeypatch.setattr(bulk_score_service.JsonlSink, "write", dies_on_second_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        run_bulk_score(str(src), str(out), chunk_size=3, checkpoint=ckpt, log=lambda _: None)
+    assert _ids(out) == ["p0", "p1", "p2"] and json.loads(ckpt.read_text())["position"] == 3
+
+    monkeypatch.setattr(bulk_score_service.JsonlSink, "write", write)
+    scored.clear()
+    state = run_bulk_score(str(src), str(out), chunk_size=3, checkpoint=ckpt, log=lambda _: None)
+    assert scored == ["p3", "p4", "p5", "p6"]  # the committed chunk is not scored again
+    assert _ids(out) == [f"p{i}" for i in range(7)] and state["rows"] == 7 and state["position"] == 7
+    row = json.loads(out.read_text(encoding="utf-8").splitlines()[0])
+    assert row["missing_skills"] == ["kubernetes"] and 0 <= row["match_score"] <= 1
+
+    with pytest.raises(ValueError):
+        run_bulk_score(str(tmp_path / "other.jsonl"), str(out), checkpoint=ckpt, log=lambda _: None)
+
+
+def test_limit_stops_mid_chunk_and_csv_rows_are_read(tmp_path, scored):
+    src, out, ckpt = tmp_path / "pairs.csv", tmp_path / "scores.jsonl", tmp_path / "run.ckpt"
+    src.write_text("id,resume,job_description\n" + "".join(f"r{i},{RESUME} {i},{JD}\n" for i in range(5)), encoding="utf-8")
+
+    state = run_bulk_score(str(src), str(out), chunk_size=3, checkpoint=ckpt, limit=4, log=lambda _: None)
+    assert scored == ["r0", "r1", "r2", "r3"] and state["position"] == 4
+    run_bulk_score(str(src), str(out), chunk_size=3, checkpoint=ckpt, log=lambda _: None)
+    assert _ids(out) == [f"r{i}" for i in range(5)] and scored.count("r3") == 1
+
+
+def test_db_run_merges_scores_into_the_reports(tmp_path, scored):
+    engine = create_engine(f"sqlite:///{tmp_path / 'score.db'}")
+    sync_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        resume, job = Resume(filename="r.pdf", text=RESUME), Job(title="Backend", description=JD)
+        s.add_all([resume, job])
+        s.flush()
+        for i in range(3):
+            s.add(Report(slug=f"s{i}", payload={"pages": 2, "utm": {"utm_source": "x"}, "match_score": 0.0},
+                         resume_id=resume.id, job_id=job.id))
+        s.commit()
+
+        ckpt = tmp_path / "db.ckpt"
+        state = run_bulk_score("db", "db", db=s, chunk_size=2, checkpoint=ckpt, log=lambda _: None)
+        assert state["rows"] == 3 and len(scored) == 3
+        s.expire_all()
+        for rpt in s.query(Report):
+            assert rpt.payload["pages"] == 2 and rpt.payload["utm"] == {"utm_source": "x"}  # kept
+            assert rpt.payload["missing_skills"] == ["kubernetes"] and rpt.payload["ms"]["label"]
+            assert rpt.match_score == rpt.payload["match_score"] > 0  # summary columns follow
+
+        assert run_bulk_score("db", "db", db=s, checkpoint=ckpt, log=lambda _: None)["rows"] == 3  # nothing left
+        assert len(scored) == 3
+    engine.dispose()
@@ -0,0 +1,115 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.middleware.compression import CompressionMiddleware, accepted
+from app.utils.static import FingerprintedStatic
+
+PAGE = "<html><body>" + "<p>Resume ↔ JD alignment with skills and suggestions.</p>" * 200 + "</body></html>"
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "compress_min_bytes", 1024)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8)
+    (tmp_path / "icons").mkdir()
+    (tmp_path / "icons" / "star.svg").write_text("<svg xmlns='http://www.w3.org/2000/svg'>" + "<path d='M0 0'/>" * 200 + "</svg>")
+    static = FingerprintedStatic(directory=str(tmp_path), prefix="/images")
+
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    app.mount("/images", static, name="images")
+
+    @app.get("/page")
+    def page():
+        return HTMLResponse(PAGE, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/revalidated")
+    def revalidated(type: str = "", length: str = ""):
+        described = {"Content-Type": type, "Content-Length": length} if type else {}
+        return Response(status_code=304, headers={"ETag": '"abc"', **described})
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse((f"data: {i}\n\n" * 300 for i in range(3)), media_type="text/event-stream")
+
+    @app.get("/ndjson")
+    def ndjson():
+        return Response((json.dumps({"line": 1}) + "\n") * 300, media_type="application/x-ndjson")
+
+    with TestClient(app) as c:
+        c.static = static
+        yield c
+
+
+def test_accept_encoding_negotiation():
+    assert accepted("gzip, deflate") == "gzip"
+    assert accepted("gzip;q=0, deflate") is None
+    assert accepted("") is None
+    assert accepted("identity") is None
+
+
+def test_html_is_compressed_above_the_threshold(client):
+    r = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.text == PAGE  # httpx decodes it
+    assert int(r.headers["content-length"]) < len(PAGE.encode()) / 5
+    assert r.headers["etag"] == 'W/"abc"' and "Accept-Encoding" in r.headers["vary"]
+
+    r = client.get("/page", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers and r.headers["etag"] == '"abc"'
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_304_keeps_the_etag_its_200_was_sent_with(client):
+    def etag(**params):
+        return client.get("/revalidated", params=params, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    assert etag(type="text/html; charset=utf-8", length=str(len(PAGE))) == 'W/"abc"'  # the 200 was compressed
+    assert etag(type="text/html; charset=utf-8", length="100") == '"abc"'  # below the threshold
+    assert etag(type="application/pdf", length=str(len(PAGE))) == '"abc"'  # not a compressible type
+    assert etag() == '"abc"'  # nothing to judge by
+    assert client.get("/revalidated", params={"type": "text/html", "length": str(len(PAGE))},
+                      headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
+
+
+def test_streams_are_never_compressed(client):
+    for path in ("/events", "/ndjson"):
+        r = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200 and "content-encoding" not in r.headers, path
+
+
+def test_fingerprinted_assets_are_immutable(client):
+    url = client.static.url("logo.png")
+    assert url.startswith("/images/logo.") and url.endswith(".png") and url != "/images/logo.png"
+    assert client.static.url("missing.png") == "/images/missing.png"
+
+    r = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200 and "content-encoding" not in r.headers  # png is served as it is
+    assert r.headers["cache-control"] == f"public, max-age={settings.static_max_age}, immutable"
+    assert client.get(url, headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    plain = client.get("/images/logo.png")
+    assert plain.content == r.content and plain.headers["cache-control"] == "public, max-age=3600"
+    assert client.get("/images/logo.000000000000.png").status_code == 404
+
+
+def test_text_assets_are_precompressed(client):
+    url = client.static.url("icons/star.svg")
+    r = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip" and r.headers["content-type"].startswith("image/svg+xml")
+    assert r.text.startswith("<svg") and r.headers["cache-control"].endswith("immutable")
+    assert client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]}).status_code == 304
+
+    raw = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers and raw.text == r.text
+    assert gzip.decompress(client.static._encoded[("icons/star.svg", "gzip")]).decode() == r.text
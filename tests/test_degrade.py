@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.db.models import Job, Resume
+from app.nlp.document import Document
+from app.services import degrade, job_features, job_ingest, match_memo, match_service
+from app.services.analyze_service import analyze_resume
+from app.services.report_service import build_result_payload
+
+RESUME = "Experience\nBuilt Python and Docker services on AWS, cut latency by 40%.\n" * 3
+JD = "Backend role: Python, Docker, Kubernetes and PostgreSQL on AWS. " * 3
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setattr(settings, "degrade", True)
+    monkeypatch.setattr(settings, "degrade_queue", [4, 8, 12])
+    monkeypatch.setattr(settings, "degrade_latency_ms", [1000, 2000, 3000])
+    monkeypatch.setattr(settings, "degrade_cooldown", 0.0)
+    monkeypatch.setattr(settings, "degrade_model", None)
+    queued = {"n": 0}
+    monkeypatch.setattr(degrade.scheduler, "queue_depth", lambda: queued["n"])
+    c = degrade.Controller()
+    monkeypatch.setattr(degrade, "controller", c)
+    monkeypatch.setattr(degrade, "apply", c.apply)
+    monkeypatch.setattr(degrade, "observe", c.observe)
+    c.queued = queued
+    return c
+
+
+def test_levels_rise_at_once_and_fall_one_at_a_time(controller, monkeypatch):
+    assert controller.level() == 0
+    controller.queued["n"] = 9
+    assert controller.level() == 2  # no DEGRADE_MODEL: level 3 is never used
+    controller.queued["n"] = 50
+    assert controller.level() == 2
+
+    controller.queued["n"] = 0
+    assert controller.level() == 2  # calm from now on...
+    assert controller.level() == 1  # ...then one step per cooldown
+    assert controller.level() == 0
+
+    monkeypatch.setattr(settings, "degrade_model", "small/model")
+    for _ in range(10):
+        controller.observe(3500)
+    assert controller.level() == 3
+    s = controller.stats()
+    assert s["skipped"] == ["fuzzy_skills", "metrics", "small_model"]
+    assert s["raised"] == 2 and s["lowered"] == 2 and s["latency_p95_ms"] == 3500
+
+    monkeypatch.setattr(settings, "degrade", False)
+    assert controller.level() == 0
+
+
+def test_degraded_match_is_marked_and_never_cached(controller, monkeypatch):
+    match_memo.clear()
+    job_features.clear()
+    monkeypatch.setattr(settings, "degrade_model", "small/model")
+    controller.queued["n"] = 20
+    models = []
+
+    def embed(*docs):
+        for d in docs:
+            models.append(d.model)
+            d.__dict__["embedding"] = np.ones(4, dtype=np.float32)
+    monkeypatch.setattr(match_service, "embed_documents", embed)
+
+    resume_doc, job_doc = Document(RESUME), Document(JD)
+    job = Job(title="Backend", description=JD)
+    analysis = analyze_resume(None, Resume(text=RESUME), resume_doc, sections=True)
+    matched = match_service.match_resume_job(None, Resume(text=RESUME), job, resume_doc, job_doc)
+
+    assert analysis["metrics"] == [] and analysis["degraded"] == ["fuzzy_skills", "metrics", "small_model"]
+    assert matched["degraded"] == ["fuzzy_skills", "metrics", "small_model"]
+    assert models == ["small/model", "small/model"]
+    assert not resume_doc.fuzzy and not job_doc.fuzzy
+    assert build_result_payload(analysis, matched, 1, 100)["degraded"] == matched["degraded"]
+    # nothing computed at a degraded level outlives the request
+    assert match_memo.get(match_service.memo_key(resume_doc, job_doc)) is None
+    assert job_features.lookup(Document(JD)) is None
+    assert job.skills is None and job.embedding is None
+
+    # back at full quality the same pair is computed in full and cached
+    controller.queued["n"] = 0
+    controller.reset()
+    resume_doc, job_doc = Document(RESUME), Document(JD)
+    matched = match_service.match_resume_job(None, Resume(text=RESUME), job, resume_doc, job_doc)
+    assert "degraded" not in matched and models[-2:] == [None, None]
+    assert match_memo.get(match_service.memo_key(resume_doc, job_doc)) is not None
+    assert job_ingest.is_current(job)
+
+
+def test_one_request_runs_at_one_level_when_the_level_changes_midway(controller, monkeypatch):
+    match_memo.clear()
+    job_features.clear()
+    monkeypatch.setattr(settings, "degrade_model", "small/model")
+    models = []
+
+    def embed(*docs):
+        for d in docs:
+            models.append(d.model)
+            d.__dict__["embedding"] = np.ones(4, dtype=np.float32)
+    monkeypatch.setattr(match_service, "embed_documents", embed)
+
+    resume_doc, job_doc = Document(RESUME), Document(JD)
+    analysis = analyze_resume(None, Resume(text=RESUME), resume_doc)  # fixes level 0 on the resume
+    for _ in range(10):
+        controller.observe(3500)
+    assert controller.level() == 3  # the process degrades between the two stages...
+    matched = match_service.match_resume_job(None, Resume(text=RESUME), Job(description=JD), resume_doc, job_doc)
+
+    # ...but the JD of this request follows the resume: same level, same embedding model
+    assert job_doc.degraded == resume_doc.degraded == () and job_doc.fuzzy
+    assert models == [None, None] and "degraded" not in analysis and "degraded" not in matched
+
+    # a request that starts now gets the new level on both texts
+    resume_doc, job_doc = Document(RESUME), Document(JD)
+    degrade.apply(resume_doc, job_doc)
+    assert resume_doc.model == job_doc.model == "small/model"
+    assert resume_doc.degraded == job_doc.degraded == ("fuzzy_skills", "metrics", "small_model")
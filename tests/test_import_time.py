@@ -0,0 +1,33 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous enough for a slow CI box; eager torch/transformers imports blow past it by seconds.
+BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "3000"))
+
+# Must only be imported on first use, never by `import app.main`
+LAZY = ("torch", "sentence_transformers", "transformers", "reportlab", "posthog", "authlib", "sentry_sdk", "pypdf")
+
+
+def _run(*args):
+    env = {**os.environ, "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite:///:memory:"), "SENTRY_DSN": ""}
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_app_main_within_budget():
+    out = _run("-X", "importtime", "-c", "import app.main")
+    # lines look like: "import time:  self [us] | cumulative | imported package"
+    m = re.search(r"^import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*app\.main\s*$", out.stderr, re.MULTILINE)
+    assert m, "app.main missing from -X importtime output"
+    cumulative_ms = int(m.group(1)) / 1000.0
+    assert cumulative_ms < BUDGET_MS, f"import app.main took {cumulative_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_dependencies_are_lazy():
+    code = f"import sys, app.main; print(','.join(m for m in {LAZY!r} if m in sys.modules))"
+    loaded = _run("-c", code).stdout.strip()
+    assert loaded == "", f"imported eagerly by app.main: {loaded}"
@@ -0,0 +1,38 @@
+import numpy as np
+
+from app.nlp.document import Document
+from app.nlp.minhash import LSHIndex, MinHasher
+from app.services import job_features
+
+JD = (
+    "Backend engineer for our payments platform. You will design and run Python services on "
+    "FastAPI and PostgreSQL, deploy them with Docker and Kubernetes on AWS, own on-call for the "
+    "APIs you build, and mentor two junior engineers. We value clear writing, careful reviews and "
+    "shipping small changes often. Apply at https://jobs.example.com/p/42"
+)
+
+
+def test_near_duplicates_are_found_and_unrelated_text_is_not():
+    index = LSHIndex(MinHasher(), capacity=2)
+    index.add("jd", index.hasher.signature(JD))
+    repost = "  " + JD.replace(" ", "  ") + "?utm_source=linkedin&ref=share\n"
+    assert [k for _, k in index.query(index.hasher.signature(repost), 0.85)] == ["jd"]
+    other = "Frontend developer: React, TypeScript and design systems for a retail web shop in Berlin."
+    assert index.query(index.hasher.signature(other), 0.5) == []
+
+    index.add("a", index.hasher.signature(other))
+    index.add("b", index.hasher.signature(other + " Remote possible."))
+    assert index.query(index.hasher.signature(JD), 0.85) == []  # oldest entry evicted at capacity
+
+
+def test_a_reposted_jd_reuses_the_features_of_the_original():
+    job_features.clear()
+    original = Document(JD)
+    original.seed(embedding=np.ones(4, dtype=np.float32) / 2)
+    job_features.remember(original)
+
+    repost = Document(JD.replace("two junior engineers", "two junior engineers.") + "?utm_campaign=x")
+    assert job_features.reuse(repost)
+    assert repost.skill_set == original.skill_set
+    assert repost.embedding is original.embedding
+    assert not job_features.reuse(Document("Data analyst with SQL, Tableau and Excel; finance background."))
@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.core.config import settings
+from app.db.models import Job
+from app.nlp.document import Document
+from app.services import job_ingest
+
+JD = "Backend engineer: Python, FastAPI and PostgreSQL services on AWS, deployed with Docker and Terraform."
+
+
+def test_stored_features_seed_later_matches():
+    job = Job(title="Backend", description=JD)
+    computed = Document(JD)
+    computed.seed(embedding=np.arange(4, dtype=np.float32))
+    assert not job_ingest.store(job, Document(JD))  # nothing computed yet
+    computed.skill_set  # noqa: B018
+    assert job_ingest.store(job, computed)
+    assert not job_ingest.store(job, computed)  # already current
+
+    doc = Document(job.description)
+    assert job_ingest.seed(job, doc)
+    assert doc.skill_set == computed.skill_set
+    assert np.array_equal(doc.embedding, computed.embedding)
+
+
+def test_stale_features_are_not_used(monkeypatch):
+    job = Job(title="Backend", description=JD)
+    computed = Document(JD)
+    computed.seed(embedding=np.ones(4, dtype=np.float32))
+    computed.skill_set  # noqa: B018
+    job_ingest.store(job, computed)
+
+    assert not job_ingest.seed(job, Document(JD + " Kubernetes a plus."))  # other text
+    monkeypatch.setattr(settings, "sentence_model", "some/other-model")
+    assert not job_ingest.seed(job, Document(JD))
+
+
+def test_features_borrowed_from_a_near_duplicate_are_not_stored():
+    from app.services import job_features
+
+    job_features.clear()
+    original = Document(JD + " Remote within the EU; we sponsor relocation for senior hires.")
+    original.seed(embedding=np.ones(4, dtype=np.float32))
+    job_features.remember(original)
+
+    exact = Document(original.raw)
+    assert job_features.reuse(exact) and exact.borrowed_from is None
+    assert job_ingest.store(Job(title="Backend", description=exact.raw), exact)
+
+    repost = Document(original.raw + " Apply by Friday.")
+    assert job_features.reuse(repost) and repost.borrowed_from == original.hash
+    job = Job(title="Backend", description=repost.raw)
+    assert not job_ingest.store(job, repost)
+    assert job.text_hash is None and job.embedding is None
+    assert not job_ingest.is_current(job)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.core.config import settings
+from app.nlp.document import Document
+from app.services import job_features, match_memo, match_service
+
+
+def test_memo_key_changes_with_every_input(monkeypatch):
+    r, j = Document("Python and Docker on AWS " * 4), Document("Backend role: Python, Docker, Kubernetes " * 3)
+    key = match_service.memo_key(r, j)
+    assert key == match_service.memo_key(Document(r.raw), Document(j.raw))
+    assert key != match_service.memo_key(j, r)
+
+    monkeypatch.setattr(match_service, "SCORING_VERSION", match_service.SCORING_VERSION + 1)
+    bumped = match_service.memo_key(r, j)
+    monkeypatch.setattr(settings, "sentence_model", "some/other-model")
+    assert len({key, bumped, match_service.memo_key(r, j)}) == 3
+
+
+def test_memo_replays_stages_without_recomputing(monkeypatch):
+    match_memo.clear()
+    r, j = Document("Python and Docker on AWS " * 4), Document("Backend role: Python, Docker, Kubernetes " * 3)
+    out = {
+        "resume_skills": ["aws", "docker", "python"], "jd_skills": ["docker", "kubernetes", "python"],
+        "overlap_skills": ["docker", "python"], "missing_skills": ["kubernetes"],
+        "semantic_similarity": 0.5, "skill_overlap": 2 / 3, "match_score": 0.5667,
+        "recommendations": [], "runtime_ms": 12,
+    }
+    match_memo.put(match_service.memo_key(r, j), out)
+
+    def no_embedding(*docs):
+        raise AssertionError("a memoized pair must not be embedded again")
+    monkeypatch.setattr(match_service, "embed_documents", no_embedding)
+
+    stages = list(match_service.match_stages(r, j))
+    assert [s for s, _ in stages] == ["skills", "semantic", "match"]
+    assert stages[0][1]["missing_skills"] == ["kubernetes"]
+    got = stages[-1][1]
+    assert got["match_score"] == out["match_score"]
+    got["missing_skills"].append("mutated")  # callers get copies
+    assert match_memo.get(match_service.memo_key(r, j))["missing_skills"] == ["kubernetes"]
+
+
+def test_a_replay_records_jd_features_seeded_from_the_job_row(monkeypatch):
+    match_memo.clear()
+    job_features.clear()
+    r, j = Document("Python and Docker on AWS " * 4), Document("Backend role: Python, Docker, Kubernetes " * 3)
+    match_memo.put(match_service.memo_key(r, j), {
+        "resume_skills": [], "jd_skills": [], "overlap_skills": [], "missing_skills": [],
+        "semantic_similarity": 0.5, "match_score": 0.5, "recommendations": [],
+    })
+    monkeypatch.setattr(match_service, "embed_documents", lambda *docs: None)
+
+    list(match_service.match_stages(r, j))
+    assert job_features.lookup(j) is None  # nothing at hand to record, and nothing computed for it
+
+    seeded = Document(j.raw)
+    seeded.seed(skill_set=j.skill_set, embedding=np.ones(4, dtype=np.float32) / 2)
+    list(match_service.match_stages(r, seeded))
+    assert job_features.lookup(Document(j.raw)).embedding is seeded.embedding
+    assert not job_features.remember_seeded(seeded)  # already recorded
+    job_features.clear()
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.hash import argon2
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.core.config import settings
+from app.db.migrate import sync_schema
+from app.db.models import User
+from app.db.session import get_db
+from app.routes import auth
+from app.utils import passwords
+
+PASSWORD = "correct horse battery"
+# an Argon2 hash made with cheaper parameters than the configured ones
+WEAK = argon2.using(rounds=1, memory_cost=1024, parallelism=1).hash(PASSWORD)
+
+
+@pytest.fixture
+def client(tmp_path):
+    """The auth routes on a throwaway database with one user; `.Sync` reads the database."""
+    path = tmp_path / "auth.db"
+    engine = create_engine(f"sqlite:///{path}")
+    sync_schema(engine)
+    Sync = sessionmaker(bind=engine)
+    with Sync() as s:
+        s.add(User(email="a@example.com", password_hash=WEAK))
+        s.commit()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Async = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def session():
+        async with Async() as s:
+            yield s
+
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(auth.router)
+    app.dependency_overrides[get_db] = session
+    with TestClient(app, follow_redirects=False) as c:
+        c.Sync = Sync
+        yield c
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def _stored(client) -> str:
+    with client.Sync() as s:
+        return s.scalar(select(User.password_hash).where(User.email == "a@example.com"))
+
+
+def test_login_upgrades_an_outdated_hash(client):
+    r = client.post("/login/password", data={"email": "a@example.com", "password": "wrong password"})
+    assert r.status_code == 200 and "Invalid email or password." in r.text
+    assert _stored(client) == WEAK  # nothing rewritten on a failed login
+
+    r = client.post("/login/password", data={"email": "A@example.com ", "password": PASSWORD})
+    assert r.status_code == 302 and r.headers["location"] == "/dashboard"
+    upgraded = _stored(client)
+    assert upgraded != WEAK and f"m={settings.password_memory_cost}," in upgraded
+    assert passwords.verify_password(PASSWORD, upgraded) and not passwords._pwd.needs_update(upgraded)
+
+    client.cookies.clear()
+    assert client.post("/login/password", data={"email": "a@example.com", "password": PASSWORD}).status_code == 302
+    assert _stored(client) == upgraded  # current hashes are left alone
+
+
+def test_no_free_slot_is_busy_not_a_hang(client, monkeypatch):
+    monkeypatch.setattr(settings, "password_workers", 0)  # every slot taken
+    monkeypatch.setattr(settings, "password_queue_timeout", 0.05)
+    busy = passwords.stats()["busy"]
+
+    with pytest.raises(passwords.PasswordServiceBusy):
+        asyncio.run(asyncio.wait_for(passwords.verify_and_update_async(PASSWORD, WEAK), timeout=2))
+
+    r = client.post("/login/password", data={"email": "a@example.com", "password": PASSWORD})
+    assert r.status_code == 503 and r.headers["retry-after"] == "5" and "a lot of sign-ins" in r.text
+    r = client.post("/signup", data={"email": "b@example.com", "password": PASSWORD})
+    assert r.status_code == 503 and "a lot of sign-ins" in r.text
+    assert passwords.stats()["busy"] == busy + 3 and _stored(client) == WEAK
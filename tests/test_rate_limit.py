@@ -0,0 +1,63 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.core.config import settings
+from app.middleware.rate_limit import RateLimitMiddleware, quota_for
+from benchmarks.harness import FakeRedis
+
+
+def _app(store):
+    app = FastAPI()
+    reads = []
+
+    @app.post("/ui-match")
+    async def upload(request: Request):
+        body = await request.body()
+        reads.append(len(body))
+        if (quota := quota_for(request)) is not None:
+            quota.sync(1)  # what the route counted in the database
+        return {"ok": True}
+
+    @app.get("/login")
+    async def login(request: Request):
+        request.session["user_id"] = 7
+        return {}
+
+    app.add_middleware(SessionMiddleware, secret_key=settings.oauth_secret)
+    app.add_middleware(RateLimitMiddleware, client=store)
+    return app, reads
+
+
+def test_quota_is_enforced_from_the_session_cookie_before_the_body(monkeypatch):
+    monkeypatch.setattr(settings, "free_daily_limit", 1)
+    monkeypatch.setattr(settings, "anon_daily_limit", 5)
+    monkeypatch.setattr(settings, "ip_daily_limit", 100)
+    app, reads = _app(FakeRedis())
+    c = TestClient(app)
+    c.get("/login")
+
+    assert c.post("/ui-match", content=b"x" * 100).status_code == 200
+    r = c.post("/ui-match", content=b"x" * 100)
+    assert r.status_code == 429 and "Daily limit" in r.text
+    assert reads == [100]  # the rejected body was never read
+
+    c.cookies.clear()  # anonymous: its own (IP) quota
+    assert c.post("/ui-match", content=b"x").status_code == 200
+
+    c.cookies.set("session", "forged.cookie.value")
+    assert c.post("/ui-match", content=b"x").status_code == 200  # treated as anonymous, not as user 7
+
+
+def test_uploads_over_the_cap_get_413(monkeypatch):
+    monkeypatch.setattr(settings, "max_upload_bytes", 1000)
+    app, reads = _app(None)
+    c = TestClient(app)
+    assert c.post("/ui-match", content=b"x" * 1001).status_code == 413
+
+    def chunks():  # no Content-Length: cut off once the cap is passed
+        for _ in range(10):
+            yield b"x" * 300
+    assert c.post("/ui-match", content=chunks()).status_code == 413
+    assert reads == []
+    assert c.post("/ui-match", content=b"x" * 1000).status_code == 200
@@ -0,0 +1,241 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrate import sync_schema
+from app.db.models import Job, Report, Resume, User
+from app.services.report_service import (
+    PASTED_JD_TITLE, add_analysis, backfill_report_summary, list_user_reports, report_title,
+)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """(sync sessionmaker, async sessionmaker) on a throwaway SQLite database."""
+    path = tmp_path / "reports.db"
+    engine = create_engine(f"sqlite:///{path}")
+    sync_schema(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield sessionmaker(bind=engine), async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def test_report_title_comes_from_the_job():
+    assert report_title("Senior Backend Engineer", "anything") == "Senior Backend Engineer"
+    assert report_title(PASTED_JD_TITLE, "\n  Staff SRE, Payments  \nWe run ...") == "Staff SRE, Payments"
+    assert report_title(None, "x" * 500) == "x" * 120
+    assert report_title(PASTED_JD_TITLE, "  \n ") is None
+
+
+def test_titles_are_written_with_the_report_and_backfilled(db):
+    Sync, _ = db
+    with Sync() as s:
+        rpt = add_analysis(
+            s, Resume(filename="r.pdf", text="resume"), Job(title=PASTED_JD_TITLE, description="Data Engineer\nSpark"),
+            {"match_score": 0.5},
+        )
+        old = Report(slug="old", payload={"match_score": 0.25}, resume_id=rpt.resume_id, job_id=rpt.job_id)
+        s.add(old)
+        s.commit()
+        assert rpt.title == "Data Engineer" and old.title is None
+
+        assert backfill_report_summary(s, log=lambda _: None) >= 1
+        s.expire_all()
+        assert s.get(Report, old.id).title == "Data Engineer" and s.get(Report, old.id).match_score == 0.25
+
+
+def _seed_user_reports(Sync, n: int, same_time_every: int = 3) -> int:
+    """n reports for one user; created_at repeats in runs of `same_time_every` to exercise the id tie-break."""
+    with Sync() as s:
+        user = User(email="u@example.com")
+        resume, job = Resume(filename="r.pdf", text="r"), Job(title="t", description="d")
+        s.add_all([user, resume, job])
+        s.flush()
+        t0 = datetime(2024, 1, 1)
+        for i in range(n):
+            s.add(Report(
+                slug=f"s{i}", payload={}, resume_id=resume.id, job_id=job.id, user_id=user.id,
+                created_at=t0 + timedelta(minutes=i // same_time_every),
+            ))
+        other = User(email="other@example.com")
+        s.add(other)
+        s.flush()
+        s.add(Report(slug="theirs", payload={}, resume_id=resume.id, job_id=job.id, user_id=other.id, created_at=t0))
+        s.commit()
+        return user.id
+
+
+def test_keyset_pages_are_stable_across_equal_timestamps(db):
+    Sync, Async = db
+    uid = _seed_user_reports(Sync, 10)
+    with Sync() as s:
+        expected = [slug for (slug,) in s.execute(
+            select(Report.slug).where(Report.user_id == uid).order_by(Report.created_at.desc(), Report.id.desc())
+        )]
+
+    async def walk():
+        async with Async() as s:
+            pages, after = [], None
+            while True:
+                rows, has_prev, has_next = await list_user_reports(s, uid, 4, after=after)
+                pages.append(([r.slug for r in rows], has_prev, has_next))
+                if not has_next:
+                    break
+                after = rows[-1].id
+            # and back again from the last page
+            first_of_last = (await list_user_reports(s, uid, 4, after=after))[0][0].id
+            back = await list_user_reports(s, uid, 4, before=first_of_last)
+            return pages, back
+
+    pages, back = asyncio.run(walk())
+    assert [slugs for slugs, _, _ in pages] == [expected[0:4], expected[4:8], expected[8:10]]
+    assert [(p, n) for _, p, n in pages] == [(False, True), (True, True), (True, False)]  # last page: no next
+    assert [r.slug for r in back[0]] == expected[4:8] and back[1:] == (True, True)
+
+
+def test_invalid_cursor_gives_an_empty_page(db):
+    Sync, Async = db
+    uid = _seed_user_reports(Sync, 3)
+    with Sync() as s:
+        theirs = s.scalar(select(Report.id).where(Report.slug == "theirs"))
+
+    async def page(**cursor):
+        async with Async() as s:
+            return await list_user_reports(s, uid, 4, **cursor)
+
+    for cursor in ({"after": 999999}, {"before": 999999}, {"after": theirs}):
+        rows, _, _ = asyncio.run(page(**cursor))
+        assert rows == [], cursor  # another user's id never leaks their position either
+
+
+@pytest.fixture
+def report_client(db):
+    """GET /r/{slug} on the throwaway database, with empty report caches."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from starlette.middleware.sessions import SessionMiddleware
+
+    from app.db.session import get_db
+    from app.routes import ui
+    from app.services.report_service import html_cache, payload_cache
+
+    Sync, Async = db
+    payload_cache.clear()
+    html_cache.clear()
+
+    async def session():
+        async with Async() as s:
+            yield s
+
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(ui.router)
+    app.dependency_overrides[get_db] = session
+    with Sync() as s:
+        resume, job = Resume(filename="r.pdf", text="r"), Job(title="t", description="d")
+        s.add_all([resume, job])
+        s.flush()
+        s.add(Report(slug="pub", payload={"match_score": 0.42, "recommendations": ["First tip"]},
+                     resume_id=resume.id, job_id=job.id))
+        s.commit()
+    yield TestClient(app), Sync
+    payload_cache.clear()
+    html_cache.clear()
+
+
+def test_public_report_etag_and_revalidation(report_client):
+    from app.services.report_service import html_cache
+
+    client, _ = report_client
+    r = client.get("/r/pub")
+    assert r.status_code == 200 and "First tip" in r.text
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and r.headers["cache-control"] == "public, no-cache"
+    assert len(html_cache) == 1
+
+    again = client.get("/r/pub", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag and not again.content
+    assert client.get("/r/pub", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/r/pub", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert client.get("/r/pub").content == r.content  # served from the rendered-page cache
+    assert client.get("/r/missing").status_code == 404
+
+    pdf_etag = f'{etag[:-1]}-pdf"'  # the PDF has its own validator, revalidated without rendering
+    assert client.get("/r/pub.pdf", headers={"If-None-Match": pdf_etag}).status_code == 304
+
+
+def test_report_304s_keep_the_etag_form_of_their_200(report_client):
+    from fastapi.testclient import TestClient
+
+    from app.middleware.compression import CompressionMiddleware
+
+    client = TestClient(CompressionMiddleware(report_client[0].app))
+    for coding, weak in (("gzip", True), ("identity", False)):
+        r = client.get("/r/pub", headers={"Accept-Encoding": coding})
+        assert r.headers["etag"].startswith("W/") == weak, coding
+        again = client.get("/r/pub", headers={"Accept-Encoding": coding, "If-None-Match": r.headers["etag"]})
+        assert again.status_code == 304 and again.headers["etag"] == r.headers["etag"], coding
+
+    pdf_etag = f'{r.headers["etag"][:-1]}-pdf"'  # PDFs are never compressed: strong on the 304 too
+    again = client.get("/r/pub.pdf", headers={"Accept-Encoding": "gzip", "If-None-Match": pdf_etag})
+    assert again.status_code == 304 and again.headers["etag"] == pdf_etag
+
+
+def test_changed_report_gets_a_new_etag_once_invalidated(report_client):
+    from app.services.report_service import invalidate_report
+
+    client, Sync = report_client
+    etag = client.get("/r/pub").headers["etag"]
+    with Sync() as s:
+        rpt = s.scalar(select(Report).where(Report.slug == "pub"))
+        rpt.payload = {"match_score": 0.9, "recommendations": ["Second tip"]}
+        s.commit()
+    asyncio.run(invalidate_report("pub"))
+
+    r = client.get("/r/pub", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and "Second tip" in r.text and "First tip" not in r.text
+    assert r.headers["etag"] != etag
+    assert client.get("/r/pub", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_rescored_reports_are_evicted_from_the_report_caches(report_client, monkeypatch):
+    import redis
+
+    from app.core.config import settings
+    from app.services.bulk_score_service import DbSink, Pair
+    from app.services.report_service import html_cache, payload_cache
+
+    client, Sync = report_client
+    etag = client.get("/r/pub").headers["etag"]
+    assert payload_cache.get("pub") is not None and len(html_cache) == 1
+
+    deleted = []
+
+    class FakeRedis:
+        def delete(self, *keys):
+            deleted.extend(keys)
+
+        def close(self):
+            pass
+    monkeypatch.setattr(settings, "report_cache_redis", True)
+    monkeypatch.setattr(settings, "redis_url", "redis://cache:6379/0")
+    monkeypatch.setattr(redis.Redis, "from_url", classmethod(lambda cls, url: FakeRedis()))
+
+    with Sync() as s:
+        rid = s.scalar(select(Report.id).where(Report.slug == "pub"))
+        DbSink(s).write([Pair(str(rid), "", "", {"pages": 1})], [{
+            "resume_skills": ["python"], "jd_skills": ["python"], "overlap_skills": ["python"],
+            "missing_skills": [], "semantic_similarity": 0.8, "skill_overlap": 1.0, "match_score": 0.9,
+            "recommendations": ["Rescored tip"],
+        }])
+    assert deleted == ["report:pub"]
+    assert payload_cache.get("pub") is None and len(html_cache) == 0
+
+    monkeypatch.setattr(settings, "report_cache_redis", False)
+    r = client.get("/r/pub", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and "Rescored tip" in r.text and r.headers["etag"] != etag
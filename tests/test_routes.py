@@ -7,3 +7,25 @@ def test_health():
     r = client.get("/health")
     assert r.status_code == 200
     assert r.json()["status"] == "ok"
+
+def test_landing_is_compressed_and_links_fingerprinted_assets():
+    from app.utils.static import asset_url
+
+    r = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200 and r.headers["content-encoding"] == "gzip"
+    assert asset_url("logo.png") != "/images/logo.png" and asset_url("logo.png") in r.text
+
+def test_json_api_is_closed_until_an_api_key_is_set(monkeypatch):
+    from app.core.config import settings
+
+    for placeholder in ("", "dev-secret-key"):
+        monkeypatch.setattr(settings, "api_key", placeholder)
+        for headers in ({}, {"X-API-Key": placeholder}):
+            assert client.post("/resumes", json={"text": "x"}, headers=headers).status_code == 503
+        assert client.post("/jobs/bulk", content=b"", headers={"X-API-Key": placeholder}).status_code == 503
+        assert client.get("/metricsz", headers={"X-API-Key": placeholder}).status_code == 503
+
+    monkeypatch.setattr(settings, "api_key", "s3cret")
+    assert client.post("/resumes", json={"text": "x"}).status_code == 401
+    assert client.post("/resumes", json={"text": "x"}, headers={"X-API-Key": "wrong"}).status_code == 401
+    assert client.get("/metricsz", headers={"X-API-Key": "s3cret"}).status_code == 200
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.scheduler import FairScheduler, Shed, Ticket
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_concurrency", 2)
+    monkeypatch.setattr(settings, "analysis_per_free", 2)
+    monkeypatch.setattr(settings, "analysis_per_anon", 1)
+    monkeypatch.setattr(settings, "analysis_queue_per_subject", 3)
+    monkeypatch.setattr(settings, "analysis_queue_max", 4)
+    monkeypatch.setattr(settings, "analysis_queue_timeout", 5.0)
+
+
+def test_slots_are_shared_fairly_between_subjects():
+    async def scenario():
+        s = FairScheduler()
+        a1, a2 = s.admit("u:a", "free"), s.admit("u:a", "free")
+        assert a1.state == a2.state == Ticket.RUNNING
+        a3, a4 = s.admit("u:a", "free"), s.admit("u:a", "free")  # the busy user queues first...
+        b1 = s.admit("u:b", "free")
+        c1 = s.admit("ip:1.2.3.4", "anon")
+        assert [t.state for t in (a3, a4, b1, c1)] == [Ticket.QUEUED] * 4
+
+        order = []
+        async def run(name, t):
+            async with t:
+                order.append(name)
+                await asyncio.sleep(0)
+
+        tasks = [asyncio.create_task(run(n, t)) for n, t in (("a3", a3), ("a4", a4), ("b1", b1), ("c1", c1))]
+        await asyncio.sleep(0)
+        a1.release()  # ...but a freed slot goes to the subject with the fewest in flight
+        a2.release()
+        await asyncio.gather(*tasks)
+        assert order == ["b1", "a3", "c1", "a4"]
+        assert s.stats()["active"] == 0 and s.stats()["queued"] == 0
+        assert s.stats()["tiers"]["free"]["peak"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_overload_is_shed_with_429_and_503():
+    async def scenario():
+        s = FairScheduler()
+        running = [s.admit("u:a", "free"), s.admit("u:a", "free")]
+        for _ in range(3):
+            s.admit("u:a", "free")
+        with pytest.raises(Shed) as e:
+            s.admit("u:a", "free")  # this user already has 3 waiting
+        assert e.value.status == 429
+        s.admit("u:b", "free")  # global queue now full (4)
+        with pytest.raises(Shed) as e:
+            s.admit("u:c", "free")
+        assert e.value.status == 503
+        tiers = s.stats()["tiers"]["free"]
+        assert tiers["shed_429"] == 1 and tiers["shed_503"] == 1
+        for t in running:
+            t.release()
+
+    asyncio.run(scenario())
+
+
+def test_waiting_times_out_or_is_cancelled_without_leaking_slots(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_queue_timeout", 0.01)
+
+    async def scenario():
+        s = FairScheduler()
+        holders = [s.admit("u:a", "free"), s.admit("u:b", "free")]
+        late = s.admit("u:c", "free")
+        with pytest.raises(Shed) as e:
+            await late.wait()
+        assert e.value.status == 503 and s.stats()["queued"] == 0
+
+        monkeypatch.setattr(settings, "analysis_queue_timeout", 5.0)
+        gone = asyncio.create_task(s.admit("u:c", "free").wait())
+        await asyncio.sleep(0)
+        gone.cancel()  # client disconnected while waiting
+        with pytest.raises(asyncio.CancelledError):
+            await gone
+        for t in holders:
+            t.release()
+        assert s.stats()["active"] == 0 and s.stats()["queued"] == 0
+        assert s.stats()["tiers"]["free"]["timed_out"] == 1
+
+    asyncio.run(scenario())
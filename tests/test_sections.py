@@ -0,0 +1,27 @@
+from app.nlp.document import Document
+from app.nlp.sections import HEADER, segment
+from app.nlp.skills_extractor import normalize
+
+RESUME = (
+    "Jane Doe\njane@example.com\n\n"
+    "Work Experience:\nBuilt FastAPI services on PostgreSQL.\nCut p95 latency to 120 ms.\n"
+    "Skills\nPython, Docker, Kubernetes\n"
+    "Projects\nA Redis-backed rate limiter.\n"
+)
+
+
+def test_segments_cover_both_texts():
+    normalized, segments = segment(RESUME)
+    assert normalized == normalize(RESUME)
+    assert [s.name for s in segments] == [HEADER, "experience", "skills", "projects"]
+    skills = segments[2]
+    assert RESUME[skills.start:skills.end].strip() == "Python, Docker, Kubernetes"
+    assert normalized[skills.norm_start:skills.norm_end] == "python docker kubernetes"
+
+
+def test_document_sections_and_section_skills():
+    doc = Document(RESUME)
+    assert doc.sections["experience"].startswith("Built FastAPI")
+    assert HEADER not in doc.sections
+    assert {"python", "docker"} <= set(doc.section_skills["skills"].names())
+    assert "redis" in doc.section_text("projects", normalized=True)
@@ -0,0 +1,67 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.nlp import semantic_skills
+from app.nlp.document import Document
+
+DIM = 256
+# phrases the stub model considers synonyms: same concept, same vector
+CONCEPTS = {
+    "kubernetes": 0, "k8s": 0, "kubectl": 0, "helm": 0, "container orchestration": 0,
+    "terraform": 1, "hashicorp terraform": 1, "infrastructure as code": 1,
+}
+TEXT = "Ran container orchestration for 30 Docker services; wrote infrastructure as code for every environment."
+
+
+def _vector(text: str) -> np.ndarray:
+    if text in CONCEPTS:
+        v = np.zeros(DIM, dtype=np.float32)
+        v[CONCEPTS[text]] = 1.0
+        return v
+    # anything else: a fixed pseudo-random direction, far from every concept and from each other
+    seed = int.from_bytes(hashlib.sha1(text.encode()).digest()[:4], "little")
+    v = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    """A stub embedding model; returns the list of embed_many calls (texts per call)."""
+    calls = []
+
+    def embed_many(texts, model=None):
+        calls.append(list(texts))
+        return np.stack([_vector(t) for t in texts])
+    monkeypatch.setattr(semantic_skills.embeddings, "embed_many", embed_many)
+    monkeypatch.setattr(semantic_skills, "_MATRIX", None)
+    monkeypatch.setattr(settings, "skills_semantic_threshold", 0.8)
+    return calls
+
+
+def test_paraphrases_match_through_the_alias_matrix(embedder, monkeypatch):
+    monkeypatch.setattr(settings, "skills_semantic", True)
+    skills = Document(TEXT).skills
+    assert "kubernetes" in skills and "terraform" in skills
+    assert "docker" in skills  # exact aliases still come from the strict matcher
+
+    aliases = embedder[0]  # the matrix: every usable alias once, short and generic ones left out
+    assert "kubernetes" in aliases and "container orchestration" not in aliases
+    assert not any(len(a) < semantic_skills.MIN_ALIAS_LEN for a in aliases)
+    assert "infrastructure as code" in embedder[1]  # then one call with the document's phrases
+
+    Document(TEXT).skill_set
+    assert len(embedder) == 3  # the matrix is built once, each document embeds its phrases once
+
+    monkeypatch.setattr(settings, "skills_semantic_threshold", 1.01)
+    assert semantic_skills.match(TEXT).names() == []
+    assert semantic_skills.match(TEXT, vocab=("other", "vocab")).names() == []  # a reloaded dictionary: no mixing
+
+
+def test_flag_off_uses_the_fuzzy_matcher_and_no_embeddings(embedder, monkeypatch):
+    monkeypatch.setattr(settings, "skills_semantic", False)
+    skills = Document(TEXT).skills
+    assert "docker" in skills and "kubernetes" not in skills and "terraform" not in skills
+    assert embedder == []
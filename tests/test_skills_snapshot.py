@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.nlp import skills_extractor, skills_snapshot
+
+CSV = "skill,aliases\npython,\"python,py\"\ndocker,\"docker,docker compose\"\n"
+TEXT = "Shipped Python services in Docker and Terraform modules for AWS."
+
+
+@pytest.fixture
+def dictionary(tmp_path, monkeypatch):
+    """A throwaway skills CSV + snapshot; the extractor reloads from them on every call."""
+    src, snap = tmp_path / "skills.csv", tmp_path / "skills.snapshot"
+    src.write_text(CSV, encoding="utf-8")
+    monkeypatch.setattr(settings, "skills_csv", str(src))
+    monkeypatch.setattr(settings, "skills_snapshot", str(snap))
+    monkeypatch.setattr(settings, "skills_reload_interval", 1e-9)
+    # put the loaded dictionary back afterwards, force a load from these files now
+    for name in ("_CANONICAL", "_VERSION", "_VOCAB", "_ENTRIES", "_FINGERPRINT", "_CHECKED_AT"):
+        monkeypatch.setattr(skills_extractor, name, getattr(skills_extractor, name))
+    monkeypatch.setattr(skills_extractor, "_CANONICAL", {})
+    return src, snap
+
+
+def _touch_later(path, seconds=5):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 10**9))
+
+
+def test_snapshot_is_used_only_while_it_matches_the_csv(dictionary, monkeypatch):
+    src, snap = dictionary
+    _, built = skills_snapshot.build_snapshot()
+    assert skills_snapshot.load_snapshot(snap, source=src).canonical == built.canonical
+    assert built.canonical["python"] == ("py", "python")
+
+    hashed = []
+    file_hash = skills_snapshot.file_hash
+    monkeypatch.setattr(skills_snapshot, "file_hash", lambda p: hashed.append(p) or file_hash(p))
+    assert skills_snapshot.load().version == built.version and hashed == []  # mtime + size match: no hashing
+
+    _touch_later(src)  # touched, same content: hashed once, still the snapshot
+    assert skills_snapshot.load_snapshot(snap, source=src) is not None and hashed == [src]
+
+    src.write_text(CSV + "terraform,\"terraform,tf\"\n", encoding="utf-8")
+    assert skills_snapshot.load_snapshot(snap, source=src) is None
+    assert "terraform" in skills_snapshot.load().canonical  # falls back to parsing the CSV
+
+
+def test_edited_csv_is_picked_up_by_the_running_extractor(dictionary):
+    src, _ = dictionary
+    skills_snapshot.build_snapshot()
+    before = skills_extractor.skills_version()
+    assert skills_extractor.extract_skills(TEXT) == ["docker", "python"]
+
+    src.write_text(CSV + "terraform,\"terraform,tf\"\n", encoding="utf-8")
+    _touch_later(src)  # the reload check is (mtime, size)
+    assert skills_extractor.skills_version() != before
+    assert skills_extractor.extract_skills(TEXT) == ["docker", "python", "terraform"]
+    assert "terraform" in skills_extractor.skills_vocab()
+
+    _, rebuilt = skills_snapshot.build_snapshot()
+    assert skills_extractor.skills_version() == rebuilt.version
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from app.nlp.skillset import SkillSet, coverage, overlap_counts, pack, popcount
+from app.services.match_service import score_match
+
+# a vocabulary wider than one 64-bit word, so packing spans several columns
+VOCAB = tuple(sorted([f"skill{i:03d}" for i in range(150)] + ["aws", "docker", "python"]))
+PAIRS = [
+    ({"python", "docker", "skill000"}, {"python", "aws", "skill149"}),
+    ({"skill063", "skill064", "skill127", "skill128"}, {"skill064", "skill128", "skill140"}),
+    (set(), {"aws"}),
+    ({"aws", "docker"}, set()),
+    (set(VOCAB), set(VOCAB[::7])),
+]
+
+
+def _old_overlap(resume: set, jd: set):
+    """The set-based overlap the bitsets replaced."""
+    overlap, missing = sorted(resume & jd), sorted(jd - resume)
+    return overlap, missing, (len(resume & jd) / len(jd)) if jd else 0.0
+
+
+def test_bit_operations_match_set_operations():
+    for resume, jd in PAIRS:
+        r, j = SkillSet.from_names(resume, VOCAB), SkillSet.from_names(jd, VOCAB)
+        overlap, missing, share = _old_overlap(resume, jd)
+        assert (r & j).names() == overlap and (j - r).names() == missing
+        assert (r | j).names() == sorted(resume | jd) and len(r) == len(resume)
+        assert r.names() == sorted(resume) and [VOCAB[i] for i in r.ids()] == r.names()
+
+        scored = score_match(0.5, r, j)
+        assert scored["overlap_skills"] == overlap and scored["missing_skills"] == missing
+        assert scored["skill_overlap"] == pytest.approx(share)
+        assert score_match(0.5, sorted(resume), sorted(jd))["skill_overlap"] == pytest.approx(share)  # name lists
+    assert SkillSet.from_names(["python", "not-a-skill"], VOCAB).names() == ["python"]
+
+
+def test_packed_rows_match_set_operations():
+    resumes = [SkillSet.from_names(r, VOCAB).mask for r, _ in PAIRS]
+    jds = [SkillSet.from_names(j, VOCAB).mask for _, j in PAIRS]
+    a, b = pack(resumes, len(VOCAB)), pack(jds, len(VOCAB))
+    assert a.shape == (len(PAIRS), 3) and a.dtype == np.uint64
+
+    assert popcount(a).tolist() == [len(r) for r, _ in PAIRS]
+    assert overlap_counts(a, b).tolist() == [len(r & j) for r, j in PAIRS]
+    assert coverage(a, b).tolist() == pytest.approx([_old_overlap(r, j)[2] for r, j in PAIRS])
+    one_jd = pack([jds[0]], len(VOCAB))  # one JD against every resume
+    assert overlap_counts(a, one_jd).tolist() == [len(r & PAIRS[0][1]) for r, _ in PAIRS]
+
+
+def test_sets_from_different_dictionary_versions():
+    old_vocab = ("docker", "python")
+    r = SkillSet.from_names(["python", "docker"], old_vocab)  # extracted before a reload
+    j = SkillSet.from_names(["python", "aws"], VOCAB)  # after it
+    with pytest.raises(ValueError):
+        r & j
+    assert SkillSet.from_names(["python"], tuple(old_vocab)) & r == SkillSet.from_names(["python"], old_vocab)
+
+    scored = score_match(0.5, r, j)  # scored by name instead of mixing bit positions
+    assert scored["overlap_skills"] == ["python"] and scored["missing_skills"] == ["aws"]
+    assert scored["skill_overlap"] == 0.5
+
+
+def test_pool_masks_from_another_dictionary_version_are_re_extracted():
+    from app.nlp.skills_extractor import extract_skill_mask, extract_skill_set
+    from app.services.bulk_score_service import _skill_sets
+
+    texts = ["Python services in Docker on Linux", "SQL and Redis"]
+
+    class Pool:
+        def __init__(self, stale):
+            self.stale = stale
+
+        def map(self, fn, items, chunksize=1):
+            return [("stale", 0) if self.stale else fn(t) for t in items]
+
+    assert [s.mask for s in _skill_sets(texts, Pool(False))] == [extract_skill_mask(t)[1] for t in texts]
+    assert _skill_sets(texts, Pool(True)) == [extract_skill_set(t) for t in texts]  # not the stale empty masks
+    assert all(_skill_sets(texts, Pool(True)))
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.migrate import compress_storage, convert_storage_columns, sync_schema
+from app.db.models import Job, Report, Resume
+from app.db.types import decode_bytes, encode_bytes, is_encoded, pack_payload, unpack_payload
+
+LONG = "Built FastAPI services on PostgreSQL and Redis; cut p95 latency from 800 ms to 200 ms. " * 40
+PAYLOAD = {
+    "match_score": 0.71, "skills": ["docker", "python"], "resume_skills": ["docker", "python"],
+    "jd_skills": ["aws", "python"], "overlap_skills": ["python"], "missing_skills": ["aws"],
+    "recommendations": ["Show experience with: aws " * 30], "pages": 1,
+}
+
+# the tables as they were before compressed storage: plain TEXT / JSON columns
+LEGACY_SCHEMA = (
+    "CREATE TABLE resumes (id INTEGER PRIMARY KEY, filename VARCHAR, text TEXT, created_at DATETIME)",
+    "CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR, description TEXT, created_at DATETIME)",
+    "CREATE TABLE reports (id INTEGER PRIMARY KEY, slug VARCHAR, payload JSON, created_at DATETIME,"
+    " resume_id INTEGER, job_id INTEGER, user_id INTEGER)",
+)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storage_codec", "zlib")
+    monkeypatch.setattr(settings, "storage_compress_threshold", 512)
+    eng = create_engine(f"sqlite:///{tmp_path / 'storage.db'}")
+    yield eng
+    eng.dispose()
+
+
+def test_encoding_round_trips_and_keeps_short_values_raw():
+    for value in ("", "short", LONG, "unicode ✓ " * 100):
+        stored = encode_bytes(value.encode("utf-8"))
+        assert is_encoded(stored) and decode_bytes(stored) == value
+    assert encode_bytes(b"short")[:2] == b"\x00r"
+    assert encode_bytes(LONG.encode())[:2] == b"\x00z" and len(encode_bytes(LONG.encode())) < len(LONG) / 5
+    # legacy values are read as they are
+    assert decode_bytes("plain text") == "plain text" and decode_bytes(b"plain bytes") == "plain bytes"
+
+    packed = pack_payload(PAYLOAD)
+    assert "skills" not in packed and "overlap_skills" not in packed  # duplicates dropped...
+    assert unpack_payload(packed) == PAYLOAD  # ...and restored
+    assert unpack_payload({"match_score": 1}) == {"match_score": 1}  # unpacked legacy dict
+    for partial in ({"match_score": 1, "resume_skills": ["python"], "jd_skills": ["python"]},
+                    {**PAYLOAD, "skills": ["go"]}):
+        assert unpack_payload(pack_payload(partial)) == partial  # nothing added that was not there
+    v1 = {k: v for k, v in PAYLOAD.items() if k not in ("skills", "overlap_skills")}
+    assert unpack_payload({**v1, "_pk": 1}) == PAYLOAD  # rows packed before "_pd"
+
+
+def test_models_round_trip_through_the_compressed_columns(engine):
+    sync_schema(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        resume, job = Resume(filename="r.pdf", text=LONG), Job(title="t", description="short JD")
+        s.add_all([resume, job])
+        s.flush()
+        s.add(Report(slug="x", payload=PAYLOAD, resume_id=resume.id, job_id=job.id))
+        s.commit()
+
+    with engine.connect() as conn:
+        raw_text, raw_payload = conn.execute(text(
+            "SELECT resumes.text, reports.payload FROM resumes, reports"
+        )).one()
+    assert raw_text[:2] == b"\x00z" and len(raw_text) < len(LONG)
+    assert raw_payload[:2] == b"\x00z"
+
+    with Session() as s:
+        assert s.query(Resume).one().text == LONG
+        assert s.query(Job).one().description == "short JD"
+        assert s.query(Report).one().payload == PAYLOAD
+
+
+def test_legacy_rows_are_readable_and_compressed_by_the_cli_step(engine):
+    with engine.begin() as conn:
+        for ddl in LEGACY_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO resumes (id, filename, text) VALUES (1, 'r.pdf', :t)"), {"t": LONG})
+        conn.execute(text("INSERT INTO jobs (id, title, description) VALUES (1, 't', 'short JD')"))
+        conn.execute(text("INSERT INTO reports (id, slug, payload, resume_id, job_id) VALUES (1, 'x', :p, 1, 1)"),
+                     {"p": json.dumps(PAYLOAD)})
+    sync_schema(engine)  # adds the newer columns, leaves the stored values alone
+    assert convert_storage_columns(engine) == []  # SQLite stores bytes in any column: nothing to convert
+
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        assert s.get(Resume, 1).text == LONG
+        assert s.get(Report, 1).payload == PAYLOAD  # plain JSON, read as a legacy row
+
+    stats = compress_storage(engine, batch_size=1, log=lambda _: None)
+    assert stats["resumes.text"]["rows"] == 1 and stats["resumes.text"]["bytes_after"] < len(LONG) / 5
+    assert stats["jobs.description"]["rows"] == 1
+    assert stats["reports.payload"]["rows"] == 1
+    with engine.connect() as conn:
+        assert is_encoded(conn.execute(text("SELECT payload FROM reports")).scalar())
+    with Session() as s:
+        assert s.get(Resume, 1).text == LONG and s.get(Job, 1).description == "short JD"
+        assert s.get(Report, 1).payload == PAYLOAD
+
+    again = compress_storage(engine, log=lambda _: None)  # re-runnable: nothing left to rewrite
+    assert all(v["rows"] == 0 and v["skipped"] == 1 for v in again.values())
@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.middleware.sessions import SessionMiddleware
+
+from app.core.config import settings
+from app.db.migrate import sync_schema
+from app.db.models import Report
+from app.db.session import get_db
+from app.routes import ui
+from app.services.scheduler import FairScheduler, Shed
+
+MATCHED = {
+    "resume_skills": ["docker", "python"], "jd_skills": ["aws", "python"],
+    "overlap_skills": ["python"], "missing_skills": ["aws"],
+    "semantic_similarity": 0.5, "skill_overlap": 0.5, "match_score": 0.5, "recommendations": [],
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """ui.router on a throwaway database, with its own scheduler; `.Sync`/`.Async` open sessions on it."""
+    monkeypatch.setattr(settings, "defer_report_write", False)
+    path = tmp_path / "ui.db"
+    engine = create_engine(f"sqlite:///{path}")
+    sync_schema(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Async = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def session():
+        async with Async() as s:
+            yield s
+
+    scheduler = FairScheduler()
+    monkeypatch.setattr(ui, "scheduler", scheduler)
+    app = FastAPI()
+    app.add_middleware(SessionMiddleware, secret_key="test")
+    app.include_router(ui.router)
+    app.dependency_overrides[get_db] = session
+    with TestClient(app) as c:
+        c.Sync, c.Async, c.scheduler = sessionmaker(bind=engine), Async, scheduler
+        yield c
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def _off_the_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
+def test_demo_is_admitted_and_runs_off_the_event_loop(client, monkeypatch):
+    seen = []
+
+    def analyze(db, resume, doc=None, **kw):
+        seen.append((db, _off_the_loop(), client.scheduler.stats()["active"]))
+        return {"skills": ["docker", "python"], "tokens": 20}
+
+    def match(db, resume, job, resume_doc=None, job_doc=None):
+        seen.append((db, _off_the_loop(), client.scheduler.stats()["active"]))
+        return dict(MATCHED)
+    monkeypatch.setattr(ui, "analyze_resume", analyze)
+    monkeypatch.setattr(ui, "match_resume_job", match)
+
+    r = client.get("/demo")
+    assert r.status_code == 200 and "/r/" in r.text
+    assert seen == [(None, True, 1), (None, True, 1)]  # holding a slot, in the threadpool, no AsyncSession
+    assert client.scheduler.stats()["active"] == 0
+    with client.Sync() as s:
+        assert s.scalar(select(Report.title)) == "Demo JD"
+
+    def shed(subject, tier):
+        raise Shed(503, "Busy, try again shortly.", retry_after=7)
+    monkeypatch.setattr(client.scheduler, "admit", shed)
+    r = client.get("/demo")
+    assert r.status_code == 503 and r.headers["retry-after"] == "7" and "Busy, try again shortly." in r.text
+    assert len(seen) == 2
+
+
+RESUME = "Experience\nBuilt Python and Docker services on AWS, cut p95 latency by 40%.\n" * 2
+JD = "Backend role: Python, Docker and AWS; PostgreSQL a plus. Remote within the EU."
+
+
+def _events(body: str):
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+@pytest.fixture
+def stream(client, monkeypatch):
+    """POST /ui-match/stream with the PDF, analysis and match stages stubbed; returns the events."""
+    monkeypatch.setattr(ui, "extract_pdf_text", lambda f: (f.read().decode(), 1, len(RESUME)))
+    monkeypatch.setattr(ui, "analyze_resume", lambda db, resume, doc=None, **kw: {"skills": ["docker", "python"], "tokens": 20})
+
+    def stages(resume_doc, job_doc):
+        skills = {k: MATCHED[k] for k in ("resume_skills", "jd_skills", "overlap_skills", "missing_skills")}
+        yield "skills", skills
+        yield "semantic", {"semantic_similarity": 0.5}
+        yield "match", dict(MATCHED)
+    monkeypatch.setattr(ui, "match_stages", stages)
+    monkeypatch.setattr(ui, "AsyncSessionLocal", client.Async)
+
+    released = []
+    admit = client.scheduler.admit
+
+    def counted(subject, tier):
+        ticket = admit(subject, tier)
+        release = ticket.release
+        ticket.release = lambda: (released.append(subject), release())[1]
+        return ticket
+    monkeypatch.setattr(client.scheduler, "admit", counted)
+
+    def post(resume=RESUME, jd=JD):
+        r = client.post(
+            "/ui-match/stream",
+            files={"file": ("cv.pdf", resume.encode(), "application/pdf")},
+            data={"job_description": jd},
+        )
+        assert r.status_code == 200 and r.headers["content-type"].startswith("text/event-stream")
+        return _events(r.text), released
+    return post
+
+
+def test_stream_sends_each_stage_then_the_share_url(client, stream):
+    events, released = stream()
+    assert [e for e, _ in events] == ["stage", "skills", "semantic", "result", "share"]
+    assert events[0][1] == {"stage": "parsing"}
+    assert events[1][1]["missing_skills"] == ["aws"] and events[1][1]["tokens"] == 20
+    assert events[2][1]["ss"]["label"] and events[3][1]["match_score"] == 0.5
+
+    share = events[4][1]
+    slug = share["share_url"].rsplit("/r/", 1)[1]
+    assert share["pdf_url"] == share["share_url"] + ".pdf"
+    with client.Sync() as s:  # persisted through the stream's own session
+        assert s.scalar(select(Report.payload).where(Report.slug == slug))["match_score"] == 0.5
+    assert released and client.scheduler.stats()["active"] == 0
+
+
+def test_stream_errors_end_the_stream_and_release_the_ticket(client, stream, monkeypatch):
+    events, released = stream(resume="too short")
+    assert events == [("stage", {"stage": "parsing"}),
+                      ("error", {"error": "Please provide a valid PDF and a sufficiently detailed JD."})]
+    assert released and client.scheduler.stats()["active"] == 0
+
+    def broken():
+        raise RuntimeError("database is gone")
+    monkeypatch.setattr(ui, "AsyncSessionLocal", broken)
+    events, _ = stream()
+    assert [e for e, _ in events] == ["stage", "skills", "semantic", "result", "error"]
+    assert events[-1][1] == {"error": "The analysis finished but could not be saved."}
+    with client.Sync() as s:
+        assert s.scalar(select(Report.id)) is None
+    assert client.scheduler.stats()["active"] == 0